@@ -0,0 +1,74 @@
+"""Solves large collections of puzzles.
+
+The puzzles are given in the one-line format (see Board.from_string()), for example as the lines of a file. They
+are read and solved one after another, so only one puzzle is held in memory at a time, no matter how large the
+collection is.
+"""
+import time
+
+from src.sudoku.board import Board
+from src.sudoku.limits import Unfinished
+from src.sudoku.solver import solve
+from src.sudoku.stats import SolveStats
+
+
+def solve_puzzles(puzzles, policy=None, engine="backtrack", with_stats=False, deadline=None, max_nodes=None):
+    """Solves the given puzzles lazily.
+
+    Parameters
+    ----------
+    puzzles
+        an iterable of puzzles in the one-line format. Leading and trailing whitespace is removed, empty lines and
+        lines starting with '#' are skipped.
+    policy
+        the branching policy which is passed to Board.solve_with_backtrack().
+    engine
+        the engine which solves the puzzles if reducing the maybe numbers is not enough, "backtrack" or "dlx".
+    with_stats : bool
+        if True, the statistics of solving every puzzle (see module stats) are added to its stats as "solver", also
+        if the puzzle could not be solved.
+    deadline : float
+        the maximum wall time of solving a single puzzle in seconds, see solver.solve().
+    max_nodes : int
+        the maximum number of search nodes of a single puzzle, see solver.solve().
+
+    Yields
+    ------
+    tuple
+        a tuple (puzzle, solution, stats) for every puzzle. The solution is given in the one-line format, or None if
+        the puzzle could not be solved. stats is a dict with the solving time in seconds ("seconds") and the error
+        message ("error") if the puzzle could not be solved, otherwise None. If a limit has been reached, the
+        Unfinished result (see module limits) is added as "unfinished".
+    """
+    for puzzle in puzzles:
+        puzzle = puzzle.strip()
+        if not puzzle or puzzle.startswith("#"):
+            continue
+        solve_stats = SolveStats() if with_stats else None
+        start_time = time.perf_counter()
+        unfinished = None
+        try:
+            result = solve(Board.from_string(puzzle), policy, engine, solve_stats, deadline=deadline,
+                           max_nodes=max_nodes)
+            if isinstance(result, Unfinished):
+                unfinished = result
+                solution = None
+                error = f"Search stopped at its limit ({result.reason()})"
+            else:
+                solution = result.to_string()
+                error = None
+        except Exception as e:
+            solution = None
+            error = str(e)
+        stats = {"seconds": time.perf_counter() - start_time, "error": error}
+        if unfinished is not None:
+            stats["unfinished"] = unfinished.as_dict()
+        if solve_stats is not None:
+            stats["solver"] = solve_stats.as_dict()
+        yield puzzle, solution, stats
+
+
+def solve_file(path, policy=None, engine="backtrack", with_stats=False, deadline=None, max_nodes=None):
+    """Solves the puzzles of the given file (one puzzle per line) lazily, see solve_puzzles()."""
+    with open(path, "r") as puzzles:
+        yield from solve_puzzles(puzzles, policy, engine, with_stats, deadline, max_nodes)
@@ -0,0 +1,218 @@
+"""Reproducible benchmark of the solving stages and engines.
+
+The benchmark runs every stage (see STAGES) on the boards of the board directory and on the corpora of the
+board/corpus directory. Every puzzle is run `repeat` times and its latency is the median of these runs; only the
+solving is timed, not reading the puzzles or printing. For every corpus and stage, the median and the 95th
+percentile of the latencies and the number of puzzles per second are reported.
+
+The results can be written to a JSON file and compared against the JSON file of an earlier run (the baseline):
+
+    python -m src.sudoku.benchmark --output bench.json
+    python -m src.sudoku.benchmark --baseline bench.json
+
+If the median or the 95th percentile of a corpus and stage is slower than the baseline by more than the tolerance,
+this is reported as regression and the exit code is 1.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+
+from src.sudoku.board import Board
+from src.sudoku.branching import MinimumRemainingValues
+from src.sudoku.deductions import TECHNIQUES
+from src.sudoku.puzzle_io import iter_puzzle_bytes
+import src.sudoku.solver as solver
+
+CORPUS_DIR = os.path.join(solver.BOARD_DIR, "corpus")
+
+
+def reduce_stage(board):
+    board.reduce_maybe_numbers()
+
+
+def singles_stage(board):
+    board.reduce_maybe_numbers()
+    board.set_last_remaining_number()
+
+
+def backtrack_stage(board):
+    solver.solve(board)
+
+
+def backtrack_mrv_stage(board):
+    solver.solve(board, MinimumRemainingValues())
+
+
+def deductions_stage(board):
+    solver.solve(board, MinimumRemainingValues(), deductions=list(TECHNIQUES))
+
+
+def dlx_stage(board):
+    solver.solve(board, engine="dlx")
+
+
+STAGES = {
+    "reduce": reduce_stage,
+    "singles": singles_stage,
+    "backtrack": backtrack_stage,
+    "backtrack-mrv": backtrack_mrv_stage,
+    "deductions": deductions_stage,
+    "dlx": dlx_stage,
+}
+
+
+def load_corpora(names=None) -> dict:
+    """Loads the corpora with the given names, all corpora if names is None. The corpus "boards" contains the boards
+    of the board directory, the other corpora are the files of the board/corpus directory.
+
+    Returns
+    -------
+    dict
+        the puzzles in the one-line format by the name of the corpus.
+    """
+    corpora = {"boards": [solver.get_board(name).to_string()
+                          for name in sorted(os.listdir(solver.BOARD_DIR)) if name.endswith(".txt")]}
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if name.endswith(".txt"):
+            corpora[name[:-4]] = [line.decode("ascii") for line in iter_puzzle_bytes(os.path.join(CORPUS_DIR, name))]
+    if names is None:
+        return corpora
+    return {name: corpora[name] for name in names}
+
+
+def run_benchmark(corpora, stages=None, repeat=3) -> dict:
+    """Runs the given stages (all stages if None) on the given corpora (see load_corpora()).
+
+    Returns
+    -------
+    dict
+        the results, which can be written to a JSON file. results["results"][corpus][stage] contains the number of
+        puzzles, the number of errors, the median and the 95th percentile of the latencies in seconds and the
+        number of puzzles per second.
+    """
+    if stages is None:
+        stages = list(STAGES)
+    results = {}
+    for corpus, puzzles in corpora.items():
+        results[corpus] = {}
+        for stage in stages:
+            latencies = []
+            errors = 0
+            for puzzle in puzzles:
+                runs = []
+                failed = False
+                for _ in range(repeat):
+                    board = Board.from_string(puzzle)
+                    start_time = time.perf_counter()
+                    try:
+                        STAGES[stage](board)
+                    except Exception:
+                        failed = True
+                    runs.append(time.perf_counter() - start_time)
+                latencies.append(statistics.median(runs))
+                if failed:
+                    errors += 1
+            results[corpus][stage] = summarize(latencies, errors)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def summarize(latencies, errors=0) -> dict:
+    """Returns the summary of the given latencies (in seconds) of the puzzles of a corpus."""
+    if not latencies:
+        return {"puzzles": 0, "errors": errors, "median": 0.0, "p95": 0.0, "puzzles_per_second": 0.0}
+    total = sum(latencies)
+    return {
+        "puzzles": len(latencies),
+        "errors": errors,
+        "median": statistics.median(latencies),
+        "p95": percentile(latencies, 95),
+        "puzzles_per_second": len(latencies) / total if total > 0 else math.inf,
+    }
+
+
+def percentile(values, percent) -> float:
+    """Returns the given percentile of the values (nearest-rank method)."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def compare_results(baseline, current, tolerance=0.25) -> list:
+    """Compares the current results against the baseline results (see run_benchmark()).
+
+    Parameters
+    ----------
+    tolerance : float
+        the relative slowdown which is still accepted, 0.25 means 25% slower.
+
+    Returns
+    -------
+    list
+        a message for every corpus and stage whose median or 95th percentile is slower than the baseline by more
+        than the tolerance. Corpora and stages which are missing in one of the results are ignored.
+    """
+    regressions = []
+    for corpus, stages in current["results"].items():
+        for stage, summary in stages.items():
+            baseline_summary = baseline["results"].get(corpus, {}).get(stage)
+            if baseline_summary is None:
+                continue
+            for key in ("median", "p95"):
+                if summary[key] > baseline_summary[key] * (1 + tolerance):
+                    regressions.append(f"{corpus}/{stage}: {key} {summary[key] * 1000:.3f} ms, "
+                                       f"baseline {baseline_summary[key] * 1000:.3f} ms")
+    return regressions
+
+
+def format_results(results) -> str:
+    """Returns the results as a table."""
+    lines = [f"{'corpus':<14}{'stage':<15}{'puzzles':>8}{'errors':>8}{'median ms':>12}{'p95 ms':>12}"
+             f"{'puzzles/s':>12}"]
+    for corpus, stages in results["results"].items():
+        for stage, summary in stages.items():
+            lines.append(f"{corpus:<14}{stage:<15}{summary['puzzles']:>8}{summary['errors']:>8}"
+                         f"{summary['median'] * 1000:>12.3f}{summary['p95'] * 1000:>12.3f}"
+                         f"{summary['puzzles_per_second']:>12.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark of the solving stages and engines")
+    parser.add_argument("--corpus", action="append", help="corpus to run (default: all)")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), help="stage to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per puzzle (default: 3)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="accepted slowdown (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(load_corpora(args.corpus), args.stage, args.repeat)
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as baseline_input:
+            baseline = json.load(baseline_input)
+        regressions = compare_results(baseline, results, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Helper functions to work with bitmasks of numbers.
+
+A bitmask stores a set of numbers in a single integer: bit 0 stands for the number 1, bit 1 for the number 2 and so
+on. For a 9x9 board, the numbers 1 to 9 fit into 9 bits, so the "maybe numbers" of a cell can be stored in one int.
+Removing numbers is a single AND and counting the numbers is a single popcount. Larger boards use wider bitmasks in
+the same way, Python ints have no fixed width.
+"""
+
+# all numbers of a 9x9 board, see Geometry.all_numbers for the other box sizes
+ALL_NUMBERS = 0b111111111
+
+
+def bit(number) -> int:
+    """Returns the bitmask which contains only the given number."""
+    return 1 << (number - 1)
+
+
+def mask_of(numbers) -> int:
+    """Returns the bitmask which contains all the given numbers."""
+    mask = 0
+    for number in numbers:
+        mask |= 1 << (number - 1)
+    return mask
+
+
+def popcount(mask) -> int:
+    """Returns how many numbers are contained in the given bitmask."""
+    return bin(mask).count("1")
+
+
+def lowest_number(mask) -> int:
+    """Returns the lowest number contained in the given bitmask, or None if the bitmask is empty."""
+    if not mask:
+        return None
+    return (mask & -mask).bit_length()
+
+
+def iter_numbers(mask):
+    """Yields the numbers contained in the given bitmask in ascending order, lowest bit first."""
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length()
+        mask ^= lowest_bit
@@ -1,4 +1,19 @@
+from math import isqrt
+
+from src.sudoku.bits import bit, iter_numbers, lowest_number, popcount
 from src.sudoku.cell import Cell
+from src.sudoku.limits import SearchLimits, Unfinished
+from src.sudoku.search import SearchEngine
+from src.sudoku.units import GEOMETRY, MAX_BOX_SIZE, MIN_BOX_SIZE, geometry, index_of
+
+# maps every byte of the one-line format of a 9x9 board to its number: None for an unknown number, 0 for an invalid
+# byte (see Geometry.number_of_byte for the other box sizes)
+NUMBER_OF_BYTE = GEOMETRY.number_of_byte
+# the supported numbers of rows (4, 9, 16 or 25) and cells (16, 81, 256 or 625) of a board, for the error messages
+SUPPORTED_SIZES = ", ".join(str(box_size ** 2) for box_size in range(MIN_BOX_SIZE, MAX_BOX_SIZE))\
+    + f" or {MAX_BOX_SIZE ** 2}"
+SUPPORTED_CELL_COUNTS = ", ".join(str(box_size ** 4) for box_size in range(MIN_BOX_SIZE, MAX_BOX_SIZE))\
+    + f" or {MAX_BOX_SIZE ** 4}"
 
 
 class Board:
@@ -9,21 +24,76 @@ class Board:
     ----------
     numbers : list
         a two-dimensional array. Each value contains a row with 9 digits from 1 to 9
-        (or 'x'/'X' if the number is unknown).
+        (or 'x'/'X' if the number is unknown). Larger (or smaller) boards are given by 4, 16 or 25 rows with as many
+        numbers each, the numbers above 9 either as integer value or by their symbol (see units.SYMBOLS).
     """
 
+    # like the cells, the boards have no __dict__ (see module compact for holding many boards in memory)
+    __slots__ = ("_cells", "_geometry", "_used_numbers", "_positions", "_trail", "_stats")
+
     def __init__(self, numbers):
         if not isinstance(numbers, list):
             raise Exception("Cannot create board since no list was given")
 
-        if not len(numbers) == 9:
-            raise Exception("Cannot create board since list does not contain 9 elements")
+        box_size = isqrt(len(numbers))
+        if not len(numbers) == box_size ** 2 or not MIN_BOX_SIZE <= box_size <= MAX_BOX_SIZE:
+            raise Exception(f"Cannot create board since list does not contain {SUPPORTED_SIZES} elements")
+        board_geometry = geometry(box_size)
 
-        self._cells = []
+        cells = []
+        size = board_geometry.size
+        positions = board_geometry.positions
 
         for row_idx, row in enumerate(numbers):
+            if not len(row) == size:
+                raise Exception(f"Cannot create board since row {row_idx} does not contain {size} numbers")
             for col_idx, number in enumerate(row):
-                self._cells.append(Cell(number, (row_idx, col_idx)))
+                # the positions are shared with the geometry instead of creating a tuple for every cell
+                cells.append(Cell(number, positions[row_idx * size + col_idx], board_geometry))
+
+        self.__init_cells(cells, board_geometry)
+
+    def __init_cells(self, cells, board_geometry=GEOMETRY):
+        """Initializes the board with the given list of cells in row-major order (81 cells for the default 9x9
+        geometry)."""
+        self._cells = cells
+        self._geometry = board_geometry
+        size = board_geometry.size
+        all_numbers = board_geometry.all_numbers
+        units_of = board_geometry.units_of
+        unit_positions_of = board_geometry.unit_positions_of
+        # for every unit (9 rows, 9 columns, 9 blocks) a bitmask of the numbers which are already used in that unit
+        used_numbers = [0] * len(board_geometry.units)
+        # for every unit the bitmask of the positions within the unit (bit 0 for the first cell of the unit) of the
+        # cells which still have all numbers as "maybe numbers"
+        open_positions = [0] * len(board_geometry.units)
+        other_cells = []
+        for idx, cell in enumerate(cells):
+            number = cell.number()
+            if number is not None:
+                row_idx, col_idx, block_idx = units_of[idx]
+                number_bit = bit(number)
+                used_numbers[row_idx] |= number_bit
+                used_numbers[col_idx] |= number_bit
+                used_numbers[block_idx] |= number_bit
+            elif cell.maybe_numbers_mask() == all_numbers:
+                for unit_idx, position_bit in unit_positions_of[idx]:
+                    open_positions[unit_idx] |= position_bit
+            else:
+                other_cells.append(idx)
+        self._used_numbers = used_numbers
+        # for every unit and number (at index unit_idx * size + number - 1) the bitmask of the positions within the
+        # unit of the cells which still have the number as "maybe number"
+        positions = [unit_positions for unit_positions in open_positions for _ in range(size)]
+        for idx in other_cells:
+            for number in iter_numbers(cells[idx].maybe_numbers_mask()):
+                for unit_idx, position_bit in unit_positions_of[idx]:
+                    positions[unit_idx * size + number - 1] |= position_bit
+        self._positions = positions
+        # if not None, every change of a cell is recorded here, so that it can be undone with rewind()
+        self._trail = None
+        # if not None, the statistics of solving the board are reported to this SolveStats object
+        self._stats = None
 
     def get_row(self, row_idx) -> list:
         """
@@ -42,9 +112,9 @@ class Board:
         Exception
             If the given row_idx is not between 0 and 8 (inclusive), an Exception is raised.
         """
-        if row_idx < 0 or row_idx > 9:
+        if row_idx < 0 or row_idx >= self._geometry.size:
             raise Exception("Invalid row index")
-        return self[row_idx * 9:row_idx * 9 + 9]
+        return self.__cells_at(self._geometry.rows[row_idx])
 
     def get_col(self, col_idx) -> list:
         """
@@ -63,9 +133,9 @@ class Board:
         Exception
             If the given col_idx is not between 0 and 8 (inclusive), an Exception is raised.
         """
-        if col_idx < 0 or col_idx > 9:
+        if col_idx < 0 or col_idx >= self._geometry.size:
             raise Exception("Invalid column index")
-        return self[col_idx::9]
+        return self.__cells_at(self._geometry.cols[col_idx])
 
     def get_block(self, block_idx) -> list:
         """
@@ -85,18 +155,9 @@ class Board:
             If the given col_idx is not between 0 and 8 (inclusive), an Exception is raised.
         """
 
-        if block_idx < 0 or block_idx > 9:
+        if block_idx < 0 or block_idx >= self._geometry.size:
             raise Exception("Invalid block index")
-        if block_idx < 3:
-            start_idx = block_idx * 3
-        elif block_idx < 6:
-            start_idx = 3 * 9 + (block_idx % 3) * 3
-        else:
-            start_idx = 6 * 9 + (block_idx % 3) * 3
-
-        return self[start_idx:start_idx + 3] \
-               + self[start_idx + 9:start_idx + 12] \
-               + self[start_idx + 18:start_idx + 21]
+        return self.__cells_at(self._geometry.blocks[block_idx])
 
     def get_row_numbers(self, row_idx, with_maybe=False) -> list:
         """
@@ -118,10 +179,9 @@ class Board:
         Exception
             If the given row_idx is not between 0 and 8 (inclusive), an Exception is raised.
         """
-        cells = self.get_row(row_idx)
-        if with_maybe:
-            return [x.number_or_maybe_number() for x in cells if x.is_number_fixed_or_maybe_number_set()]
-        return [x.number() for x in cells if x.is_number_fixed()]
+        if row_idx < 0 or row_idx >= self._geometry.size:
+            raise Exception("Invalid row index")
+        return self.__numbers_at(self._geometry.rows[row_idx], with_maybe)
 
     def get_col_numbers(self, col_idx, with_maybe=False) -> list:
         """
@@ -143,10 +203,9 @@ class Board:
         Exception
             If the given row_idx is not between 0 and 8 (inclusive), an Exception is raised.
         """
-        cells = self.get_col(col_idx)
-        if with_maybe:
-            return [x.number_or_maybe_number() for x in cells if x.is_number_fixed_or_maybe_number_set()]
-        return [x.number() for x in cells if x.is_number_fixed()]
+        if col_idx < 0 or col_idx >= self._geometry.size:
+            raise Exception("Invalid column index")
+        return self.__numbers_at(self._geometry.cols[col_idx], with_maybe)
 
     def get_block_numbers(self, block_idx, with_maybe=False):
         """
@@ -168,10 +227,9 @@ class Board:
         Exception
             If the given row_idx is not between 0 and 8 (inclusive), an Exception is raised.
         """
-        cells = self.get_block(block_idx)
-        if with_maybe:
-            return [x.number_or_maybe_number() for x in cells if x.is_number_fixed_or_maybe_number_set()]
-        return [x.number() for x in cells if x.is_number_fixed()]
+        if block_idx < 0 or block_idx >= self._geometry.size:
+            raise Exception("Invalid block index")
+        return self.__numbers_at(self._geometry.blocks[block_idx], with_maybe)
 
     def reduce_maybe_numbers(self):
         """This method reduces the maybe numbers for every cell.
@@ -180,35 +238,38 @@ class Board:
         same row, column or block).
 
         If during the reduction a new fixed number can be set (because we have removed all except one "maybe number"
-        from a cell), we repeat the reduction for all cells. We do this so long until we can't set no new fixed number.
-        """
-        repeat = True
-        while repeat:
-            # it might happen that the reduction of a maybe number leads to a new fixed number
-            # if this happens, we repeat the whole process until there are no new fixed numbers any longer
-            repeat = False
-            for cell in self:
-                repeat = repeat or cell.reduce_maybe_numbers(self.get_row_numbers(cell.get_row_idx()))
-                repeat = repeat or cell.reduce_maybe_numbers(self.get_col_numbers(cell.get_col_idx()))
-                repeat = repeat or cell.reduce_maybe_numbers(self.get_block_numbers(cell.get_block_idx()))
-            if not self.validate():
-                raise Exception("Board is not valid any more")
+        from a cell), this number is removed from the peers of that cell as well. We do this so long until we can't
+        set no new fixed number.
+
+        Raises
+        ------
+        Exception
+            If the reduction shows that the board is not valid, an Exception is raised.
+        """
+        if not self.try_reduce_maybe_numbers():
+            raise Exception("Board is not valid any more")
+
+    def try_reduce_maybe_numbers(self) -> bool:
+        """Same as reduce_maybe_numbers(), but instead of raising an Exception, False is returned if the board is not
+        valid."""
+        pending = [idx for idx, cell in enumerate(self._cells) if cell.is_number_fixed()]
+        return self.__propagate(pending, list(range(len(self._positions))))
 
     def set_last_remaining_number(self):
         """This method takes the maybe numbers from every cell. If in the according row, column or block there is
-        no other cell with that maybe number, the maybe number is the new fixed number. This only works if the method
-        reduce_maybe_numbers() has been called previously."""
+        no other cell with that maybe number, the maybe number is the new fixed number. The new fixed numbers are
+        propagated until no further number can be fixed (see __propagate()).
 
-        for cell in self:
-            if cell.is_number_fixed():
-                continue
-            self.__change_maybe_number_to_fixed(cell, self.get_row(cell.get_row_idx()))
-            if cell.is_number_fixed():
-                continue
-            self.__change_maybe_number_to_fixed(cell, self.get_col(cell.get_col_idx()))
-            if cell.is_number_fixed():
-                continue
-            self.__change_maybe_number_to_fixed(cell, self.get_block(cell.get_block_idx()))
+        Since the reduction of the maybe numbers already fixes these numbers, this method only changes the board if
+        reduce_maybe_numbers() has not been called before.
+
+        Raises
+        ------
+        Exception
+            If the board is not valid any more, an Exception is raised.
+        """
+        if not self.__propagate([], list(range(len(self._positions)))):
+            raise Exception("Board is not valid any more")
 
     def validate(self, with_maybe=False) -> bool:
         """
@@ -228,7 +289,9 @@ class Board:
             and we can continue with other "maybe numbers".
 
         """
-        for i in range(0, 9):
+        if self._stats is not None:
+            self._stats.add_validation()
+        for i in range(self._geometry.size):
             if not self.no_doubles(self.get_row_numbers(i, with_maybe=with_maybe)) \
                     or not self.no_doubles(self.get_col_numbers(i, with_maybe=with_maybe)) \
                     or not self.no_doubles(self.get_block_numbers(i, with_maybe=with_maybe)):
@@ -236,12 +299,55 @@ class Board:
         return True
 
     def set_fixed_value_of_cell(self, cell, number) -> None:
-        """Sets a fixed number to the given cell."""
-        cell.new_fixed_number(number)
-        if not self.validate():
+        """Sets a fixed number to the given cell and removes it from the "maybe numbers" of its peers.
+
+        Raises
+        ------
+        Exception
+            If the board is not valid any more with the new fixed number, an Exception is raised.
+        """
+        idx = index_of(cell.pos(), self._geometry.size)
+        checks = []
+        self.__fix_number(idx, number, checks)
+        # since we have created a new fixed number, we remove it from the maybe numbers of all peers
+        if not self.__propagate([idx], checks):
             raise Exception("Board is not valid any more")
-        # since we have created a new fixed number, we start reducing all maybe numbers again
-        self.reduce_maybe_numbers()
+
+    def used_numbers_mask(self, cell) -> int:
+        """
+        Returns
+        -------
+        int
+            the bitmask of all numbers which are already used as fixed number in the row, column or block of the
+            given cell.
+        """
+        row_idx, col_idx, block_idx = self._geometry.units_of[index_of(cell.pos(), self._geometry.size)]
+        used_numbers = self._used_numbers
+        return used_numbers[row_idx] | used_numbers[col_idx] | used_numbers[block_idx]
+
+    def count_fixed_in_units(self, cell) -> int:
+        """
+        Returns
+        -------
+        int
+            the number of fixed numbers in the row, column and block of the given cell, added up over the three units
+            (a fixed number in two of these units is counted twice).
+        """
+        row_idx, col_idx, block_idx = self._geometry.units_of[index_of(cell.pos(), self._geometry.size)]
+        used_numbers = self._used_numbers
+        return popcount(used_numbers[row_idx]) + popcount(used_numbers[col_idx]) + popcount(used_numbers[block_idx])
+
+    def empty_peers(self, cell) -> list:
+        """
+        Returns
+        -------
+        list
+            the cells in the row, column or block of the given cell (without the cell itself) which have neither a
+            fixed number nor a "maybe number".
+        """
+        cells = self._cells
+        return [cells[peer_idx] for peer_idx in self._geometry.peers[index_of(cell.pos(), self._geometry.size)]
+                if not cells[peer_idx].is_number_fixed_or_maybe_number_set()]
 
     def get_cell(self, pos) -> Cell:
         """
@@ -255,67 +361,238 @@ class Board:
         Cell
             the cell at the specified position.
         """
-        for cell in self:
-            if cell.pos() == pos:
-                return cell
+        return self._cells[index_of(pos, self._geometry.size)]
+
+    def geometry(self):
+        """
+        Returns
+        -------
+        Geometry
+            the index tables of the board (see units.geometry()), which also give its box size and number of rows.
+        """
+        return self._geometry
+
+    def set_stats(self, stats) -> None:
+        """Attaches the given SolveStats object (see module stats) to the board, so that the board and the engines
+        which solve it report their statistics into it. None (default) disables the statistics."""
+        self._stats = stats
+
+    def stats(self):
+        """
+        Returns
+        -------
+        SolveStats
+            the SolveStats object which is attached to the board, or None.
+        """
+        return self._stats
 
-    def solve_with_backtrack(self):
+    def solve_with_backtrack(self, policy=None, processes=None, deadline=None, max_nodes=None, cancel_token=None,
+                             nogoods=None):
         """Tries to solve the board by using the 'backtrack' algorithm, that means trying every remaining 'maybe
-        numbers' until a valid board is found.
+        numbers' until a valid board is found. After every number which is tried, the maybe numbers of the peers are
+        reduced (see class SearchEngine).
+
+        Parameters
+        ----------
+        policy
+            the branching policy (see module branching) which decides on which cell the algorithm branches next and
+            in which order its "maybe numbers" are tried. If None (default), the first empty cell is taken and its
+            numbers are tried in ascending order.
+        processes : int
+            if given, the search tree is split into subtrees which are searched by this number of worker processes
+            (see parallel.solve_parallel()). If None (default), the board is searched in the current process. The
+            worker processes do not check the limits and do not record nogoods, so processes cannot be combined with
+            deadline, max_nodes, cancel_token or nogoods.
+        deadline : float
+            the maximum wall time of the search in seconds. If None (default), the time is not limited.
+        max_nodes : int
+            the maximum number of search nodes. If None (default), the nodes are not limited.
+        cancel_token : CancelToken
+            if given, the search stops as soon as the token has been cancelled (see module limits).
+        nogoods : NogoodStore
+            if given, the dead ends of the search are recorded in this store and pruned when they are reached again
+            (see module nogoods).
+
+        Returns
+        -------
+        int or Unfinished
+            the number of search nodes, that is the number of "maybe numbers" which have been tried. If a limit has
+            been reached before the board is solved, an Unfinished result is returned instead (see module limits);
+            the board is then left in the state after the propagation of its fixed numbers.
 
         Raises
         ------
         Exception
-            If the board cannot be solved with this algorithm, an Exception is raised.
+            If the board cannot be solved with this algorithm or processes is combined with a limit or with nogoods, an
+            Exception is raised.
         """
-        solved = self.__backtrack()
+        if processes is not None:
+            if deadline is not None or max_nodes is not None or cancel_token is not None or nogoods is not None:
+                raise Exception("The limits and the nogoods cannot be combined with worker processes")
+            return self.__solve_in_parallel(policy, processes)
+        limits = None
+        if deadline is not None or max_nodes is not None or cancel_token is not None:
+            limits = SearchLimits(deadline, max_nodes, cancel_token)
+        engine = SearchEngine(self, policy, limits, nogoods)
+        solved = engine.next_solution()
+        if not solved and engine.stop_reason() is not None:
+            engine.rewind_to_root()
+            self.stop_trail()
+            return Unfinished(engine.stop_reason(), engine.nodes(), limits.seconds(), self)
+        self.stop_trail()
         if not solved:
             raise Exception("Could not solve the board with backtracking")
-        else:
-            for cell in self:
-                if not cell.is_number_fixed():
-                    cell.new_fixed_number(cell.maybe_number())
-        self.validate()
-
-    def __backtrack(self) -> bool:
-        """
-        This is the backtracking algorithm.
-        It works as follows:
-        - from the given board, it takes the first cell which has no fixed number. It sets the first maybe_number
-            of that cell and afterwards checks if the board is still valid (with maybe).
-        - if the board is still valid, it passes the board to the next recursion of that method. By doing this, each
-            function always gets a valid board as input.
-        - if the board is not valid with the maybe number, the function takes the next maybe number and repeats the
-            step. If there are no more maybe numbers and the board is still not valid, it returns False.
+        return engine.nodes()
+
+    def count_solutions(self, limit=None, policy=None, processes=None, nogoods=None) -> int:
+        """Counts the solutions of the board. Unlike solve_with_backtrack(), the search does not stop at the first
+        solution but continues from there (see SearchEngine.next_solution()) until limit solutions have been found or
+        the whole search tree has been searched. The board is not changed.
+
+        Parameters
+        ----------
+        limit : int
+            the search stops as soon as limit solutions have been found. If None (default), all solutions are
+            counted, which can take very long for boards with only a few fixed numbers.
+        policy
+            the branching policy, see solve_with_backtrack().
+        processes : int
+            if given, the search tree is split among this number of worker processes (see
+            parallel.count_solutions_parallel()).
+        nogoods : NogoodStore
+            if given, the dead ends of the search are recorded in this store, see solve_with_backtrack(). It cannot be
+            combined with processes.
+
+        Returns
+        -------
+        int
+            the number of solutions, at most limit.
 
+        Raises
+        ------
+        Exception
+            If the limit is smaller than 1 or nogoods are combined with processes, an Exception is raised.
+        """
+        if limit is not None and limit < 1:
+            raise Exception("The limit must be at least 1")
+        if processes is not None:
+            if nogoods is not None:
+                raise Exception("The nogoods cannot be combined with worker processes")
+            # imported here since module parallel depends on this module
+            from src.sudoku.parallel import count_solutions_parallel
+
+            return count_solutions_parallel(self, limit, processes, policy)
+
+        trail = self._trail
+        checkpoint = self.checkpoint()
+        engine = SearchEngine(self, policy, nogoods=nogoods)
+        count = 0
+        while (limit is None or count < limit) and engine.next_solution():
+            count += 1
+        self.rewind(checkpoint)
+        if trail is None:
+            self.stop_trail()
+        return count
+
+    def has_unique_solution(self, policy=None) -> bool:
+        """
         Returns
         -------
         bool
-            True if the board is still valid with the next maybe number set. False otherwise.
+            True if the board has exactly one solution, False otherwise. The search stops as soon as a second
+            solution has been found (see count_solutions()).
         """
+        return self.count_solutions(2, policy) == 1
 
-        first_cell_without_number = None
-        for cell in self:
-            if not cell.is_number_fixed_or_maybe_number_set():
-                first_cell_without_number = cell
-                break
+    def assign(self, cell, number) -> bool:
+        """Sets a fixed number to the given cell and removes it from the "maybe numbers" of its peers. Unlike
+        set_fixed_value_of_cell(), no Exception is raised if the board is not valid any more.
 
-        if not first_cell_without_number:
-            # great, there are no "empty" cells any longer, and we have a valid board, so this is the solution
-            return True
+        Returns
+        -------
+        bool
+            True if the board is still valid, False otherwise. If False is returned, the board is left in an invalid
+            state and should be rewound (see rewind()).
+        """
+        if cell.is_number_fixed():
+            return cell.number() == number
+        if not cell.maybe_numbers_mask() & bit(number):
+            return False
+        idx = index_of(cell.pos(), self._geometry.size)
+        checks = []
+        self.__fix_number(idx, number, checks)
+        return self.__propagate([idx], checks)
 
-        while first_cell_without_number.new_maybe_number():
-            if not self.validate(with_maybe=True):
-                # board is not valid, so we try the next number
-                continue
-            # board is still valid, so we pass the board one recursion down
+    def eliminate(self, cell, numbers_mask) -> bool:
+        """Removes the numbers of the given bitmask from the "maybe numbers" of the given cell. If only one "maybe
+        number" is left, it becomes the fixed number of the cell and is removed from the "maybe numbers" of its peers.
+        Like assign(), all changes are recorded on the trail.
 
-            if self.__backtrack():
-                # tried all variations with this maybe number, trying next one ...
-                return True
+        Returns
+        -------
+        bool
+            True if the board is still valid, False if the cell has no "maybe number" left or the propagation has
+            found a contradiction.
+        """
+        maybe_numbers_mask = cell.maybe_numbers_mask()
+        if not maybe_numbers_mask & numbers_mask:
+            return True
+        idx = index_of(cell.pos(), self._geometry.size)
+        if self._trail is not None:
+            self._trail.append((idx, None, maybe_numbers_mask))
+        remaining_mask = maybe_numbers_mask & ~numbers_mask
+        cell.restore(None, remaining_mask)
+        checks = []
+        self.__remove_positions(idx, maybe_numbers_mask & numbers_mask, checks)
+        if self._stats is not None:
+            self._stats.add_elimination(popcount(maybe_numbers_mask & numbers_mask))
+        if not remaining_mask:
+            return False
+        if not remaining_mask & (remaining_mask - 1):
+            if self._stats is not None:
+                self._stats.add_single()
+            self.__fix_number(idx, lowest_number(remaining_mask), checks)
+            return self.__propagate([idx], checks)
+        return self.__propagate([], checks)
+
+    def checkpoint(self) -> int:
+        """Starts recording all changes of the cells on the trail (if not yet started).
 
-        # we tried all maybe numbers with this board and that cell, no solution have been found
-        return False
+        Returns
+        -------
+        int
+            the checkpoint of the current state, which can be passed to rewind() to undo all later changes.
+        """
+        if self._trail is None:
+            self._trail = []
+        return len(self._trail)
+
+    def rewind(self, checkpoint) -> None:
+        """Undoes all changes of the cells which have been made after the given checkpoint (see checkpoint())."""
+        trail = self._trail
+        cells = self._cells
+        used_numbers = self._used_numbers
+        positions = self._positions
+        size = self._geometry.size
+        units_of = self._geometry.units_of
+        unit_positions_of = self._geometry.unit_positions_of
+        while len(trail) > checkpoint:
+            idx, number, maybe_numbers_mask = trail.pop()
+            cell = cells[idx]
+            fixed_number = cell.number()
+            if number is None and fixed_number is not None:
+                number_bit = bit(fixed_number)
+                for unit_idx in units_of[idx]:
+                    used_numbers[unit_idx] &= ~number_bit
+            # the numbers which become "maybe numbers" again
+            for number_added in iter_numbers(maybe_numbers_mask & ~cell.maybe_numbers_mask()):
+                for unit_idx, position_bit in unit_positions_of[idx]:
+                    positions[unit_idx * size + number_added - 1] |= position_bit
+            cell.restore(number, maybe_numbers_mask)
+
+    def stop_trail(self) -> None:
+        """Stops recording the changes of the cells. All checkpoints become invalid."""
+        self._trail = None
 
     def is_solved(self) -> bool:
         """
@@ -331,10 +608,114 @@ class Board:
             return False
         return True
 
+    def to_string(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the board in the one-line format with 81 characters in row-major order, a digit for every fixed number
+            and a '.' for every cell whose number is not known yet. On a larger board, the numbers above 9 are given
+            by their symbol (see units.SYMBOLS).
+        """
+        return self.to_bytes().decode("ascii")
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns
+        -------
+        bytes
+            the board in the one-line format, see to_string().
+        """
+        byte_of_number = self._geometry.byte_of_number
+        return bytes([byte_of_number[cell.number() or 0] for cell in self._cells])
+
     ########################################################
     # Static methods
     ########################################################
 
+    @staticmethod
+    def from_string(line):
+        """
+        Parameters
+        ----------
+        line : str
+            a board in the one-line format: 81 characters in row-major order, each one a digit from 1 to 9 or - if
+            the number is unknown - a '.', '0' or 'x'/'X'. A line of 16, 256 or 625 characters describes a board with
+            4, 16 or 25 rows, whose numbers above 9 are given by their symbol (see units.SYMBOLS, 'A' or 'a' for 10).
+
+        Returns
+        -------
+        Board
+            the board which is described by the given line.
+
+        Raises
+        ------
+        Exception
+            If the line does not contain 16, 81, 256 or 625 characters or contains an invalid character, an Exception
+            is raised.
+        """
+        return Board.from_bytes(line.encode("ascii", errors="replace"))
+
+    @staticmethod
+    def from_bytes(data):
+        """
+        Parameters
+        ----------
+        data : bytes
+            a board in the one-line format (see from_string()), given as bytes, bytearray or memoryview, for example a
+            slice of a memory-mapped file. The cells are created directly from the bytes without converting them to
+            strings first.
+
+        Returns
+        -------
+        Board
+            the board which is described by the given bytes.
+
+        Raises
+        ------
+        Exception
+            If the data does not contain 16, 81, 256 or 625 bytes or contains an invalid byte, an Exception is raised.
+        """
+        box_size = isqrt(isqrt(len(data)))
+        if not len(data) == box_size ** 4 or not MIN_BOX_SIZE <= box_size <= MAX_BOX_SIZE:
+            raise Exception(f"Cannot create board since line does not contain {SUPPORTED_CELL_COUNTS} characters")
+        board_geometry = geometry(box_size)
+        number_of_byte = board_geometry.number_of_byte
+        numbers = [number_of_byte[byte] for byte in bytes(data)]
+        if 0 in numbers:
+            raise Exception("Cannot create board since line contains an invalid character")
+        board = Board.__new__(Board)
+        board.__init_cells([Cell.from_number(number, pos, board_geometry)
+                            for number, pos in zip(numbers, board_geometry.positions)], board_geometry)
+        return board
+
+    @staticmethod
+    def from_cells(cells, board_geometry=GEOMETRY):
+        """
+        Parameters
+        ----------
+        cells : list
+            the cells of the board in row-major order, whose fixed numbers and "maybe numbers" are taken as they are
+            (see Cell.restore()), for example to restore a board from a CompactBoard (see module compact).
+        board_geometry : Geometry
+            the index tables of the board (see units.geometry()), by default those of a 9x9 board.
+
+        Returns
+        -------
+        Board
+            the board with the given cells.
+
+        Raises
+        ------
+        Exception
+            If the number of cells does not match the geometry, an Exception is raised.
+        """
+        if not len(cells) == board_geometry.cell_count:
+            raise Exception(f"Cannot create board since {board_geometry.cell_count} cells are needed")
+        board = Board.__new__(Board)
+        board.__init_cells(cells, board_geometry)
+        return board
+
     @staticmethod
     def no_doubles(numbers: list) -> bool:
         """
@@ -349,17 +730,144 @@ class Board:
     # Internal methods
     ########################################################
 
-    def __change_maybe_number_to_fixed(self, cell, all_other_cells):
-        """If the given cell contains a 'maybe number' which none of the other given cells contain, this 'maybe number'
-        is set to the new fixed number of that cell."""
-        other_maybe_numbers = []
-        for other_cell in all_other_cells:
-            if cell == other_cell or other_cell.is_number_fixed():
-                continue
-            other_maybe_numbers += other_cell.maybe_numbers()
-        for maybe_number in cell.maybe_numbers():
-            if maybe_number not in other_maybe_numbers:
-                self.set_fixed_value_of_cell(cell, maybe_number)
+    def __solve_in_parallel(self, policy, processes) -> int:
+        """Solves the board with parallel.solve_parallel() and sets the fixed numbers of the solution. Returns the
+        number of search nodes."""
+        # imported here since module parallel depends on this module
+        from src.sudoku.parallel import solve_parallel
+
+        solution, nodes = solve_parallel(self, processes, policy)
+        if solution is None:
+            raise Exception("Could not solve the board with backtracking")
+        if self._stats is not None:
+            self._stats.add_nodes(nodes)
+        for idx, cell in enumerate(self._cells):
+            if not cell.is_number_fixed():
+                self.__fix_number(idx, self._geometry.number_of_byte[ord(solution[idx])], [])
+        return nodes
+
+    def __cells_at(self, indices) -> list:
+        """Returns the list of cells at the given indices."""
+        cells = self._cells
+        return [cells[idx] for idx in indices]
+
+    def __numbers_at(self, indices, with_maybe) -> list:
+        """Returns the fixed numbers (and the "maybe numbers" if with_maybe is True) of the cells at the given
+        indices."""
+        cells = self._cells
+        if with_maybe:
+            return [cells[idx].number_or_maybe_number() for idx in indices
+                    if cells[idx].is_number_fixed_or_maybe_number_set()]
+        return [cells[idx].number() for idx in indices if cells[idx].is_number_fixed()]
+
+    def __propagate(self, pending, checks=None) -> bool:
+        """Propagates the fixed numbers until no further number can be fixed:
+
+        - naked singles: the fixed number of every cell in pending (a list of cell indices) is removed from the "maybe
+            numbers" of its peers. If a peer has only one "maybe number" left, it becomes a fixed number and the peer
+            is added to pending.
+        - hidden singles: checks is a list of keys (unit_idx * size + number - 1, see self._positions) of the units and
+            numbers which have at most one position left. If a number which is not used in the unit yet has exactly
+            one position left, it becomes the fixed number of the cell at that position.
+
+        Every removed "maybe number" updates the positions and adds the key to checks if at most one position is
+        left, so both kinds of singles are iterated together.
+
+        Returns
+        -------
+        bool
+            False if a contradiction has been found (two peers with the same fixed number, a cell without any
+            "maybe number" or a number without any position left in a unit), True otherwise.
+        """
+        cells = self._cells
+        trail = self._trail
+        stats = self._stats
+        positions = self._positions
+        used_numbers = self._used_numbers
+        size = self._geometry.size
+        units = self._geometry.units
+        peers = self._geometry.peers
+        unit_positions_of = self._geometry.unit_positions_of
+        if checks is None:
+            checks = []
+        while True:
+            if pending:
+                idx = pending.pop()
+                number = cells[idx].number()
+                number_bit = bit(number)
+                number_offset = number - 1
+                for peer_idx in peers[idx]:
+                    peer = cells[peer_idx]
+                    if not peer.maybe_numbers_mask() & number_bit:
+                        if peer.number() == number:
+                            return False
+                        continue
+                    if trail is not None:
+                        trail.append((peer_idx, None, peer.maybe_numbers_mask()))
+                    remaining_mask = peer.remove_maybe_number(number)
+                    for unit_idx, position_bit in unit_positions_of[peer_idx]:
+                        key = unit_idx * size + number_offset
+                        remaining_positions = positions[key] & ~position_bit
+                        positions[key] = remaining_positions
+                        if not remaining_positions & (remaining_positions - 1):
+                            checks.append(key)
+                    if stats is not None:
+                        stats.add_elimination()
+                    if not remaining_mask:
+                        return False
+                    if not remaining_mask & (remaining_mask - 1):
+                        # only one maybe number is left, so this is the new fixed number
+                        if stats is not None:
+                            stats.add_single()
+                        self.__fix_number(peer_idx, lowest_number(remaining_mask), checks)
+                        pending.append(peer_idx)
+            elif checks:
+                key = checks.pop()
+                unit_idx, number_offset = divmod(key, size)
+                if used_numbers[unit_idx] & (1 << number_offset):
+                    continue
+                position_mask = positions[key]
+                if not position_mask:
+                    # the number cannot be placed anywhere in this unit any longer
+                    return False
+                if position_mask & (position_mask - 1):
+                    continue
+                # only one position is left, so this is the new fixed number of the cell at that position
+                idx = units[unit_idx][position_mask.bit_length() - 1]
+                if stats is not None:
+                    stats.add_single()
+                self.__fix_number(idx, number_offset + 1, checks)
+                pending.append(idx)
+            else:
+                return True
+
+    def __fix_number(self, idx, number, checks):
+        """Sets the fixed number of the cell at the given index and marks it as used in the units of that cell. The
+        cell is removed from the positions of its former "maybe numbers" (see __remove_positions())."""
+        cell = self._cells[idx]
+        maybe_numbers_mask = cell.maybe_numbers_mask()
+        if self._trail is not None:
+            self._trail.append((idx, cell.number(), maybe_numbers_mask))
+        cell.new_fixed_number(number)
+        number_bit = bit(number)
+        used_numbers = self._used_numbers
+        for unit_idx in self._geometry.units_of[idx]:
+            used_numbers[unit_idx] |= number_bit
+        self.__remove_positions(idx, maybe_numbers_mask, checks)
+
+    def __remove_positions(self, idx, numbers_mask, checks):
+        """Removes the cell at the given index from the positions of the given numbers in its units. The keys of the
+        units and numbers which have at most one position left are added to checks."""
+        positions = self._positions
+        size = self._geometry.size
+        unit_positions = self._geometry.unit_positions_of[idx]
+        for number in iter_numbers(numbers_mask):
+            for unit_idx, position_bit in unit_positions:
+                key = unit_idx * size + number - 1
+                remaining_positions = positions[key] & ~position_bit
+                positions[key] = remaining_positions
+                if not remaining_positions & (remaining_positions - 1):
+                    checks.append(key)
 
     #########################################################
     # Built-in methods
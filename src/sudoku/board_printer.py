@@ -1,31 +1,163 @@
+"""Renders boards as text in one of several formats.
+
+A BoardRenderer formats every board into a buffer and writes the buffer to its stream in bulk, when the buffer is full
+and when it is flushed (or closed), instead of writing every cell on its own. The formats are:
+
+- PRETTY: the grid of the board with the number of fixed and open cells, as print_board() has always printed it.
+- LINE: the board in the one-line format (see Board.to_string()), one board per line.
+- JSON: one JSON object per line with the title, the board in the one-line format, the number of fixed and open
+  cells and the statistics (see module stats), if given.
+- QUIET: nothing is written, the boards are not even formatted.
+
+The boards are formatted from their one-line format, so a Board as well as a CompactBoard (see module compact) can be
+rendered, and the cells are visited only once.
+"""
+import json
+import sys
+
+PRETTY = "pretty"
+LINE = "line"
+JSON = "json"
+QUIET = "quiet"
+FORMATS = (PRETTY, LINE, JSON, QUIET)
+
+# the buffer of a BoardRenderer is written to its stream as soon as it holds at least this number of characters
+BUFFER_SIZE = 64 * 1024
+
+
+class BoardRenderer:
+    """
+    An instance of class BoardRenderer renders boards into a buffer and writes it to a stream in bulk (see module
+    board_printer). It can be used as context manager, which flushes the buffer at the end.
+
+    Parameters
+    ----------
+    stream
+        the text stream which the output is written to, by default sys.stdout.
+    output_format : str
+        PRETTY (default), LINE, JSON or QUIET.
+    buffer_size : int
+        the number of characters from which on the buffer is written to the stream.
+    """
+
+    def __init__(self, stream=None, output_format=PRETTY, buffer_size=BUFFER_SIZE):
+        if output_format not in FORMATS:
+            raise Exception(f"Unknown output format {output_format}")
+        self._stream = stream if stream is not None else sys.stdout
+        self._output_format = output_format
+        self._buffer_size = buffer_size
+        self._parts = []
+        self._buffered = 0
+
+    def output_format(self) -> str:
+        return self._output_format
+
+    def render(self, board, title=None, stats=None, intermediate=False) -> None:
+        """Renders the given board into the buffer.
+
+        Parameters
+        ----------
+        board
+            a Board or CompactBoard.
+        title : str
+            the title of the board, which is printed above the grid (PRETTY) or added as "title" (JSON).
+        stats
+            the statistics of solving the board, a SolveStats object (see module stats) or a dict. Only the JSON
+            format contains them.
+        intermediate : bool
+            if True, the board is only rendered in the PRETTY format, for example the initial board before it has
+            been solved.
+        """
+        output_format = self._output_format
+        if output_format == QUIET or intermediate and not output_format == PRETTY:
+            return
+        if output_format == PRETTY:
+            self.__append(format_pretty(board, title))
+        elif output_format == LINE:
+            self.__append(board.to_string() + "\n")
+        else:
+            self.__append(format_json(board, title, stats) + "\n")
+
+    def render_text(self, text) -> None:
+        """Renders the given line of text into the buffer. Like intermediate boards (see render()), the text is only
+        rendered in the PRETTY format, so that the other formats stay machine-readable."""
+        if self._output_format == PRETTY:
+            self.__append(text + "\n")
+
+    def flush(self) -> None:
+        """Writes the buffer to the stream with a single write and flushes the stream."""
+        if self._parts:
+            self._stream.write("".join(self._parts))
+            self._parts = []
+            self._buffered = 0
+        self._stream.flush()
+
+    def __append(self, text):
+        self._parts.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        return False
+
+
+def format_pretty(board, title=None) -> str:
+    """
+    Returns
+    -------
+    str
+        the grid of the given board with the number of fixed and open cells, preceded by the title if given.
+    """
+    board_geometry = board.geometry()
+    box_size = board_geometry.box_size
+    size = board_geometry.size
+    line = board.to_string()
+    num_not_fixed = line.count(".")
+
+    parts = []
+    if title is not None:
+        parts.append("*******************************************\n")
+        parts.append(f"************  {title}  ***************\n")
+    parts.append("-----------------\n")
+    parts.append(f"Numbers of cells fixed: {len(line) - num_not_fixed}\n")
+    parts.append(f"Numbers of cells not fixed: {num_not_fixed}\n\n")
+    separator = "-" * (size * 2 + box_size) + "\n"
+    line = line.replace(".", "X")
+    for row_idx in range(size):
+        row = line[row_idx * size:(row_idx + 1) * size]
+        parts.append("| |".join("|".join(row[start:start + box_size]) for start in range(0, size, box_size)) + "\n")
+        if (row_idx + 1) % box_size == 0:
+            parts.append(separator)
+    parts.append("\n")
+    return "".join(parts)
+
+
+def format_json(board, title=None, stats=None) -> str:
+    """
+    Returns
+    -------
+    str
+        the given board as JSON object in a single line, see module board_printer.
+    """
+    line = board.to_string()
+    num_not_fixed = line.count(".")
+    result = {"title": title, "board": line, "fixed": len(line) - num_not_fixed, "not_fixed": num_not_fixed}
+    if stats is not None:
+        result["stats"] = stats if isinstance(stats, dict) else stats.as_dict()
+    return json.dumps(result)
+
+
 def print_board(board):
-    num_fixed, num_not_fixed = numbers_of_cells_fixed_not_fixed(board)
-
-    print("-----------------")
-    print(f"Numbers of cells fixed: {num_fixed}")
-    print(f"Numbers of cells not fixed: {num_not_fixed}\n")
-    for idx, cell in enumerate(board):
-        end_str = '|'
-        if (idx + 1) % 3 == 0:
-            end_str = '| |'
-        if (idx + 1) % 9 == 0:
-            end_str = "\n"
-        print(cell, end=end_str)
-        if (idx + 1) % 27 == 0:
-            print("---------------------")
-
-    print()
-    # for cell in cells:
-    #     if not cell.is_number_fixed():
-    #         print(str(cell.pos()) + ": " + str(cell.maybe_numbers()))
+    """Prints the grid of the given board (see format_pretty()) with a single write."""
+    sys.stdout.write(format_pretty(board))
 
 
 def numbers_of_cells_fixed_not_fixed(board):
-    numbers_of_cells_fixed = 0
-    numbers_of_cells_not_fixed = 0
-    for cell in board:
-        if cell.is_number_fixed():
-            numbers_of_cells_fixed += 1
-        else:
-            numbers_of_cells_not_fixed += 1
-    return numbers_of_cells_fixed, numbers_of_cells_not_fixed
+    line = board.to_string()
+    num_not_fixed = line.count(".")
+    return len(line) - num_not_fixed, num_not_fixed
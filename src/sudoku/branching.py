@@ -0,0 +1,80 @@
+"""Branching policies for the backtracking algorithm of a Board.
+
+A branching policy decides on which cell the backtracking algorithm branches next and in which order the "maybe
+numbers" of that cell are tried. A policy has two methods:
+
+- select_cell(board) returns the next cell without a fixed or "maybe number", or None if there is no such cell.
+- order_numbers(board, cell, numbers_mask) returns the numbers of numbers_mask (a bitmask of the numbers which are
+    still possible in the cell) in the order in which they should be tried.
+"""
+from src.sudoku.bits import bit, iter_numbers, popcount
+
+
+class FirstEmptyCell:
+    """Branches on the first empty cell in row-major order and tries its numbers in ascending order."""
+
+    def select_cell(self, board):
+        for cell in board:
+            if not cell.is_number_fixed_or_maybe_number_set():
+                return cell
+        return None
+
+    def order_numbers(self, board, cell, numbers_mask) -> list:
+        return list(iter_numbers(numbers_mask))
+
+
+class MinimumRemainingValues:
+    """Branches on the empty cell with the fewest remaining numbers ("most constrained cell"). If several cells have
+    the same number of remaining numbers, the cell with the most empty peers is taken (degree heuristic). If this is
+    still a tie, the cell whose row, column and block hold the most fixed numbers is taken (unit density, see
+    Board.count_fixed_in_units()). Without this last rule, the first of the tied cells would be taken, which can lead
+    the search into a far larger subtree: on some puzzles this needed several times the nodes of FirstEmptyCell.
+
+    Parameters
+    ----------
+    least_constraining_value : bool
+        if set to True, the numbers of a cell are tried starting with the number which is still possible in the
+        fewest empty peers. If False (default), the numbers are tried in ascending order.
+    """
+
+    def __init__(self, least_constraining_value=False):
+        self._least_constraining_value = least_constraining_value
+
+    def select_cell(self, board):
+        best_cell = None
+        best_count = None
+        best_degree = -1
+        best_density = None
+        for cell in board:
+            if cell.is_number_fixed_or_maybe_number_set():
+                continue
+            count = popcount(cell.maybe_numbers_mask() & ~board.used_numbers_mask(cell))
+            if count == 0:
+                # this cell is a dead end, there is no need to look any further
+                return cell
+            if best_count is not None and count > best_count:
+                continue
+            degree = len(board.empty_peers(cell))
+            if best_count is None or count < best_count or degree > best_degree:
+                best_cell, best_count, best_degree, best_density = cell, count, degree, None
+            elif degree == best_degree:
+                # the unit density is only needed for a tie, so it is computed lazily
+                if best_density is None:
+                    best_density = board.count_fixed_in_units(best_cell)
+                density = board.count_fixed_in_units(cell)
+                if density > best_density:
+                    best_cell, best_density = cell, density
+        return best_cell
+
+    def order_numbers(self, board, cell, numbers_mask) -> list:
+        numbers = list(iter_numbers(numbers_mask))
+        if not self._least_constraining_value or len(numbers) < 2:
+            return numbers
+        peers = board.empty_peers(cell)
+        peer_masks = [peer.maybe_numbers_mask() & ~board.used_numbers_mask(peer) for peer in peers]
+
+        def constrained_peers(number):
+            number_bit = bit(number)
+            return sum(1 for peer_mask in peer_masks if peer_mask & number_bit)
+
+        return sorted(numbers, key=constrained_peers)
@@ -0,0 +1,246 @@
+"""Canonical form of boards and a solution cache which is keyed on it.
+
+Two boards are equivalent if one can be turned into the other by relabelling the numbers, swapping rows within a
+band (three rows of blocks), swapping bands, swapping columns within a stack (three columns of blocks), swapping
+stacks and transposing. Equivalent boards have equivalent solutions, so a solution which has been found for one
+board can be mapped to all equivalent boards.
+
+The canonical form is the lexicographically smallest board among a set of candidate arrangements. To keep this set
+small, the rows and columns are first sorted by keys which do not change under the transformations above (the number
+of fixed numbers of the line, of the crossing lines and how often these numbers occur on the whole board). Only
+lines with equal keys are tried in every order; afterwards the numbers are relabelled in the order of their first
+occurrence. If there are more than MAX_ARRANGEMENTS candidate arrangements, only the first ones are tried. In this
+case two equivalent boards can get different canonical forms, which only costs a cache miss: the mapping from a
+board to its canonical form and back is always exact.
+
+Only 9x9 boards are supported.
+"""
+from collections import OrderedDict, namedtuple
+from itertools import islice, permutations, product
+
+from src.sudoku.board import Board
+import src.sudoku.solver as solver
+from src.sudoku.units import BOX_SIZE, CELL_COUNT, SIZE
+
+MAX_ARRANGEMENTS = 256
+
+Transform = namedtuple("Transform", ["transposed", "rows", "cols", "relabel"])
+Transform.__doc__ = """The transformation of a board into its canonical form: the board is transposed (if transposed
+is True), rows[i] is the row which becomes row i, cols[j] is the column which becomes column j and relabel[n] is the
+new number of number n."""
+
+
+def canonical_form(board) -> tuple:
+    """
+    Returns
+    -------
+    tuple
+        a tuple (key, transform). key is the canonical form of the fixed numbers of the board in the one-line format,
+        transform is the Transform which turns the board into its canonical form.
+
+    Raises
+    ------
+    Exception
+        If the board is not a 9x9 board, an Exception is raised.
+    """
+    if not board.geometry().size == SIZE:
+        raise Exception("Cannot compute the canonical form, only 9x9 boards are supported")
+    values = [cell.number() or 0 for cell in board]
+    best_key = None
+    best_transform = None
+    for transposed in (False, True):
+        oriented = _transposed(values) if transposed else values
+        row_keys, col_keys = _line_keys(oriented)
+        arrangements = product(_line_orders(row_keys), _line_orders(col_keys))
+        for rows, cols in islice(arrangements, MAX_ARRANGEMENTS):
+            key, relabel = _arranged(oriented, rows, cols)
+            if best_key is None or key < best_key:
+                best_key = key
+                best_transform = Transform(transposed, rows, cols, relabel)
+    return _to_line(best_key), _completed(best_transform)
+
+
+def apply_transform(line, transform) -> str:
+    """Applies the given transform to a board in the one-line format and returns the transformed board."""
+    values = _to_values(line)
+    if transform.transposed:
+        values = _transposed(values)
+    relabel = transform.relabel
+    return _to_line([relabel[values[row_idx * SIZE + col_idx]] for row_idx in transform.rows
+                      for col_idx in transform.cols])
+
+
+def invert_transform(line, transform) -> str:
+    """Applies the inverse of the given transform to a board in the one-line format, for example to map the solution
+    of a canonical form back to the original board."""
+    values = _to_values(line)
+    inverse_relabel = [0] * (SIZE + 1)
+    for number, new_number in enumerate(transform.relabel):
+        inverse_relabel[new_number] = number
+    original = [0] * CELL_COUNT
+    for row_pos, row_idx in enumerate(transform.rows):
+        for col_pos, col_idx in enumerate(transform.cols):
+            original[row_idx * SIZE + col_idx] = inverse_relabel[values[row_pos * SIZE + col_pos]]
+    if transform.transposed:
+        original = _transposed(original)
+    return _to_line(original)
+
+
+class SolutionCache:
+    """
+    An instance of class SolutionCache solves boards and caches the solutions by the canonical form of the boards.
+    If an equivalent board has been solved before, the cached solution is mapped back through the inverse transform
+    instead of solving the board again. If the cache is full, the least recently used solution is evicted.
+
+    Parameters
+    ----------
+    maxsize : int
+        the maximum number of cached solutions.
+    solve
+        the function which solves a board on a cache miss. It gets the board and returns the solved board. If None
+        (default), solver.solve() is used.
+    """
+
+    def __init__(self, maxsize=1024, solve=None):
+        if maxsize < 1:
+            raise Exception("The size of the cache must be at least 1")
+        if solve is None:
+            solve = solver.solve
+        self._maxsize = maxsize
+        self._solve = solve
+        self._solutions = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def solve(self, board):
+        """Solves the given board. On a cache miss, the given board is solved with the solve function (and changed
+        by it), on a cache hit a new board is returned.
+
+        Returns
+        -------
+        Board
+            the solved board.
+
+        Raises
+        ------
+        Exception
+            If the board cannot be solved, an Exception is raised.
+        """
+        key, transform = canonical_form(board)
+        canonical_solution = self._solutions.get(key)
+        if canonical_solution is not None:
+            self._hits += 1
+            self._solutions.move_to_end(key)
+            return Board.from_string(invert_transform(canonical_solution, transform))
+
+        self._misses += 1
+        solution = self._solve(board)
+        self._solutions[key] = apply_transform(solution.to_string(), transform)
+        if len(self._solutions) > self._maxsize:
+            self._solutions.popitem(last=False)
+            self._evictions += 1
+        return solution
+
+    def hits(self) -> int:
+        """Returns the number of boards whose solution was found in the cache."""
+        return self._hits
+
+    def misses(self) -> int:
+        """Returns the number of boards which had to be solved."""
+        return self._misses
+
+    def evictions(self) -> int:
+        """Returns the number of solutions which have been evicted because the cache was full."""
+        return self._evictions
+
+    def __len__(self):
+        return len(self._solutions)
+
+
+def _line_keys(values) -> tuple:
+    """Returns the keys of the rows and of the columns of the given values. The keys do not change if the numbers
+    are relabelled or the rows and columns are permuted."""
+    frequency = [0] * (SIZE + 1)
+    for value in values:
+        frequency[value] += 1
+    rows = [[] for _ in range(SIZE)]
+    cols = [[] for _ in range(SIZE)]
+    for idx, value in enumerate(values):
+        if value:
+            rows[idx // SIZE].append((idx % SIZE, value))
+            cols[idx % SIZE].append((idx // SIZE, value))
+
+    row_keys = [(len(row), tuple(sorted((len(cols[col_idx]), frequency[value]) for col_idx, value in row)))
+                for row in rows]
+    col_keys = [(len(col), tuple(sorted((len(rows[row_idx]), frequency[value]) for row_idx, value in col)))
+                for col in cols]
+    # second round: the keys of the crossing lines are taken into account
+    refined_row_keys = [(row_keys[row_idx], tuple(sorted(col_keys[col_idx] for col_idx, value in row)))
+                        for row_idx, row in enumerate(rows)]
+    refined_col_keys = [(col_keys[col_idx], tuple(sorted(row_keys[row_idx] for row_idx, value in col)))
+                        for col_idx, col in enumerate(cols)]
+    return refined_row_keys, refined_col_keys
+
+
+def _line_orders(keys):
+    """Yields all orders of the lines (rows or columns) in which the bands and the lines within the bands are sorted
+    by their keys."""
+    band_orders = []
+    band_keys = []
+    for band_idx in range(BOX_SIZE):
+        lines = range(band_idx * BOX_SIZE, band_idx * BOX_SIZE + BOX_SIZE)
+        sorted_keys = sorted(keys[line_idx] for line_idx in lines)
+        band_orders.append([order for order in permutations(lines)
+                            if [keys[line_idx] for line_idx in order] == sorted_keys])
+        band_keys.append(sorted_keys)
+    sorted_band_keys = sorted(band_keys)
+    for bands in permutations(range(BOX_SIZE)):
+        if [band_keys[band_idx] for band_idx in bands] != sorted_band_keys:
+            continue
+        for orders in product(*(band_orders[band_idx] for band_idx in bands)):
+            yield sum(orders, ())
+
+
+def _arranged(values, rows, cols) -> tuple:
+    """Arranges the values in the given order of rows and columns and relabels the numbers in the order of their
+    first occurrence. Returns the arranged values and the relabelling."""
+    relabel = [0] * (SIZE + 1)
+    next_number = 1
+    arranged = []
+    for row_idx in rows:
+        offset = row_idx * SIZE
+        for col_idx in cols:
+            value = values[offset + col_idx]
+            if value:
+                if not relabel[value]:
+                    relabel[value] = next_number
+                    next_number += 1
+                arranged.append(relabel[value])
+            else:
+                arranged.append(0)
+    return arranged, relabel
+
+
+def _completed(transform):
+    """Completes the relabelling of the transform for the numbers which do not occur on the board."""
+    relabel = list(transform.relabel)
+    unused = [number for number in range(1, SIZE + 1) if number not in relabel]
+    for number in range(1, SIZE + 1):
+        if not relabel[number]:
+            relabel[number] = unused.pop(0)
+    return transform._replace(relabel=tuple(relabel))
+
+
+def _transposed(values) -> list:
+    return [values[col_idx * SIZE + row_idx] for row_idx in range(SIZE) for col_idx in range(SIZE)]
+
+
+def _to_values(line) -> list:
+    if not len(line) == CELL_COUNT:
+        raise Exception("Cannot transform the board, only 9x9 boards are supported")
+    return [int(character) if character in "123456789" else 0 for character in line]
+
+
+def _to_line(values) -> str:
+    return "".join(str(value) if value else "." for value in values)
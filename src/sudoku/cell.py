@@ -1,3 +1,7 @@
+from src.sudoku.bits import bit, iter_numbers, lowest_number, mask_of, popcount
+from src.sudoku.units import GEOMETRY, index_of
+
+
 class Cell:
     """This class represents a single cell on a Sudoku board
 
@@ -5,30 +9,58 @@ class Cell:
     ----------
     number : str
         the number must either represent a value between 1 and 9 or - if the number is yet unknown - a 'x' or 'X'.
+        On a larger board, the numbers above 9 are given either as integer value or by their symbol (see
+        units.SYMBOLS, e.g. 'A' for 10).
     pos : tuple
         a tuple containing two values, the x- and y-coordinate of the cell.
+    geometry : Geometry
+        the index tables of the board of the cell (see units.geometry()), by default those of a 9x9 board.
     """
 
-    def __init__(self, number, pos):
+    # a board holds 81 or more cells, so the cells have no __dict__
+    __slots__ = ("_number", "_maybe_number", "_maybe_numbers_mask", "_pos", "_geometry")
+
+    def __init__(self, number, pos, geometry=GEOMETRY):
         if not isinstance(number, str):
             raise Exception("Cannot create cell, given input is not a String")
 
-        if not str(number).isdigit() and not number.lower() == 'x':
+        is_symbol = len(number) == 1 and number.upper() in geometry.symbols
+        if not number.isdigit() and not is_symbol and not number.lower() == 'x':
             raise Exception("Cannot create cell, given input is neither a digit nor 'x'/'X'")
 
-        if str(number).isdigit() and not int(number) in range(1, 10):
-            raise Exception("Cannot create cell, given input is not an integer value between 1 and 10")
+        if number.isdigit() and not int(number) in range(1, geometry.size + 1):
+            raise Exception(f"Cannot create cell, given input is not an integer value between 1 and "
+                            f"{geometry.size + 1}")
 
-        if str(number).isdigit():
-            self._number = int(number)
+        if number.isdigit() or is_symbol:
+            self._number = int(number) if number.isdigit() else geometry.symbols.index(number.upper()) + 1
             self._maybe_number = None
-            self._maybe_numbers = []
+            self._maybe_numbers_mask = 0
         else:
             self._number = None
             self._maybe_number = None
-            self._maybe_numbers = list(range(1, 10))
+            self._maybe_numbers_mask = geometry.all_numbers
 
         self._pos = pos  # TODO: validate value of pos
+        self._geometry = geometry
+
+    @staticmethod
+    def from_number(number, pos, geometry=GEOMETRY):
+        """Creates a cell from an already validated number, an int between 1 and 9 (or the size of the board given by
+        geometry) or None if the number is yet unknown. This is faster than parsing the number from a string.
+
+        Returns
+        -------
+        Cell
+            the new cell.
+        """
+        cell = Cell.__new__(Cell)
+        cell._number = number
+        cell._maybe_number = None
+        cell._maybe_numbers_mask = 0 if number is not None else geometry.all_numbers
+        cell._pos = pos
+        cell._geometry = geometry
+        return cell
 
     def number(self) -> int:
         """
@@ -77,7 +109,26 @@ class Cell:
             if the number is yet unknown, the list contains the possible numbers of that cell. If the number is
             already known, an empty list is returned.
         """
-        return self._maybe_numbers
+        return list(iter_numbers(self._maybe_numbers_mask))
+
+    def maybe_numbers_mask(self) -> int:
+        """
+        Returns
+        -------
+        int
+            the "maybe numbers" as a bitmask, bit 0 stands for the number 1, bit 8 for the number 9. If the number
+            is already known, 0 is returned.
+        """
+        return self._maybe_numbers_mask
+
+    def count_maybe_numbers(self) -> int:
+        """
+        Returns
+        -------
+        int
+            the number of "maybe numbers" of that cell.
+        """
+        return popcount(self._maybe_numbers_mask)
 
     def pos(self) -> tuple:
         """
@@ -130,25 +181,67 @@ class Cell:
             if after the reduction of the maybe numbers, no maybe numbers remain, an Exception is raised. This
             happens only if we are operating on an invalid Sudoku board.
         """
+        return self.reduce_maybe_numbers_mask(mask_of(fixed_numbers))
+
+    def reduce_maybe_numbers_mask(self, fixed_numbers_mask) -> bool:
+        """
+        Same as reduce_maybe_numbers(), but the fixed numbers are given as a bitmask.
+
+        Parameters
+        ----------
+        fixed_numbers_mask : int
+            bitmask of numbers which are fixed; the maybe numbers are reduced by these numbers.
+
+        Returns
+        -------
+        bool
+            True if the (fixed) number of a cell has been set successfully, False otherwise.
+
+        Raises
+        ------
+        Exception
+            if after the reduction of the maybe numbers, no maybe numbers remain, an Exception is raised.
+        """
         if self.is_number_fixed():
             return False
-        self._maybe_numbers = list(set(self._maybe_numbers) - set(fixed_numbers))
-        if len(self._maybe_numbers) == 0:
+        self._maybe_numbers_mask &= ~fixed_numbers_mask
+        if not self._maybe_numbers_mask:
             raise Exception("No maybe numbers remain, check this")
-        elif len(self._maybe_numbers) == 1:
+        elif popcount(self._maybe_numbers_mask) == 1:
             # we have found a new fixed number
-            self.new_fixed_number(self._maybe_numbers[0])
+            self.new_fixed_number(lowest_number(self._maybe_numbers_mask))
             return True
-        # if we make changes in the maybe_numbers list, we also reset the maybe_number
-        self._maybe_numbers.sort()
+        # if we make changes in the maybe numbers, we also reset the maybe_number
         self._maybe_number = None
         return False
 
+    def remove_maybe_number(self, number) -> int:
+        """
+        Removes a single number from the "maybe numbers". Unlike reduce_maybe_numbers(), the cell is not fixed if
+        only one maybe number remains, and no Exception is raised if no maybe number remains; this is left to the
+        caller.
+
+        Returns
+        -------
+        int
+            the bitmask of the remaining maybe numbers.
+        """
+        self._maybe_numbers_mask &= ~bit(number)
+        self._maybe_number = None
+        return self._maybe_numbers_mask
+
     def new_fixed_number(self, number) -> None:
         """Sets a new fixed number, the maybe numbers are being reset."""
         self._number = number
         self._maybe_number = None
-        self._maybe_numbers.clear()
+        self._maybe_numbers_mask = 0
+
+    def restore(self, number, maybe_numbers_mask) -> None:
+        """Restores a previous state of the cell, given by its fixed number (or None) and the bitmask of its maybe
+        numbers. The maybe number is reset."""
+        self._number = number
+        self._maybe_number = None
+        self._maybe_numbers_mask = maybe_numbers_mask
 
     def new_maybe_number(self) -> bool:
         """Sets a new maybe number. This is a number we are trying for this cell, without being sure it is the
@@ -172,16 +265,13 @@ class Cell:
             raise Exception("Do not call this method if the number is already fixed")
 
         if not self._maybe_number:
-            self._maybe_number = self._maybe_numbers[0]
-            return True
+            self._maybe_number = lowest_number(self._maybe_numbers_mask)
+            return self._maybe_number is not None
 
-        cur_maybe_number_idx = self._maybe_numbers.index(self._maybe_number)
-        if cur_maybe_number_idx == len(self._maybe_numbers) - 1:
-            self._maybe_number = None
-            return False
-        else:
-            self._maybe_number = self._maybe_numbers[cur_maybe_number_idx + 1]
-            return True
+        # all maybe numbers which are higher than the current maybe number
+        higher_maybe_numbers = self._maybe_numbers_mask & ~(bit(self._maybe_number + 1) - 1)
+        self._maybe_number = lowest_number(higher_maybe_numbers)
+        return self._maybe_number is not None
 
     def get_row_idx(self) -> int:
         """
@@ -208,17 +298,13 @@ class Cell:
         int
             the block index of that cell, starting from 0 in the first block (upper left) to 8 (bottom right).
         """
-        if self.get_row_idx() < 3:
-            return self.get_col_idx() // 3
-        elif self.get_row_idx() < 6:
-            return 3 + self.get_col_idx() // 3
-        else:
-            return 6 + self.get_col_idx() // 3
+        return self._geometry.block_of[index_of(self._pos, self._geometry.size)]
 
     def __str__(self):
-        """Prints the fixed number of that cell or 'X' if the number is not yet known."""
+        """Prints the fixed number of that cell (its symbol on a larger board, see units.SYMBOLS) or 'X' if the
+        number is not yet known."""
         if self._number:
-            return str(self._number)
+            return self._geometry.symbols[self._number - 1]
         else:
             return 'X'
 
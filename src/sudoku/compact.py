@@ -0,0 +1,266 @@
+"""A compact, read-only representation of a board for holding many boards in memory.
+
+A Board holds a Cell object for every cell and the index tables of its propagation, about 10 KB for a 9x9 board. A
+CompactBoard holds only the fixed numbers as bytes (one byte per cell, 0 for an unknown number) and - only if the
+"maybe numbers" have been reduced - their bitmasks as a flat array, so a 9x9 puzzle takes less than 200 bytes (about
+430 bytes with the bitmasks). The cells are not stored: indexing or iterating a CompactBoard creates lightweight
+CellView objects on access, which read their values from the bytes and the array.
+
+A CompactBoard is created from the one-line format (see from_string() and from_bytes(), without creating a Cell at
+all) or from a Board (see from_board()), and turned back into a Board with to_board() to solve it.
+"""
+from array import array
+from math import isqrt
+
+from src.sudoku.bits import iter_numbers, popcount
+from src.sudoku.board import SUPPORTED_CELL_COUNTS, Board
+from src.sudoku.cell import Cell
+from src.sudoku.units import MAX_BOX_SIZE, MIN_BOX_SIZE, geometry, index_of
+
+# the byte in the translation table of the one-line format (see _tables_of()) for an invalid byte
+INVALID_BYTE = 255
+
+# the translation tables of every box size, see _tables_of()
+_TABLES = {}
+
+
+class CompactBoard:
+    """
+    An instance of class CompactBoard holds a board in a compact form (see module compact). Use the static methods
+    from_string(), from_bytes() and from_board() to create it.
+
+    Parameters
+    ----------
+    board_geometry : Geometry
+        the index tables of the board (see units.geometry()).
+    numbers : bytes
+        the fixed number of every cell in row-major order, 0 if the number is unknown.
+    masks : array
+        the bitmask of the "maybe numbers" of every cell in row-major order, 0 for a cell with a fixed number. If None,
+        every cell whose number is unknown has all numbers as "maybe numbers".
+    """
+
+    __slots__ = ("_geometry", "_numbers", "_masks")
+
+    def __init__(self, board_geometry, numbers, masks=None):
+        if not len(numbers) == board_geometry.cell_count or masks is not None and not len(masks) == len(numbers):
+            raise Exception(f"Cannot create board since {board_geometry.cell_count} cells are needed")
+        self._geometry = board_geometry
+        self._numbers = bytes(numbers)
+        self._masks = masks
+
+    def geometry(self):
+        """
+        Returns
+        -------
+        Geometry
+            the index tables of the board, see units.geometry().
+        """
+        return self._geometry
+
+    def number(self, idx) -> int:
+        """Returns the fixed number of the cell at the given index (in row-major order), or None if it is unknown."""
+        return self._numbers[idx] or None
+
+    def maybe_numbers_mask(self, idx) -> int:
+        """Returns the bitmask of the "maybe numbers" of the cell at the given index (in row-major order), 0 if its
+        number is fixed."""
+        if self._masks is not None:
+            return self._masks[idx]
+        return 0 if self._numbers[idx] else self._geometry.all_numbers
+
+    def get_cell(self, pos):
+        """
+        Returns
+        -------
+        CellView
+            a view of the cell at the given position (row index, column index).
+        """
+        return CellView(self, index_of(pos, self._geometry.size))
+
+    def is_solved(self) -> bool:
+        """
+        Returns
+        -------
+        bool
+            True if the board is solved, see Board.is_solved().
+        """
+        return 0 not in self._numbers and self.to_board().is_solved()
+
+    def to_board(self) -> Board:
+        """
+        Returns
+        -------
+        Board
+            a new Board with the fixed numbers and "maybe numbers" of this board, for example to solve it.
+        """
+        board_geometry = self._geometry
+        if self._masks is None:
+            return Board.from_bytes(self.to_bytes())
+        cells = []
+        for number, mask, pos in zip(self._numbers, self._masks, board_geometry.positions):
+            cell = Cell.from_number(number or None, pos, board_geometry)
+            cell.restore(number or None, mask)
+            cells.append(cell)
+        return Board.from_cells(cells, board_geometry)
+
+    def to_string(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the board in the one-line format, see Board.to_string().
+        """
+        return self.to_bytes().decode("ascii")
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns
+        -------
+        bytes
+            the board in the one-line format, see Board.to_bytes().
+        """
+        return self._numbers.translate(_tables_of(self._geometry)[1])
+
+    ########################################################
+    # Static methods
+    ########################################################
+
+    @staticmethod
+    def from_string(line):
+        """Creates a compact board from the one-line format, see Board.from_string()."""
+        return CompactBoard.from_bytes(line.encode("ascii", errors="replace"))
+
+    @staticmethod
+    def from_bytes(data):
+        """Creates a compact board from the one-line format given as bytes (see Board.from_bytes()). The bytes are
+        translated in a single pass, no Cell is created.
+
+        Raises
+        ------
+        Exception
+            If the data does not contain 16, 81, 256 or 625 bytes or contains an invalid byte, an Exception is raised.
+        """
+        box_size = isqrt(isqrt(len(data)))
+        if not len(data) == box_size ** 4 or not MIN_BOX_SIZE <= box_size <= MAX_BOX_SIZE:
+            raise Exception(f"Cannot create board since line does not contain {SUPPORTED_CELL_COUNTS} characters")
+        board_geometry = geometry(box_size)
+        numbers = bytes(data).translate(_tables_of(board_geometry)[0])
+        if INVALID_BYTE in numbers:
+            raise Exception("Cannot create board since line contains an invalid character")
+        return CompactBoard(board_geometry, numbers)
+
+    @staticmethod
+    def from_board(board):
+        """Creates a compact board with the fixed numbers and "maybe numbers" of the given Board. The bitmasks of the
+        "maybe numbers" are only stored if they have been reduced."""
+        board_geometry = board.geometry()
+        all_numbers = board_geometry.all_numbers
+        numbers = bytes([cell.number() or 0 for cell in board])
+        masks = [cell.maybe_numbers_mask() for cell in board]
+        if all(mask == (0 if number else all_numbers) for number, mask in zip(numbers, masks)):
+            return CompactBoard(board_geometry, numbers)
+        # 'H' holds at least 16 bits, 'L' at least 32 bits
+        return CompactBoard(board_geometry, numbers, array("H" if board_geometry.size <= 16 else "L", masks))
+
+    #########################################################
+    # Built-in methods
+    #########################################################
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def __getitem__(self, idx):
+        if not -len(self._numbers) <= idx < len(self._numbers):
+            raise IndexError("cell index out of range")
+        return CellView(self, idx % len(self._numbers))
+
+    def __iter__(self):
+        for idx in range(len(self._numbers)):
+            yield CellView(self, idx)
+
+    def __eq__(self, other):
+        """Two compact boards are equal if they have the same fixed numbers and "maybe numbers"."""
+        if not isinstance(other, CompactBoard):
+            return False
+        return self._numbers == other._numbers and all(
+            self.maybe_numbers_mask(idx) == other.maybe_numbers_mask(idx) for idx in range(len(self._numbers)))
+
+    __hash__ = None
+
+
+class CellView:
+    """
+    A read-only view of a single cell of a CompactBoard (see module compact), with the same getters as class Cell.
+    The view holds only the board and the index of the cell and reads the values from the board.
+
+    Parameters
+    ----------
+    board : CompactBoard
+        the board of the cell.
+    idx : int
+        the index of the cell in row-major order.
+    """
+
+    __slots__ = ("_board", "_idx")
+
+    def __init__(self, board, idx):
+        self._board = board
+        self._idx = idx
+
+    def number(self) -> int:
+        """Returns the fixed number of the cell, or None if it is unknown (see Cell.number())."""
+        return self._board.number(self._idx)
+
+    def maybe_numbers(self) -> list:
+        """Returns the "maybe numbers" of the cell, see Cell.maybe_numbers()."""
+        return list(iter_numbers(self.maybe_numbers_mask()))
+
+    def maybe_numbers_mask(self) -> int:
+        """Returns the bitmask of the "maybe numbers" of the cell, see Cell.maybe_numbers_mask()."""
+        return self._board.maybe_numbers_mask(self._idx)
+
+    def count_maybe_numbers(self) -> int:
+        return popcount(self.maybe_numbers_mask())
+
+    def is_number_fixed(self) -> bool:
+        return self.number() is not None
+
+    def pos(self) -> tuple:
+        return self._board.geometry().positions[self._idx]
+
+    def get_row_idx(self) -> int:
+        return self._board.geometry().row_of[self._idx]
+
+    def get_col_idx(self) -> int:
+        return self._board.geometry().col_of[self._idx]
+
+    def get_block_idx(self) -> int:
+        return self._board.geometry().block_of[self._idx]
+
+    def __str__(self):
+        """Prints the fixed number of the cell or 'X', see Cell.__str__()."""
+        number = self.number()
+        if number:
+            return self._board.geometry().symbols[number - 1]
+        return 'X'
+
+    def __eq__(self, other):
+        """If two cell views have the same pos (position), they are considered to be equal, see Cell.__eq__()."""
+        if not isinstance(other, CellView):
+            return False
+        return self.pos() == other.pos()
+
+    __hash__ = None
+
+
+def _tables_of(board_geometry) -> tuple:
+    """Returns the translation tables (see bytes.translate()) of the given geometry: from the bytes of the one-line
+    format to the numbers (0 for an unknown number, INVALID_BYTE for an invalid byte) and back."""
+    tables = _TABLES.get(board_geometry.box_size)
+    if tables is None:
+        to_numbers = bytes([INVALID_BYTE if number == 0 else number or 0 for number in board_geometry.number_of_byte])
+        to_bytes = bytes(board_geometry.byte_of_number) + bytes(256 - len(board_geometry.byte_of_number))
+        tables = (to_numbers, to_bytes)
+        _TABLES[board_geometry.box_size] = tables
+    return tables
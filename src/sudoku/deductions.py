@@ -0,0 +1,238 @@
+"""Logical deductions which remove "maybe numbers" before the search.
+
+Every technique is a function which gets a board, removes all "maybe numbers" it can prove to be wrong (see
+Board.eliminate()) and returns True if it has changed the board. The techniques are registered in TECHNIQUES by their
+name, from the cheapest to the most expensive one:
+
+- hidden_singles: a number which is possible in only one cell of a row, column or block is the fixed number of that
+    cell.
+- naked_pairs, naked_triples: if two (three) cells of a unit have only the same two (three) "maybe numbers" left,
+    these numbers are removed from the other cells of the unit.
+- hidden_pairs, hidden_triples: if two (three) numbers of a unit are possible in the same two (three) cells only,
+    all other numbers are removed from these cells.
+- pointing_pairs: if a number is possible in a block only within a single row or column, it is removed from the
+    cells of that row or column outside the block.
+- box_line_reduction: if a number is possible in a row or column only within a single block, it is removed from the
+    cells of that block outside the row or column.
+- x_wing, swordfish: if a number is possible in two (three) rows only within the same two (three) columns, it is
+    removed from the other cells of these columns, and vice versa.
+
+apply_deductions() runs the selected techniques until none of them changes the board any longer. The board must be
+reduced before (see Board.reduce_maybe_numbers()). The techniques work on boards of every size, they take the units
+from the geometry of the board (see Board.geometry()).
+"""
+from itertools import combinations
+
+from src.sudoku.bits import bit, iter_numbers, mask_of, popcount
+
+
+def apply_deductions(board, techniques=None) -> bool:
+    """Applies the given techniques to the board until none of them changes the board any longer. Whenever a
+    technique has changed the board, the techniques are started again with the first (cheapest) one.
+
+    Parameters
+    ----------
+    techniques
+        the names of the techniques (see TECHNIQUES) in the order in which they are tried. If None (default), all
+        techniques are used.
+
+    Returns
+    -------
+    bool
+        True if the board has been changed, False otherwise.
+
+    Raises
+    ------
+    Exception
+        If a technique is unknown or the board is not valid any more, an Exception is raised.
+    """
+    if techniques is None:
+        techniques = list(TECHNIQUES)
+    functions = []
+    for name in techniques:
+        if name not in TECHNIQUES:
+            raise Exception(f"Unknown deduction technique {name}")
+        functions.append(TECHNIQUES[name])
+
+    changed = False
+    while True:
+        for function in functions:
+            if function(board):
+                changed = True
+                break
+        else:
+            return changed
+
+
+def hidden_singles(board) -> bool:
+    changed = False
+    for unit in board.geometry().units:
+        positions = _positions(board, unit)
+        for number_idx, position_mask in enumerate(positions):
+            if popcount(position_mask) != 1:
+                continue
+            cell = board[unit[position_mask.bit_length() - 1]]
+            if cell.number() == number_idx + 1:
+                continue
+            if not board.assign(cell, number_idx + 1):
+                raise Exception("Board is not valid any more")
+            changed = True
+    return changed
+
+
+def naked_pairs(board) -> bool:
+    return _naked_subsets(board, 2)
+
+
+def naked_triples(board) -> bool:
+    return _naked_subsets(board, 3)
+
+
+def hidden_pairs(board) -> bool:
+    return _hidden_subsets(board, 2)
+
+
+def hidden_triples(board) -> bool:
+    return _hidden_subsets(board, 3)
+
+
+def pointing_pairs(board) -> bool:
+    changed = False
+    geometry = board.geometry()
+    for block in geometry.blocks:
+        for number_idx, position_mask in enumerate(_positions(board, block)):
+            if not position_mask:
+                continue
+            block_positions = [block[position] for position in _iter_positions(position_mask)]
+            lines = {geometry.row_of[idx] for idx in block_positions}
+            if len(lines) == 1:
+                changed |= _eliminate(board, geometry.rows[lines.pop()], block, bit(number_idx + 1))
+            lines = {geometry.col_of[idx] for idx in block_positions}
+            if len(lines) == 1:
+                changed |= _eliminate(board, geometry.cols[lines.pop()], block, bit(number_idx + 1))
+    return changed
+
+
+def box_line_reduction(board) -> bool:
+    changed = False
+    geometry = board.geometry()
+    for line in geometry.rows + geometry.cols:
+        for number_idx, position_mask in enumerate(_positions(board, line)):
+            if not position_mask:
+                continue
+            blocks = {geometry.block_of[line[position]] for position in _iter_positions(position_mask)}
+            if len(blocks) == 1:
+                changed |= _eliminate(board, geometry.blocks[blocks.pop()], line, bit(number_idx + 1))
+    return changed
+
+
+def x_wing(board) -> bool:
+    return _fish(board, 2)
+
+
+def swordfish(board) -> bool:
+    return _fish(board, 3)
+
+
+TECHNIQUES = {
+    "hidden_singles": hidden_singles,
+    "naked_pairs": naked_pairs,
+    "hidden_pairs": hidden_pairs,
+    "pointing_pairs": pointing_pairs,
+    "box_line_reduction": box_line_reduction,
+    "naked_triples": naked_triples,
+    "hidden_triples": hidden_triples,
+    "x_wing": x_wing,
+    "swordfish": swordfish,
+}
+
+
+def _positions(board, unit) -> list:
+    """Returns for every number (index 0 for number 1) the bitmask of the positions within the given unit (bit 0 for
+    the first cell of the unit) in which the number is still a "maybe number"."""
+    positions = [0] * len(unit)
+    for position, idx in enumerate(unit):
+        for number in iter_numbers(board[idx].maybe_numbers_mask()):
+            positions[number - 1] |= 1 << position
+    return positions
+
+
+def _iter_positions(position_mask):
+    """Yields the positions (0 for the first cell of a unit) of the given bitmask of positions."""
+    for number in iter_numbers(position_mask):
+        yield number - 1
+
+
+def _eliminate(board, indices, excluded, numbers_mask) -> bool:
+    """Removes the numbers of numbers_mask from the cells at the given indices which are not in excluded. Returns True
+    if a cell has been changed."""
+    changed = False
+    for idx in indices:
+        if idx in excluded:
+            continue
+        cell = board[idx]
+        if cell.maybe_numbers_mask() & numbers_mask:
+            if not board.eliminate(cell, numbers_mask):
+                raise Exception("Board is not valid any more")
+            changed = True
+    return changed
+
+
+def _naked_subsets(board, size) -> bool:
+    changed = False
+    for unit in board.geometry().units:
+        open_cells = [(idx, board[idx].maybe_numbers_mask()) for idx in unit if board[idx].maybe_numbers_mask()]
+        if len(open_cells) <= size:
+            continue
+        small_cells = [(idx, mask) for idx, mask in open_cells if popcount(mask) <= size]
+        for subset in combinations(small_cells, size):
+            numbers_mask = 0
+            for idx, mask in subset:
+                numbers_mask |= mask
+            if popcount(numbers_mask) == size:
+                changed |= _eliminate(board, unit, [idx for idx, mask in subset], numbers_mask)
+    return changed
+
+
+def _hidden_subsets(board, size) -> bool:
+    changed = False
+    all_numbers = board.geometry().all_numbers
+    for unit in board.geometry().units:
+        positions = _positions(board, unit)
+        open_numbers = [number_idx + 1 for number_idx, position_mask in enumerate(positions)
+                        if 0 < popcount(position_mask) <= size]
+        if len([position_mask for position_mask in positions if position_mask]) <= size:
+            continue
+        for numbers in combinations(open_numbers, size):
+            position_mask = 0
+            for number in numbers:
+                position_mask |= positions[number - 1]
+            if popcount(position_mask) == size:
+                other_numbers_mask = all_numbers & ~mask_of(numbers)
+                subset = [unit[position] for position in _iter_positions(position_mask)]
+                changed |= _eliminate(board, subset, (), other_numbers_mask)
+    return changed
+
+
+def _fish(board, size) -> bool:
+    changed = False
+    geometry = board.geometry()
+    for number in range(1, geometry.size + 1):
+        number_bit = bit(number)
+        for base_lines, cover_lines in ((geometry.rows, geometry.cols), (geometry.cols, geometry.rows)):
+            # for every base line the bitmask of the cover lines in which the number is still possible
+            covers = [sum(1 << position for position, idx in enumerate(line)
+                          if board[idx].maybe_numbers_mask() & number_bit)
+                      for line in base_lines]
+            candidates = [line_idx for line_idx, cover_mask in enumerate(covers) if 1 < popcount(cover_mask) <= size]
+            for fish in combinations(candidates, size):
+                cover_mask = 0
+                for line_idx in fish:
+                    cover_mask |= covers[line_idx]
+                if popcount(cover_mask) != size:
+                    continue
+                fish_cells = [base_lines[line_idx][position] for line_idx in fish
+                              for position in _iter_positions(cover_mask)]
+                for position in _iter_positions(cover_mask):
+                    changed |= _eliminate(board, cover_lines[position], fish_cells, number_bit)
+    return changed
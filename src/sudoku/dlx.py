@@ -0,0 +1,229 @@
+"""Solves a board with Knuth's Algorithm X and Dancing Links.
+
+A Sudoku is modelled as exact cover problem with 324 columns (constraints) and up to 729 rows (one for every number
+in every cell). Every row covers exactly four columns:
+
+- the cell (r, c) contains a number
+- the row r contains the number n
+- the column c contains the number n
+- the block b contains the number n
+
+A solution is a set of 81 rows which covers every column exactly once. Larger boards (see units.geometry()) are
+modelled the same way, with 4 columns per cell.
+"""
+from src.sudoku.bits import iter_numbers
+from src.sudoku.board import Board
+from src.sudoku.limits import SearchLimits, Unfinished
+
+
+class DancingLinks:
+    """
+    An instance of class DancingLinks represents an exact cover problem. The matrix is stored as a toroidal doubly
+    linked list in flat lists (node 0 is the root, nodes 1 to column_count are the column headers).
+
+    Parameters
+    ----------
+    column_count : int
+        the number of columns of the exact cover problem.
+    """
+
+    def __init__(self, column_count):
+        node_count = column_count + 1
+        self._left = [idx - 1 for idx in range(node_count)]
+        self._right = [idx + 1 for idx in range(node_count)]
+        self._left[0] = column_count
+        self._right[column_count] = 0
+        self._up = list(range(node_count))
+        self._down = list(range(node_count))
+        self._column = list(range(node_count))
+        self._row_id = [None] * node_count
+        self._size = [0] * node_count
+        self._nodes = 0
+        self._limits = None
+        self._stop_reason = None
+
+    def add_row(self, row_id, columns) -> None:
+        """Adds a row which covers the given columns (indices from 0 to column_count - 1). The row_id is returned by
+        search() if the row is part of the solution."""
+        first = None
+        for column in columns:
+            header = column + 1
+            node = len(self._column)
+            self._column.append(header)
+            self._row_id.append(row_id)
+            self._up.append(self._up[header])
+            self._down.append(header)
+            self._down[self._up[header]] = node
+            self._up[header] = node
+            self._size[header] += 1
+            if first is None:
+                first = node
+                self._left.append(node)
+                self._right.append(node)
+            else:
+                self._left.append(self._left[first])
+                self._right.append(first)
+                self._right[self._left[first]] = node
+                self._left[first] = node
+
+    def nodes(self) -> int:
+        """
+        Returns
+        -------
+        int
+            the number of search nodes, that is the number of rows which have been tried.
+        """
+        return self._nodes
+
+    def stop_reason(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the reason why search() has been stopped at its limits (see module limits), or None.
+        """
+        return self._stop_reason
+
+    def search(self, limits=None) -> list:
+        """
+        Parameters
+        ----------
+        limits : SearchLimits
+            the limits which are checked after every search node. If None (default), the search is not limited.
+
+        Returns
+        -------
+        list
+            the row ids of the first solution which has been found, or None if there is no solution or the search
+            has been stopped at its limits (see stop_reason()).
+        """
+        self._limits = limits
+        self._stop_reason = None
+        solution = []
+        if self.__search(solution):
+            return solution
+        return None
+
+    def __search(self, solution) -> bool:
+        left, right, down, column = self._left, self._right, self._down, self._column
+        if right[0] == 0:
+            return True
+
+        # choose the column with the fewest rows
+        header = right[0]
+        best_header = header
+        best_size = self._size[header]
+        while header != 0 and best_size > 1:
+            header = right[header]
+            if header != 0 and self._size[header] < best_size:
+                best_header = header
+                best_size = self._size[header]
+        if best_size == 0:
+            return False
+
+        self.__cover(best_header)
+        node = down[best_header]
+        while node != best_header:
+            self._nodes += 1
+            if self._limits is not None:
+                self._stop_reason = self._limits.exceeded(self._nodes)
+                if self._stop_reason is not None:
+                    break
+            solution.append(self._row_id[node])
+            other = right[node]
+            while other != node:
+                self.__cover(column[other])
+                other = right[other]
+            if self.__search(solution):
+                return True
+            solution.pop()
+            other = left[node]
+            while other != node:
+                self.__uncover(column[other])
+                other = left[other]
+            if self._stop_reason is not None:
+                break
+            node = down[node]
+        self.__uncover(best_header)
+        return False
+
+    def __cover(self, header):
+        left, right, up, down, column, size = self._left, self._right, self._up, self._down, self._column, self._size
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        node = down[header]
+        while node != header:
+            other = right[node]
+            while other != node:
+                down[up[other]] = down[other]
+                up[down[other]] = up[other]
+                size[column[other]] -= 1
+                other = right[other]
+            node = down[node]
+
+    def __uncover(self, header):
+        left, right, up, down, column, size = self._left, self._right, self._up, self._down, self._column, self._size
+        node = up[header]
+        while node != header:
+            other = left[node]
+            while other != node:
+                size[column[other]] += 1
+                down[up[other]] = other
+                up[down[other]] = other
+                other = left[other]
+            node = up[node]
+        right[left[header]] = header
+        left[right[header]] = header
+
+
+def solve_with_dlx(board, deadline=None, max_nodes=None, cancel_token=None):
+    """Solves the given board with Dancing Links. Only the fixed numbers and the "maybe numbers" of the cells are
+    used as rows of the exact cover problem, so the matrix gets smaller if the maybe numbers have been reduced
+    before. The given board is not changed. If a SolveStats object is attached to the board (see Board.set_stats()),
+    the search nodes are reported into it and it is attached to the new board as well. The search can be limited
+    like Board.solve_with_backtrack() (see module limits).
+
+    Returns
+    -------
+    Board or Unfinished
+        a new board which contains the solution. If a limit has been reached, an Unfinished result with the given
+        board is returned instead.
+
+    Raises
+    ------
+    Exception
+        If the board cannot be solved, an Exception is raised.
+    """
+    limits = None
+    if deadline is not None or max_nodes is not None or cancel_token is not None:
+        limits = SearchLimits(deadline, max_nodes, cancel_token)
+    geometry = board.geometry()
+    size, cell_count, row_of, col_of, block_of = (geometry.size, geometry.cell_count, geometry.row_of,
+                                                  geometry.col_of, geometry.block_of)
+    dancing_links = DancingLinks(4 * cell_count)
+    for idx, cell in enumerate(board):
+        if cell.is_number_fixed():
+            numbers = [cell.number()]
+        else:
+            numbers = iter_numbers(cell.maybe_numbers_mask())
+        for number in numbers:
+            dancing_links.add_row((idx, number), (idx,
+                                                  cell_count + row_of[idx] * size + number - 1,
+                                                  2 * cell_count + col_of[idx] * size + number - 1,
+                                                  3 * cell_count + block_of[idx] * size + number - 1))
+
+    solution = dancing_links.search(limits)
+    stats = board.stats()
+    if stats is not None:
+        stats.add_nodes(dancing_links.nodes())
+    if dancing_links.stop_reason() is not None:
+        return Unfinished(dancing_links.stop_reason(), dancing_links.nodes(), limits.seconds(), board)
+    if solution is None:
+        raise Exception("Could not solve the board with dancing links")
+
+    numbers = [[None] * size for _ in range(size)]
+    for idx, number in solution:
+        numbers[row_of[idx]][col_of[idx]] = str(number)
+    solved_board = Board(numbers)
+    solved_board.set_stats(stats)
+    return solved_board
@@ -0,0 +1,205 @@
+"""Generates puzzles with a unique solution.
+
+A puzzle is generated in two steps:
+
+1. A random solved board is created by searching the solution of an empty board with a branching policy which tries
+    the numbers of every cell in a random order.
+2. The fixed numbers are removed in a random order, as long as the board keeps a unique solution (see
+    Board.has_unique_solution()). With a symmetry (see SYMMETRIES), the cells which are mapped onto each other are
+    removed together, so the remaining fixed numbers are symmetric. The removal stops as soon as the target number of
+    fixed numbers (clues) has been reached; without a target, it stops when no further number can be removed, so the
+    puzzle is minimal.
+
+The generated puzzles are 9x9 boards; the other box sizes of class Board are not supported. All random decisions are
+taken from a random.Random instance, so the same seed always generates the same puzzles.
+
+The module can be run to generate a batch of puzzles and report the puzzles per second:
+
+    python -m src.sudoku.generator --count 100 --seed 1 --symmetry rotational --output puzzles.txt
+"""
+import argparse
+import random
+import sys
+import time
+
+from src.sudoku.bits import ALL_NUMBERS, bit, iter_numbers
+from src.sudoku.board import NUMBER_OF_BYTE, Board
+from src.sudoku.branching import MinimumRemainingValues
+from src.sudoku.puzzle_io import write_boards
+from src.sudoku.search import SearchEngine
+from src.sudoku.units import CELL_COUNT, COL_OF, PEERS, ROW_OF, SIZE
+
+# maps every cell index to the cell indices which are removed together with it
+SYMMETRIES = {
+    "none": lambda row_idx, col_idx: [(row_idx, col_idx)],
+    "rotational": lambda row_idx, col_idx: [(row_idx, col_idx), (SIZE - 1 - row_idx, SIZE - 1 - col_idx)],
+    "horizontal": lambda row_idx, col_idx: [(row_idx, col_idx), (SIZE - 1 - row_idx, col_idx)],
+    "vertical": lambda row_idx, col_idx: [(row_idx, col_idx), (row_idx, SIZE - 1 - col_idx)],
+    "diagonal": lambda row_idx, col_idx: [(row_idx, col_idx), (col_idx, row_idx)],
+}
+
+
+class RandomNumberOrder(MinimumRemainingValues):
+    """A branching policy which branches like MinimumRemainingValues, but tries the numbers of a cell in a random
+    order.
+
+    Parameters
+    ----------
+    rng : random.Random
+        the random number generator.
+    """
+
+    def __init__(self, rng):
+        super().__init__()
+        self._rng = rng
+
+    def order_numbers(self, board, cell, numbers_mask) -> list:
+        numbers = super().order_numbers(board, cell, numbers_mask)
+        self._rng.shuffle(numbers)
+        return numbers
+
+
+def random_solution(rng) -> str:
+    """Returns a random solved board in the one-line format."""
+    board = Board.from_string("." * CELL_COUNT)
+    SearchEngine(board, RandomNumberOrder(rng)).next_solution()
+    board.stop_trail()
+    return board.to_string()
+
+
+def generate_puzzle(rng=None, clues=None, symmetry="none") -> tuple:
+    """Generates a puzzle with a unique solution.
+
+    Parameters
+    ----------
+    rng : random.Random
+        the random number generator. If None (default), a new one with a random seed is used.
+    clues : int
+        the target number of fixed numbers. The fixed numbers are only removed as long as the puzzle has more than
+        clues fixed numbers; if the puzzle would get more than one solution, fewer numbers are removed. If None
+        (default), the numbers are removed until none can be removed any longer.
+    symmetry : str
+        the symmetry of the fixed numbers, one of SYMMETRIES.
+
+    Returns
+    -------
+    tuple
+        a tuple (puzzle, solution), both in the one-line format.
+
+    Raises
+    ------
+    Exception
+        If the symmetry is unknown, an Exception is raised.
+    """
+    if symmetry not in SYMMETRIES:
+        raise Exception(f"Unknown symmetry {symmetry}")
+    if rng is None:
+        rng = random.Random()
+    if clues is None:
+        clues = 0
+
+    solution = random_solution(rng)
+    puzzle = bytearray(solution.encode("ascii"))
+    remaining = CELL_COUNT
+    for group in _symmetric_groups(symmetry, rng):
+        if remaining - len(group) < clues:
+            continue
+        for idx in group:
+            puzzle[idx] = ord(".")
+        if not _has_other_solution(puzzle, group, solution):
+            remaining -= len(group)
+            if remaining == clues:
+                break
+        else:
+            for idx in group:
+                puzzle[idx] = ord(solution[idx])
+    return puzzle.decode("ascii"), solution
+
+
+def generate_puzzles(count, seed=None, clues=None, symmetry="none"):
+    """Generates count puzzles lazily, see generate_puzzle(). The same seed generates the same puzzles.
+
+    Yields
+    ------
+    tuple
+        a tuple (puzzle, solution) for every puzzle.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_puzzle(rng, clues, symmetry)
+
+
+def _has_other_solution(puzzle, removed, solution) -> bool:
+    """Returns True if the puzzle has another solution than the given one. Since the puzzle had a unique solution
+    before the cells at the indices in removed have been emptied, another solution must differ from the given solution
+    in one of these cells. So instead of counting all solutions (see Board.has_unique_solution()), only the other
+    numbers of these cells are tried, which mostly fail during the propagation already."""
+    for idx in removed:
+        peer_numbers_mask = bit(int(solution[idx]))
+        for peer_idx in PEERS[idx]:
+            number = NUMBER_OF_BYTE[puzzle[peer_idx]]
+            if number:
+                peer_numbers_mask |= bit(number)
+        if peer_numbers_mask != ALL_NUMBERS:
+            break
+    else:
+        # all other numbers of the removed cells are already used by their peers, no need to create a board
+        return False
+
+    board = Board.from_bytes(puzzle)
+    board.checkpoint()
+    if not board.try_reduce_maybe_numbers():
+        return False
+    checkpoint = board.checkpoint()
+    for idx in removed:
+        cell = board[idx]
+        if cell.is_number_fixed():
+            continue
+        for number in iter_numbers(cell.maybe_numbers_mask() & ~bit(int(solution[idx]))):
+            if board.assign(cell, number) and SearchEngine(board, MinimumRemainingValues()).next_solution():
+                return True
+            board.rewind(checkpoint)
+    return False
+
+
+def _symmetric_groups(symmetry, rng) -> list:
+    """Returns the groups of cell indices which are removed together for the given symmetry, in a random order."""
+    groups = []
+    grouped = set()
+    for idx in range(CELL_COUNT):
+        if idx in grouped:
+            continue
+        group = sorted({row_idx * SIZE + col_idx
+                        for row_idx, col_idx in SYMMETRIES[symmetry](ROW_OF[idx], COL_OF[idx])})
+        grouped.update(group)
+        groups.append(group)
+    rng.shuffle(groups)
+    return groups
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generator of puzzles with a unique solution")
+    parser.add_argument("--count", type=int, default=10, help="number of puzzles (default: 10)")
+    parser.add_argument("--seed", type=int, help="seed of the random number generator (default: random)")
+    parser.add_argument("--clues", type=int, help="target number of fixed numbers (default: minimal puzzles)")
+    parser.add_argument("--symmetry", choices=list(SYMMETRIES), default="none", help="symmetry (default: none)")
+    parser.add_argument("--output", help="write the puzzles to this file instead of printing them")
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    puzzles = [puzzle for puzzle, solution in generate_puzzles(args.count, args.seed, args.clues, args.symmetry)]
+    seconds = time.perf_counter() - start_time
+
+    if args.output:
+        write_boards(args.output, puzzles)
+    else:
+        for puzzle in puzzles:
+            print(puzzle)
+    average_clues = sum(CELL_COUNT - puzzle.count(".") for puzzle in puzzles) / max(len(puzzles), 1)
+    print(f"Generated {len(puzzles)} puzzles in {seconds:.3f}s ({len(puzzles) / seconds:.1f} puzzles/s, "
+          f"{average_clues:.1f} clues on average)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
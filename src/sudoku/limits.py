@@ -0,0 +1,165 @@
+"""Limits of a search: a time deadline, a budget of search nodes and a cancellation token.
+
+A SearchLimits object is passed to a SearchEngine (or to Board.solve_with_backtrack() and solver.solve() as deadline,
+max_nodes and cancel_token), which checks it after every search step. The node budget is checked at every step, the
+clock and the cancellation token at the first step and then every CHECK_STEPS steps, so the limits cost almost nothing.
+If a limit has been reached, the search stops and Board.solve_with_backtrack() returns an Unfinished result instead of
+raising an Exception. The Unfinished result holds the board in the state after the propagation of the fixed numbers,
+without the numbers which have been tried, so the work done up to the first branch is not lost.
+"""
+import threading
+import time
+
+# the reasons why a search has been stopped
+DEADLINE = "deadline"
+NODES = "nodes"
+CANCELLED = "cancelled"
+
+# the clock and the cancellation token are checked every CHECK_STEPS search steps
+CHECK_STEPS = 64
+
+
+class CancelToken:
+    """
+    A CancelToken stops a search cooperatively: another thread (for example a request handler whose client has gone)
+    calls cancel() and the search stops at its next check.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Requests the searches which check this token to stop."""
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class SearchLimits:
+    """
+    An instance of class SearchLimits holds the limits of a search (see module limits).
+
+    Parameters
+    ----------
+    deadline : float
+        the maximum wall time of the search in seconds, counted from the creation of this object. If None (default),
+        the time is not limited.
+    max_nodes : int
+        the maximum number of search nodes (see SearchEngine.nodes()). If None (default), the nodes are not limited.
+    cancel_token : CancelToken
+        if given, the search stops as soon as the token has been cancelled.
+    """
+
+    def __init__(self, deadline=None, max_nodes=None, cancel_token=None):
+        if deadline is not None and deadline < 0:
+            raise Exception("The deadline must not be negative")
+        if max_nodes is not None and max_nodes < 0:
+            raise Exception("The node budget must not be negative")
+        self._start_time = time.perf_counter()
+        self._deadline = self._start_time + deadline if deadline is not None else None
+        self._max_nodes = max_nodes
+        self._cancel_token = cancel_token
+        self._steps = 0
+
+    def exceeded(self, nodes):
+        """Checks the limits after a search step.
+
+        Parameters
+        ----------
+        nodes : int
+            the number of search nodes so far.
+
+        Returns
+        -------
+        str
+            the reason why the search must stop (DEADLINE, NODES or CANCELLED), or None if it can go on.
+        """
+        if self._max_nodes is not None and nodes >= self._max_nodes:
+            return NODES
+        self._steps += 1
+        # the first step is checked as well, so that an expired deadline or a cancelled token stops the search at once
+        if (self._steps - 1) % CHECK_STEPS:
+            return None
+        if self._cancel_token is not None and self._cancel_token.is_cancelled():
+            return CANCELLED
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return DEADLINE
+        return None
+
+    def seconds(self) -> float:
+        """
+        Returns
+        -------
+        float
+            the wall time in seconds since the creation of this object.
+        """
+        return time.perf_counter() - self._start_time
+
+
+class Unfinished:
+    """
+    The result of a search which has been stopped by its limits (see module limits).
+
+    Parameters
+    ----------
+    reason : str
+        the reason why the search has been stopped, DEADLINE, NODES or CANCELLED.
+    nodes : int
+        the number of search nodes until the search has been stopped.
+    seconds : float
+        the wall time of the search in seconds.
+    board : Board
+        the board in the state after the propagation of its fixed numbers, without the numbers which have been tried.
+    """
+
+    def __init__(self, reason, nodes, seconds, board):
+        self._reason = reason
+        self._nodes = nodes
+        self._seconds = seconds
+        self._board = board
+
+    def reason(self) -> str:
+        return self._reason
+
+    def nodes(self) -> int:
+        return self._nodes
+
+    def seconds(self) -> float:
+        return self._seconds
+
+    def board(self):
+        return self._board
+
+    def candidates(self) -> list:
+        """
+        Returns
+        -------
+        list
+            the bitmask of the "maybe numbers" of every cell in row-major order, 0 for a cell with a fixed number.
+        """
+        return [cell.maybe_numbers_mask() for cell in self._board]
+
+    def to_string(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the fixed numbers of the board in the one-line format, see Board.to_string().
+        """
+        return self._board.to_string()
+
+    def as_dict(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            the result as a dict which can be written to a JSON file.
+        """
+        return {
+            "reason": self._reason,
+            "nodes": self._nodes,
+            "seconds": self._seconds,
+            "board": self.to_string(),
+            "candidates": self.candidates(),
+        }
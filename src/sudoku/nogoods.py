@@ -0,0 +1,106 @@
+"""A bounded store of nogoods, that is board states which are known to have no solution.
+
+When the search engine has tried all numbers of a cell without finding a solution, the state of the board in which it
+has selected the cell is a dead end. With a NogoodStore (see SearchEngine), the engine records that state and prunes
+every later branch which reaches the same state again, instead of searching the same dead end once more.
+
+A state is stored as the tuple of the "maybe numbers" bitmasks of all cells (0 for a cell with a fixed number). The
+fixed numbers themselves are not part of the state: since the "maybe numbers" of every open cell already exclude the
+fixed numbers of its peers, two boards with the same bitmasks have the same completions, no matter which numbers have
+been fixed. So a dead end which is reached by different decisions, for example by trying different numbers in a cell
+whose peers are all fixed already, is pruned as well.
+
+The store keeps at most capacity states and evicts the least recently used one when it is full. It counts the
+lookups, the prune hits, the recorded states and the evictions.
+"""
+from collections import OrderedDict
+
+
+class NogoodStore:
+    """
+    An instance of class NogoodStore holds the nogoods of one or more searches (see module nogoods).
+
+    Parameters
+    ----------
+    capacity : int
+        the maximum number of nogoods. If the store is full, the least recently used nogood is evicted.
+    """
+
+    def __init__(self, capacity=10000):
+        if capacity < 1:
+            raise Exception("The capacity must be at least 1")
+        self._capacity = capacity
+        self._nogoods = OrderedDict()
+        self._lookups = 0
+        self._hits = 0
+        self._recorded = 0
+        self._evictions = 0
+
+    def contains(self, state) -> bool:
+        """
+        Returns
+        -------
+        bool
+            True if the given state (see state_of()) is a known dead end, False otherwise. A hit is counted as prune
+            hit and makes the nogood the most recently used one.
+        """
+        self._lookups += 1
+        if state in self._nogoods:
+            self._hits += 1
+            self._nogoods.move_to_end(state)
+            return True
+        return False
+
+    def record(self, state) -> None:
+        """Records the given state (see state_of()) as dead end. If the store is full, the least recently used
+        nogood is evicted."""
+        if state in self._nogoods:
+            return
+        self._nogoods[state] = None
+        self._recorded += 1
+        if len(self._nogoods) > self._capacity:
+            self._nogoods.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        """Removes all nogoods, the counters are kept."""
+        self._nogoods.clear()
+
+    def capacity(self) -> int:
+        return self._capacity
+
+    def lookups(self) -> int:
+        return self._lookups
+
+    def hits(self) -> int:
+        return self._hits
+
+    def recorded(self) -> int:
+        return self._recorded
+
+    def evictions(self) -> int:
+        return self._evictions
+
+    def as_dict(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            the counters as a dict which can be written to a JSON file.
+        """
+        return {
+            "size": len(self._nogoods),
+            "capacity": self._capacity,
+            "lookups": self._lookups,
+            "hits": self._hits,
+            "recorded": self._recorded,
+            "evictions": self._evictions,
+        }
+
+    def __len__(self):
+        return len(self._nogoods)
+
+
+def state_of(board) -> tuple:
+    """Returns the state of the given board which is stored as nogood, see module nogoods."""
+    return tuple([cell.maybe_numbers_mask() for cell in board])
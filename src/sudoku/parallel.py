@@ -0,0 +1,269 @@
+"""Solves puzzles on several CPU cores.
+
+Large collections of puzzles are split into chunks which are solved by a pool of worker processes (see
+batch.solve_puzzles()). Only the puzzles in the one-line format are sent to the workers and only the results are sent
+back, no Board or Cell objects. At most two chunks per worker are in flight at a time, so the puzzles are read lazily
+and the memory stays bounded no matter how large the collection is.
+
+A single hard puzzle is solved by splitting its search tree: the top of the tree is expanded breadth-first into
+SUBTREES_PER_PROCESS independent subtrees per worker process (see split_subtrees()), which are searched by the pool.
+Since there are many more subtrees than workers, a worker which is done with a small subtree takes the next one from
+the queue of the pool, so the load is balanced without splitting running searches. As soon as the solution (or
+enough solutions when counting) has been found, the remaining subtrees are cancelled and the running workers are
+stopped through a shared event. A subtree is sent to the workers as the bitmasks of the "maybe numbers" of its cells
+(see _masks_of()), so eliminations which have been made before the split (for example by the module deductions) are
+kept.
+"""
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from itertools import islice
+
+from src.sudoku.batch import solve_puzzles
+from src.sudoku.bits import bit
+from src.sudoku.board import Board
+from src.sudoku.branching import FirstEmptyCell
+from src.sudoku.search import SearchEngine
+
+SUBTREES_PER_PROCESS = 8
+# a worker checks every CANCEL_CHECK_STEPS search steps whether it has been stopped
+CANCEL_CHECK_STEPS = 256
+
+# the event which stops the search of a subtree, set in every worker process by _init_subtree_worker()
+_cancel_event = None
+
+
+def solve_puzzles_parallel(puzzles, processes=None, chunksize=64, ordered=True, policy=None, engine="backtrack",
+                           deadline=None, max_nodes=None):
+    """Solves the given puzzles lazily with a pool of worker processes.
+
+    Parameters
+    ----------
+    puzzles
+        an iterable of puzzles in the one-line format, see batch.solve_puzzles().
+    processes : int
+        the number of worker processes. If None (default), one process per CPU core is started.
+    chunksize : int
+        the number of puzzles which are sent to a worker process at once.
+    ordered : bool
+        if True (default), the results are yielded in the order of the puzzles. If False, the results of a chunk are
+        yielded as soon as the chunk has been solved.
+    policy
+        the branching policy which is passed to Board.solve_with_backtrack(). It must be picklable.
+    engine
+        the engine which solves the puzzles, "backtrack" or "dlx".
+    deadline : float
+        the maximum wall time of solving a single puzzle in seconds, see batch.solve_puzzles(). It is applied in the
+        worker processes, so a single pathological puzzle cannot hold a worker for long.
+    max_nodes : int
+        the maximum number of search nodes of a single puzzle, see batch.solve_puzzles().
+
+    Yields
+    ------
+    tuple
+        a tuple (puzzle, solution, stats) for every puzzle, see batch.solve_puzzles().
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if chunksize < 1:
+        raise Exception("The chunk size must be at least 1")
+
+    puzzles = iter(puzzles)
+    executor = ProcessPoolExecutor(processes)
+    try:
+        pending = deque()
+        while True:
+            chunk = list(islice(puzzles, chunksize))
+            if not chunk:
+                break
+            pending.append(executor.submit(solve_chunk, chunk, policy, engine, deadline, max_nodes))
+            if len(pending) >= 2 * processes:
+                yield from _next_results(pending, ordered)
+        while pending:
+            yield from _next_results(pending, ordered)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def solve_chunk(chunk, policy=None, engine="backtrack", deadline=None, max_nodes=None) -> list:
+    """Solves a chunk of puzzles in a worker process within the given limits (see batch.solve_puzzles()) and returns
+    the list of results."""
+    return list(solve_puzzles(chunk, policy, engine, deadline=deadline, max_nodes=max_nodes))
+
+
+def _next_results(pending, ordered) -> list:
+    """Waits for the next chunk which is done (the oldest one if ordered is True) and returns its results."""
+    if ordered:
+        return pending.popleft().result()
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    results = []
+    for future in done:
+        pending.remove(future)
+        results += future.result()
+    return results
+
+
+def solve_parallel(board, processes=None, policy=None) -> tuple:
+    """Searches the first solution of the given board by splitting its search tree among a pool of worker processes
+    (see module parallel). The given board is not changed.
+
+    Parameters
+    ----------
+    processes : int
+        the number of worker processes. If None (default), one process per CPU core is started.
+    policy
+        the branching policy which is used for splitting and searching the subtrees. It must be picklable.
+
+    Returns
+    -------
+    tuple
+        a tuple (solution, nodes) with the solution in the one-line format (None if the board has no solution) and
+        the number of search nodes of all workers.
+    """
+    _, solution, nodes = _search_subtrees(board, 1, processes, policy)
+    return solution, nodes
+
+
+def count_solutions_parallel(board, limit=None, processes=None, policy=None) -> int:
+    """Counts the solutions of the given board by splitting its search tree among a pool of worker processes (see
+    module parallel). The given board is not changed.
+
+    Parameters
+    ----------
+    limit : int
+        the search stops as soon as limit solutions have been found. If None (default), all solutions are counted.
+
+    Returns
+    -------
+    int
+        the number of solutions, at most limit.
+    """
+    count, _, _ = _search_subtrees(board, limit, processes, policy)
+    return count
+
+
+def split_subtrees(board, count, policy=None) -> tuple:
+    """Expands the top of the search tree of the given board breadth-first until there are at least count subtrees or
+    the tree cannot be expanded any further. The subtrees do not overlap and together contain all solutions of the
+    board. The given board is not changed.
+
+    Returns
+    -------
+    tuple
+        a tuple (subtrees, nodes) with the list of subtrees (see _masks_of()) and the number of search nodes which
+        have been needed for the expansion.
+    """
+    if policy is None:
+        policy = FirstEmptyCell()
+    subtrees = deque([_masks_of(board)])
+    finished = []
+    nodes = 0
+    while subtrees and len(subtrees) + len(finished) < count:
+        subtree_board = _board_of(subtrees.popleft())
+        if subtree_board is None:
+            continue
+        cell = policy.select_cell(subtree_board)
+        if cell is None:
+            # the subtree is already solved
+            finished.append(_masks_of(subtree_board))
+            continue
+        checkpoint = subtree_board.checkpoint()
+        numbers_mask = cell.maybe_numbers_mask() & ~subtree_board.used_numbers_mask(cell)
+        for number in policy.order_numbers(subtree_board, cell, numbers_mask):
+            nodes += 1
+            if subtree_board.assign(cell, number):
+                subtrees.append(_masks_of(subtree_board))
+            subtree_board.rewind(checkpoint)
+    return finished + list(subtrees), nodes
+
+
+def search_subtree(masks, policy=None, limit=1) -> tuple:
+    """Searches a subtree (see split_subtrees()) in a worker process until limit solutions have been found (all
+    solutions if limit is None) or the search is stopped.
+
+    Returns
+    -------
+    tuple
+        a tuple (count, solution, nodes) with the number of solutions which have been found, the first solution in
+        the one-line format (or None) and the number of search nodes.
+    """
+    board = _board_of(masks)
+    if board is None:
+        return 0, None, 0
+    engine = SearchEngine(board, policy)
+    count = 0
+    solution = None
+    steps = 0
+    while not engine.is_finished():
+        if engine.step():
+            count += 1
+            if solution is None:
+                solution = board.to_string()
+            if limit is not None and count >= limit:
+                break
+        steps += 1
+        if steps % CANCEL_CHECK_STEPS == 0 and _cancel_event is not None and _cancel_event.is_set():
+            break
+    return count, solution, engine.nodes()
+
+
+def _search_subtrees(board, limit, processes, policy) -> tuple:
+    """Splits the search tree of the board and searches the subtrees with a pool of worker processes until limit
+    solutions have been found. Returns a tuple (count, solution, nodes), see search_subtree()."""
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if limit is not None and limit < 1:
+        raise Exception("The limit must be at least 1")
+    subtrees, nodes = split_subtrees(board, processes * SUBTREES_PER_PROCESS, policy)
+    count = 0
+    solution = None
+    if not subtrees:
+        return count, solution, nodes
+
+    context = multiprocessing.get_context()
+    cancel_event = context.Event()
+    executor = ProcessPoolExecutor(processes, mp_context=context, initializer=_init_subtree_worker,
+                                   initargs=(cancel_event,))
+    try:
+        futures = [executor.submit(search_subtree, subtree, policy, limit) for subtree in subtrees]
+        for future in as_completed(futures):
+            subtree_count, subtree_solution, subtree_nodes = future.result()
+            count += subtree_count
+            nodes += subtree_nodes
+            if solution is None:
+                solution = subtree_solution
+            if limit is not None and count >= limit:
+                cancel_event.set()
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    if limit is not None:
+        count = min(count, limit)
+    return count, solution, nodes
+
+
+def _init_subtree_worker(cancel_event):
+    global _cancel_event
+    _cancel_event = cancel_event
+
+
+def _masks_of(board) -> tuple:
+    """Returns the state of the given board as a tuple of the bitmasks of the "maybe numbers" of its cells, with the
+    bit of the fixed number for a fixed cell."""
+    return tuple(bit(cell.number()) if cell.is_number_fixed() else cell.maybe_numbers_mask() for cell in board)
+
+
+def _board_of(masks):
+    """Creates a board from the given bitmasks (see _masks_of()) and propagates its fixed numbers. Returns None if the
+    board is not valid."""
+    board = Board.from_string("." * len(masks))
+    all_numbers = board.geometry().all_numbers
+    for cell, mask in zip(board, masks):
+        if cell.is_number_fixed():
+            # the number has already been fixed by the propagation of another cell
+            if not bit(cell.number()) & mask:
+                return None
+        elif not board.eliminate(cell, all_numbers & ~mask):
+            return None
+    return board
@@ -0,0 +1,98 @@
+"""Reads and writes files with one puzzle per line.
+
+Every line contains a board in the one-line format (see Board.from_string()): 81 characters in row-major order, a
+digit from 1 to 9 for every known number and a '.', '0' or 'x'/'X' for every unknown number. Empty lines and lines
+starting with '#' are skipped.
+
+The files are memory-mapped, so even files with millions of puzzles are not loaded into memory at once, and the
+boards are created directly from the bytes of the file without creating strings first.
+"""
+import mmap
+import os
+
+from src.sudoku.board import Board
+from src.sudoku.compact import CompactBoard
+
+WRITE_BUFFER_LINES = 4096
+
+
+def iter_puzzle_bytes(path):
+    """Yields the puzzles of the given file lazily, every puzzle as bytes without the line break."""
+    with open(path, "rb") as puzzle_file:
+        if os.fstat(puzzle_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(puzzle_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            start = 0
+            while start < size:
+                end = data.find(b"\n", start)
+                if end == -1:
+                    end = size
+                line = data[start:end].strip()
+                start = end + 1
+                if line and not line.startswith(b"#"):
+                    yield line
+
+
+def read_boards(path):
+    """Yields the puzzles of the given file lazily as boards.
+
+    Raises
+    ------
+    Exception
+        If a line does not contain a valid board, an Exception is raised when the line is reached.
+    """
+    for line in iter_puzzle_bytes(path):
+        yield Board.from_bytes(line)
+
+
+def read_compact_boards(path):
+    """Yields the puzzles of the given file lazily as compact boards (see module compact), which take a fraction of
+    the memory of a Board if many puzzles are held at once.
+
+    Raises
+    ------
+    Exception
+        If a line does not contain a valid board, an Exception is raised when the line is reached.
+    """
+    for line in iter_puzzle_bytes(path):
+        yield CompactBoard.from_bytes(line)
+
+
+def write_boards(path, boards) -> int:
+    """Writes the given boards to the given file, one board per line in the one-line format. The lines are written
+    in blocks of WRITE_BUFFER_LINES lines.
+
+    Parameters
+    ----------
+    path
+        the path of the file. An existing file is overwritten.
+    boards
+        an iterable of boards (Board or CompactBoard). Instead of a board object, a board in the one-line format (str
+        or bytes) can be given, for example the solutions of batch.solve_puzzles(). For None, an empty line is
+        written, so that the lines still match the lines of the puzzle file.
+
+    Returns
+    -------
+    int
+        the number of lines which have been written.
+    """
+    count = 0
+    lines = []
+    with open(path, "wb") as board_file:
+        for board in boards:
+            if board is None:
+                lines.append(b"")
+            elif isinstance(board, str):
+                lines.append(board.encode("ascii"))
+            elif isinstance(board, bytes):
+                lines.append(board)
+            else:
+                lines.append(board.to_bytes())
+            count += 1
+            if len(lines) == WRITE_BUFFER_LINES:
+                board_file.write(b"\n".join(lines) + b"\n")
+                lines = []
+        if lines:
+            board_file.write(b"\n".join(lines) + b"\n")
+    return count
@@ -0,0 +1,169 @@
+from src.sudoku.branching import FirstEmptyCell
+from src.sudoku.nogoods import state_of
+
+
+class SearchEngine:
+    """
+    An instance of class SearchEngine searches the solutions of a board with an iterative backtracking algorithm.
+
+    Instead of recursion, the engine keeps an explicit stack with one frame for every cell it branches on. A frame
+    holds the cell, the numbers which have not been tried yet and a checkpoint of the trail of the board. Trying a
+    number fixes it in the cell and removes it from the "maybe numbers" of the peers (which might fix further cells).
+    The board records every change on its trail, so before the next number is tried, the board is rewound to the
+    checkpoint of the frame. This way the engine propagates at every node without copying the board.
+
+    The search can be resumed at any time: step() tries a single number, next_solution() searches until the next
+    solution has been found or the limits of the search (see module limits) have been reached.
+
+    With a NogoodStore (see module nogoods), a frame also holds the state of the board in which its cell has been
+    selected. If all numbers of the cell have been tried without finding a solution, this state is recorded as
+    nogood, and every later branch which reaches a recorded state is pruned right away.
+
+    Parameters
+    ----------
+    board : Board
+        the board to solve. The engine works directly on this board.
+    policy
+        the branching policy (see module branching). If None (default), the first empty cell is taken and its
+        numbers are tried in ascending order.
+    limits : SearchLimits
+        the deadline, node budget and cancellation token which are checked by next_solution() after every step. If
+        None (default), the search is not limited.
+    nogoods : NogoodStore
+        the store in which the dead ends are recorded and looked up. It can be shared by several engines, for
+        example by the searches of the same board. If None (default), no nogoods are recorded.
+    """
+
+    def __init__(self, board, policy=None, limits=None, nogoods=None):
+        self._board = board
+        self._policy = policy if policy is not None else FirstEmptyCell()
+        self._limits = limits
+        self._nogoods = nogoods
+        self._stack = None
+        self._nodes = 0
+        self._solutions = 0
+        self._finished = False
+        self._stop_reason = None
+        self._stats = board.stats()
+
+    def nodes(self) -> int:
+        """
+        Returns
+        -------
+        int
+            the number of search nodes so far, that is the number of numbers which have been tried.
+        """
+        return self._nodes
+
+    def is_finished(self) -> bool:
+        """
+        Returns
+        -------
+        bool
+            True if the whole search tree has been searched, that means there are no further solutions.
+        """
+        return self._finished
+
+    def stop_reason(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the reason why next_solution() has stopped the search at its limits (see module limits), or None if the
+            limits have not been reached.
+        """
+        return self._stop_reason
+
+    def next_solution(self) -> bool:
+        """Searches until the next solution has been found. The solution is the current state of the board; calling
+        this method again continues the search with the next solution.
+
+        Returns
+        -------
+        bool
+            True if a solution has been found, False if there are no further solutions or a limit of the search has
+            been reached (see stop_reason()).
+        """
+        limits = self._limits
+        while not self._finished:
+            if self.step():
+                return True
+            if limits is not None:
+                self._stop_reason = limits.exceeded(self._nodes)
+                if self._stop_reason is not None:
+                    return False
+        return False
+
+    def rewind_to_root(self) -> None:
+        """Ends the search and rewinds the board to the state before the first number has been tried, that is the
+        state after the propagation of its fixed numbers. The engine cannot be resumed afterwards."""
+        if self._stack:
+            self._board.rewind(self._stack[0][2])
+        self._stack = []
+        self._finished = True
+
+    def step(self) -> bool:
+        """Performs a single step of the search, that is trying the next number of the current cell or going back
+        to the previous cell if all numbers have been tried.
+
+        Returns
+        -------
+        bool
+            True if the board is solved after this step, False otherwise.
+        """
+        if self._finished:
+            return False
+
+        board = self._board
+        if self._stack is None:
+            # first step, we start with the reduction of the maybe numbers of the whole board
+            self._stack = []
+            if not board.try_reduce_maybe_numbers():
+                self._finished = True
+                return False
+            return self.__descend()
+
+        stack = self._stack
+        if not stack:
+            self._finished = True
+            return False
+
+        cell, numbers, checkpoint, state, solutions = stack[-1]
+        board.rewind(checkpoint)
+        if not numbers:
+            # we tried all numbers of this cell, so we go back to the previous cell
+            stack.pop()
+            if self._stats is not None:
+                self._stats.add_backtrack()
+            if state is not None and solutions == self._solutions:
+                # there is no solution below this frame
+                self._nogoods.record(state)
+            return False
+
+        self._nodes += 1
+        if self._stats is not None:
+            self._stats.add_node(len(stack))
+        if not board.assign(cell, numbers.pop()):
+            # the number leads to a contradiction, we try the next one with the next step
+            return False
+        return self.__descend()
+
+    def __descend(self) -> bool:
+        """Selects the next cell and pushes a new frame onto the stack. Returns True if there is no empty cell any
+        longer, that means the board is solved. If the state of the board is a known dead end (see module nogoods),
+        no frame is pushed and False is returned."""
+        board = self._board
+        state = None
+        if self._nogoods is not None:
+            state = state_of(board)
+            if self._nogoods.contains(state):
+                return False
+        cell = self._policy.select_cell(board)
+        if cell is None:
+            self._solutions += 1
+            return True
+        numbers = self._policy.order_numbers(board, cell, cell.maybe_numbers_mask() & ~board.used_numbers_mask(cell))
+        # the numbers are taken from the end of the list
+        numbers.reverse()
+        self._stack.append((cell, numbers, board.checkpoint(), state, self._solutions))
+        return False
@@ -0,0 +1,356 @@
+"""A local service which solves puzzles for other programs.
+
+The server listens on a localhost TCP port or a Unix socket and keeps a pool of worker processes running, so a client
+does not pay for starting an interpreter and importing the solver per puzzle. The protocol is line-based, in both
+directions one request or response per line:
+
+- A request is either a puzzle in the one-line format (see Board.from_string()) or a JSON object
+    {"id": ..., "puzzle": "...", "engine": "backtrack" or "dlx", "stats": true or false, "deadline": seconds,
+    "max_nodes": ...}, where only "puzzle" is required. The server applies its own deadline and node budget to the
+    requests without one, so a single pathological puzzle cannot hold a worker process for long. Empty lines and
+    lines starting with '#' are skipped. A request without an id gets the number of the request on its connection,
+    starting from 1.
+- A response is a JSON object {"id": ..., "puzzle": "...", "solution": "...", "seconds": ..., "error": ...}, with the
+    statistics of solving the puzzle as "solver" if they have been requested and the state of the board as
+    "unfinished" if the search has been stopped at its limits (see batch.solve_puzzles()). The responses are sent as
+    soon as their puzzles have been solved, so they can come in a different order than the requests.
+
+The requests of all connections are collected in a bounded queue. A dispatcher takes them from the queue in
+micro-batches (up to batch_size requests, waiting at most batch_window seconds for a batch to fill up) and sends every
+batch to the worker pool, with at most two batches per worker process in flight. If the workers fall behind, the
+queue fills up and the server stops reading from the connections until there is room again. In the same way, a
+connection stops being read while max_pending of its requests have not been answered yet, for example because the
+client does not read its responses.
+
+Start the server with python -m src.sudoku.server --help.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from src.sudoku.batch import solve_puzzles
+
+ENGINES = ("backtrack", "dlx")
+
+
+class SolveServer:
+    """
+    An instance of class SolveServer solves the puzzles which are sent to it by its clients (see module server).
+
+    Parameters
+    ----------
+    processes : int
+        the number of worker processes. If None (default), one process per CPU core is started.
+    batch_size : int
+        the maximum number of requests which are sent to a worker process at once.
+    batch_window : float
+        the maximum time in seconds the dispatcher waits for further requests before it sends a batch which is not
+        full yet.
+    queue_size : int
+        the maximum number of requests which wait for the dispatcher.
+    max_pending : int
+        the maximum number of requests of a single connection which have not been answered yet.
+    deadline : float
+        the maximum wall time of solving a puzzle in seconds for the requests which do not give their own one. If None
+        (default), the time is not limited.
+    max_nodes : int
+        the maximum number of search nodes for the requests which do not give their own one. If None (default), the
+        nodes are not limited.
+    """
+
+    def __init__(self, processes=None, batch_size=64, batch_window=0.002, queue_size=1024, max_pending=256,
+                 deadline=None, max_nodes=None):
+        if batch_size < 1 or queue_size < 1 or max_pending < 1:
+            raise Exception("The batch size, queue size and maximum of pending requests must be at least 1")
+        if batch_window < 0:
+            raise Exception("The batch window must not be negative")
+        self._processes = processes if processes is not None else os.cpu_count() or 1
+        self._batch_size = batch_size
+        self._batch_window = batch_window
+        self._queue_size = queue_size
+        self._max_pending = max_pending
+        self._deadline = deadline
+        self._max_nodes = max_nodes
+        self._queue = None
+        self._executor = None
+        self._server = None
+        self._dispatcher = None
+        self._batches = set()
+        self._connections = set()
+
+    async def start(self, host="127.0.0.1", port=0, path=None) -> None:
+        """Starts the worker processes and listens on the given TCP port of the host (a free port if 0), or on the
+        Unix socket at the given path if path is given."""
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self._queue_size)
+        # forked workers would inherit the sockets of the connections and keep them open after they have been closed
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._executor = ProcessPoolExecutor(self._processes, mp_context=context)
+        # starts the worker processes before the first request
+        await asyncio.gather(*[loop.run_in_executor(self._executor, solve_requests, [])
+                               for _ in range(self._processes)])
+        self._dispatcher = loop.create_task(self.__dispatch())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self.__handle_connection, path)
+        else:
+            self._server = await asyncio.start_server(self.__handle_connection, host, port)
+
+    def address(self):
+        """
+        Returns
+        -------
+        tuple or str
+            the (host, port) tuple of the TCP socket or the path of the Unix socket the server listens on.
+        """
+        address = self._server.sockets[0].getsockname()
+        return address[:2] if isinstance(address, tuple) else address
+
+    async def serve_forever(self) -> None:
+        """Serves the clients until the server is closed or the task is cancelled."""
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stops listening, cancels the requests which have not been solved yet, closes the connections and stops the
+        worker processes."""
+        if self._server is None:
+            return
+        self._server.close()
+        self._dispatcher.cancel()
+        for task in list(self._batches):
+            task.cancel()
+        await asyncio.gather(self._dispatcher, *self._batches, return_exceptions=True)
+        while not self._queue.empty():
+            request, future = self._queue.get_nowait()
+            future.cancel()
+        for connection in list(self._connections):
+            connection.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._server = None
+
+    ########################################################
+    # Internal methods
+    ########################################################
+
+    async def __handle_connection(self, reader, writer):
+        """Reads the requests of a connection and queues them for the dispatcher. The responses are written by a
+        separate task in the order in which the puzzles are solved."""
+        loop = asyncio.get_running_loop()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        pending = asyncio.Semaphore(self._max_pending)
+        responses = asyncio.Queue()
+        responder = loop.create_task(self.__write_responses(writer, responses, pending))
+        futures = []
+        request_count = 0
+        try:
+            while True:
+                await pending.acquire()
+                line = await reader.readline()
+                if not line:
+                    pending.release()
+                    break
+                line = line.decode("utf-8", errors="replace").strip()
+                if not line or line.startswith("#"):
+                    pending.release()
+                    continue
+                request_count += 1
+                try:
+                    request = parse_request(line, request_count, self._deadline, self._max_nodes)
+                except Exception as e:
+                    responses.put_nowait(_error_response(line, request_count, str(e)))
+                    continue
+                future = loop.create_future()
+                future.add_done_callback(lambda done, request=request: responses.put_nowait(response_of(request, done)))
+                futures.append(future)
+                # waits while the queue is full, so the connection is not read any further (backpressure)
+                await self._queue.put((request, future))
+                futures = [future for future in futures if not future.done()]
+            await asyncio.gather(*futures, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # the server is closed, so the remaining responses are not waited for
+            responder.cancel()
+        finally:
+            self._connections.discard(connection)
+            responses.put_nowait(None)
+            await asyncio.gather(responder, return_exceptions=True)
+
+    async def __write_responses(self, writer, responses, pending):
+        """Writes the responses of a connection until None is taken from the queue and closes the connection."""
+        try:
+            while True:
+                response = await responses.get()
+                if response is None:
+                    break
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                # waits while the client does not read its responses
+                await writer.drain()
+                pending.release()
+        except ConnectionError:
+            # the client has gone, so the connection must not wait for its responses any longer
+            for _ in range(self._max_pending):
+                pending.release()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def __dispatch(self):
+        """Takes the requests from the queue in micro-batches and sends them to the worker processes, with at most
+        two batches per worker process in flight."""
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(2 * self._processes)
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._batch_window
+            while len(batch) < self._batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await in_flight.acquire()
+            task = loop.create_task(self.__solve_batch(batch, in_flight))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def __solve_batch(self, batch, in_flight):
+        """Solves a batch in a worker process and sets the results of the futures of its requests."""
+        try:
+            requests = [request for request, future in batch]
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, solve_requests, requests)
+            for (request, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except asyncio.CancelledError:
+            for request, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            # for example a worker process which has died
+            for request, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            in_flight.release()
+
+
+def parse_request(line, request_count, deadline=None, max_nodes=None) -> dict:
+    """Parses a request line (see module server) into a dict with the keys "id", "puzzle", "engine", "stats",
+    "deadline" and "max_nodes". The given deadline and max_nodes are taken if the request does not give them.
+
+    Raises
+    ------
+    Exception
+        If the line is not a valid request, an Exception is raised.
+    """
+    if not line.startswith("{"):
+        return {"id": request_count, "puzzle": line, "engine": "backtrack", "stats": False, "deadline": deadline,
+                "max_nodes": max_nodes}
+    try:
+        data = json.loads(line)
+    except ValueError:
+        raise Exception("Request is not valid JSON")
+    if not isinstance(data, dict) or not isinstance(data.get("puzzle"), str):
+        raise Exception("Request does not contain a puzzle")
+    engine = data.get("engine", "backtrack")
+    if engine not in ENGINES:
+        raise Exception(f"Unknown engine {engine}")
+    deadline = data.get("deadline", deadline)
+    max_nodes = data.get("max_nodes", max_nodes)
+    # bool is a subclass of int, so JSON true and false are rejected explicitly
+    if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float)) or deadline < 0):
+        raise Exception("The deadline must be a number of seconds")
+    if max_nodes is not None and (isinstance(max_nodes, bool) or not isinstance(max_nodes, int) or max_nodes < 0):
+        raise Exception("The node budget must be a number of nodes")
+    return {"id": data.get("id", request_count), "puzzle": data["puzzle"].strip(), "engine": engine,
+            "stats": bool(data.get("stats", False)), "deadline": deadline, "max_nodes": max_nodes}
+
+
+def response_of(request, future) -> dict:
+    """Returns the response to the given request from the future of its result (see solve_requests())."""
+    if future.cancelled():
+        return _error_response(request["puzzle"], request["id"], "Request has been cancelled")
+    if future.exception() is not None:
+        return _error_response(request["puzzle"], request["id"], str(future.exception()))
+    solution, stats = future.result()
+    response = {"id": request["id"], "puzzle": request["puzzle"], "solution": solution}
+    response.update(stats)
+    return response
+
+
+def solve_requests(requests) -> list:
+    """Solves the puzzles of a batch of requests (see parse_request()) in a worker process.
+
+    Returns
+    -------
+    list
+        a tuple (solution, stats) for every request, see batch.solve_puzzles().
+    """
+    results = []
+    for request in requests:
+        result = next(solve_puzzles([request["puzzle"]], engine=request["engine"], with_stats=request["stats"],
+                                    deadline=request["deadline"], max_nodes=request["max_nodes"]), None)
+        if result is None:
+            results.append((None, {"seconds": 0.0, "error": "Request does not contain a puzzle"}))
+        else:
+            puzzle, solution, stats = result
+            results.append((solution, stats))
+    return results
+
+
+def _error_response(puzzle, request_id, error) -> dict:
+    return {"id": request_id, "puzzle": puzzle, "solution": None, "seconds": 0.0, "error": error}
+
+
+async def _serve(args):
+    deadline = args.deadline_ms / 1000 if args.deadline_ms is not None else None
+    server = SolveServer(args.processes, args.batch_size, args.batch_window_ms / 1000, args.queue_size,
+                         args.max_pending, deadline, args.max_nodes)
+    await server.start(args.host, args.port, args.unix)
+    print(f"Listening on {server.address()}", file=sys.stderr)
+    await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Local service which solves puzzles")
+    parser.add_argument("--host", default="127.0.0.1", help="host of the TCP socket (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port of the TCP socket (default: 8765)")
+    parser.add_argument("--unix", help="listen on a Unix socket at this path instead of a TCP socket")
+    parser.add_argument("--processes", type=int, help="number of worker processes (default: one per CPU core)")
+    parser.add_argument("--batch-size", type=int, default=64, help="maximum requests per batch (default: 64)")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="maximum wait for a batch to fill up in milliseconds (default: 2)")
+    parser.add_argument("--queue-size", type=int, default=1024, help="maximum queued requests (default: 1024)")
+    parser.add_argument("--max-pending", type=int, default=256,
+                        help="maximum unanswered requests per connection (default: 256)")
+    parser.add_argument("--deadline-ms", type=float,
+                        help="default maximum solving time per puzzle in milliseconds (default: unlimited)")
+    parser.add_argument("--max-nodes", type=int, help="default maximum search nodes per puzzle (default: unlimited)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
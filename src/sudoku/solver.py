@@ -1,25 +1,138 @@
+from contextlib import nullcontext
+
 from src.sudoku.board import Board
+from src.sudoku.deductions import apply_deductions
+from src.sudoku.dlx import solve_with_dlx
+from src.sudoku.limits import Unfinished
+from src.sudoku.stats import SolveStats
 import src.sudoku.board_printer as printer
+import argparse
+import os
+import sys
 import time
 
+BOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "board")
+
 
 def get_board(sudoku_number_):
-    with open("../../board/" + sudoku_number_, "r") as board_input:
+    with open(os.path.join(BOARD_DIR, sudoku_number_), "r") as board_input:
         lines = board_input.read().split("\n")
 
     new_lines = list(map(lambda x: x.split(","), lines))
     return Board(new_lines)
 
 
-def show_board(board, text):
-    print("*******************************************")
-    print("************ ", text, " ***************")
-    printer.print_board(board)
+def show_board(board, text, renderer=None, stats=None, intermediate=False):
+    """Renders the given board with the given text as title, by default to sys.stdout in the pretty format (see
+    module board_printer). Without a renderer, the output is written right away."""
+    if renderer is None:
+        with printer.BoardRenderer() as board_renderer:
+            board_renderer.render(board, text, stats, intermediate)
+    else:
+        renderer.render(board, text, stats, intermediate)
+
+
+def solve(board, policy=None, engine="backtrack", stats=None, deductions=None, deadline=None, max_nodes=None,
+          cancel_token=None):
+    """Solves the given board in the same steps as main(), but without printing anything.
+
+    Parameters
+    ----------
+    stats : SolveStats
+        if given, it is attached to the board (see Board.set_stats()) and collects the statistics of solving it,
+        including the wall time of the stages "reduce", "singles", "deductions" and the engine.
+    deductions
+        the names of the deduction techniques (see module deductions) which are applied before the engine is used.
+        If None (default), no deductions are applied.
+    deadline : float
+        the maximum wall time of solving the board in seconds, including the stages before the engine.
+    max_nodes : int
+        the maximum number of search nodes of the engine.
+    cancel_token : CancelToken
+        if given, the search stops as soon as the token has been cancelled (see module limits).
+
+    Returns
+    -------
+    Board or Unfinished
+        the solved board. Depending on the engine, this is the given board or a new one. If a limit has been reached,
+        an Unfinished result is returned instead.
+
+    Raises
+    ------
+    Exception
+        If the board cannot be solved, an Exception is raised.
+    """
+    start_time = time.perf_counter()
+    if stats is not None:
+        board.set_stats(stats)
+    stats = board.stats()
+    if board.is_solved():
+        return board
+    with _stage(stats, "reduce"):
+        board.reduce_maybe_numbers()
+    if board.is_solved():
+        return board
+    with _stage(stats, "singles"):
+        board.set_last_remaining_number()
+    if board.is_solved():
+        return board
+    if deductions is not None:
+        with _stage(stats, "deductions"):
+            apply_deductions(board, deductions)
+        if board.is_solved():
+            return board
+    if deadline is not None:
+        deadline = max(deadline - (time.perf_counter() - start_time), 0.0)
+    with _stage(stats, engine):
+        board = solve_with_engine(board, policy, engine, deadline, max_nodes, cancel_token)
+    if isinstance(board, Unfinished):
+        return board
+    if not board.is_solved():
+        raise Exception("Could not solve the board")
+    return board
+
+
+def solve_with_stats(board, policy=None, engine="backtrack", deductions=None):
+    """Solves the given board like solve() and collects the statistics of solving it.
+
+    Returns
+    -------
+    tuple
+        a tuple (board, stats) with the solved board and the SolveStats object (see module stats).
+
+    Raises
+    ------
+    Exception
+        If the board cannot be solved, an Exception is raised.
+    """
+    stats = SolveStats()
+    return solve(board, policy, engine, stats, deductions), stats
+
+
+def solve_with_engine(board, policy=None, engine="backtrack", deadline=None, max_nodes=None, cancel_token=None):
+    """Solves the given board with the given engine, either "backtrack" (see Board.solve_with_backtrack()) or "dlx"
+    (see module dlx), within the given limits (see module limits).
+
+    Returns
+    -------
+    Board or Unfinished
+        the solved board. Depending on the engine, this is the given board or a new one. If a limit has been reached,
+        an Unfinished result is returned instead.
+    """
+    if engine == "backtrack":
+        result = board.solve_with_backtrack(policy, deadline=deadline, max_nodes=max_nodes, cancel_token=cancel_token)
+        return result if isinstance(result, Unfinished) else board
+    elif engine == "dlx":
+        return solve_with_dlx(board, deadline, max_nodes, cancel_token)
+    raise Exception(f"Unknown engine {engine}")
 
 
-def main(sudoku_number_):
+def main(sudoku_number_, policy=None, engine="backtrack", stats=None, renderer=None):
+    """Solves the board of the given file in the board directory step by step and renders the initial board (only in
+    the pretty format) and the board after the last step with the given renderer (see module board_printer)."""
     board = get_board(sudoku_number_)
-    show_board(board, sudoku_number_)
+    board.set_stats(stats)
+    show_board(board, sudoku_number_, renderer, intermediate=True)
 
     # Easiest solution. We are already starting with a solved board.
     if board.is_solved():
@@ -28,36 +141,67 @@ def main(sudoku_number_):
     # First we reduce the "maybe numbers". If there are already fixed numbers in the row, column or block of a cell,
     # it cannot be a "maybe number" any longer. If only one "maybe number" remains, we know this must be the fixed
     # number of that cell.
-    board.reduce_maybe_numbers()
+    with _stage(stats, "reduce"):
+        board.reduce_maybe_numbers()
     if board.is_solved():
-        show_board(board, "After maybe numbers have been reduced")
+        show_board(board, "After maybe numbers have been reduced", renderer, stats)
         return True
 
     # If a cell contains a "maybe number" which no other cell in the column, row or block contains, we can set this
     # as a fixed number.
-    board.set_last_remaining_number()
+    with _stage(stats, "singles"):
+        board.set_last_remaining_number()
     if board.is_solved():
-        show_board(board, "After maybe numbers have been changed to fixed numbers")
+        show_board(board, "After maybe numbers have been changed to fixed numbers", renderer, stats)
         return True
 
     # Uses the backtracking algorithm, that means it tries every remaining "maybe number" until we find a valid
-    # solution.
-    board.solve_with_backtrack()
+    # solution. The branching policy decides which cell is tried next (see module branching).
+    # Alternatively, the board is solved as exact cover problem with dancing links (see module dlx).
+    with _stage(stats, engine):
+        board = solve_with_engine(board, policy, engine)
     if board.is_solved():
-        show_board(board, "After backtrack")
+        show_board(board, f"After {engine}", renderer, stats)
         return True
 
     return False
 
 
+def _stage(stats, stage):
+    """Returns a context manager which measures the wall time of the given stage if stats is not None."""
+    if stats is None:
+        return nullcontext()
+    return stats.stage(stage)
+
+
+def run(argv=None) -> int:
+    """Solves the given boards of the board directory with main() and renders them in the given format."""
+    parser = argparse.ArgumentParser(description="Solves boards of the board directory")
+    parser.add_argument("boards", nargs="*",
+                        default=["11.txt", "12.txt", "44.txt", "175.txt", "evil.txt", "medium.txt"],
+                        help="file names of the boards in the board directory")
+    parser.add_argument("--format", choices=printer.FORMATS, default=printer.PRETTY,
+                        help="output format (default: pretty)")
+    parser.add_argument("--engine", choices=["backtrack", "dlx"], default="backtrack",
+                        help="engine if reducing the maybe numbers is not enough (default: backtrack)")
+    args = parser.parse_args(argv)
+
+    all_solved = True
+    with printer.BoardRenderer(output_format=args.format) as renderer:
+        for sudoku_number in args.boards:
+            start_time = time.time()
+            sudoku_stats = SolveStats()
+            solved = main(sudoku_number, engine=args.engine, stats=sudoku_stats, renderer=renderer)
+            stop_time = time.time()
+            if solved:
+                renderer.render_text(f"It took me {stop_time - start_time}s to solve this problem")
+                renderer.render_text(f"Statistics: {sudoku_stats.as_dict()}")
+            else:
+                all_solved = False
+                renderer.render_text(f"Unfortunately I was not able to solve this problem - tried it for "
+                                     f"{stop_time - start_time}s")
+    return 0 if all_solved else 1
+
+
 if __name__ == '__main__':
-    sudoku_numbers = ["11.txt", "12.txt", "44.txt", "175.txt", "evil.txt", "medium.txt"]
-
-    for sudoku_number in sudoku_numbers:
-        start_time = time.time()
-        solved = main(sudoku_number)
-        stop_time = time.time()
-        if solved:
-            print(f"It took me {stop_time - start_time}s to solve this problem")
-        else:
-            print(f"Unfortunately I was not able to solve this problem - tried it for {stop_time - start_time}s")
+    sys.exit(run())
@@ -0,0 +1,118 @@
+"""Statistics of solving a single board.
+
+A SolveStats object is attached to a board with Board.set_stats(). The board and the search engines then report into
+it: the number of search nodes and backtracks, the number of "maybe numbers" which have been eliminated, the number
+of singles which have been found, the number of validate() calls, the maximum search depth and the wall time of every
+stage of solver.solve(). If no SolveStats object is attached (the default), the board only checks once per method
+call (or per eliminated number) that there is nothing to report.
+"""
+from contextlib import contextmanager
+import time
+
+
+class SolveStats:
+    """
+    An instance of class SolveStats collects the statistics of solving a board (see module stats).
+    """
+
+    def __init__(self):
+        self._nodes = 0
+        self._backtracks = 0
+        self._eliminations = 0
+        self._singles = 0
+        self._validations = 0
+        self._max_depth = 0
+        self._stage_seconds = {}
+
+    ########################################################
+    # Reporting methods, called by the board and the engines
+    ########################################################
+
+    def add_node(self, depth) -> None:
+        """Reports a search node, that is a number which has been tried, at the given search depth."""
+        self._nodes += 1
+        if depth > self._max_depth:
+            self._max_depth = depth
+
+    def add_nodes(self, count) -> None:
+        """Reports the given number of search nodes of an engine which does not report every node."""
+        self._nodes += count
+
+    def add_backtrack(self) -> None:
+        """Reports that the search went back to the previous cell since all numbers of a cell have been tried."""
+        self._backtracks += 1
+
+    def add_elimination(self, count=1) -> None:
+        """Reports that a number (or the given count of numbers) has been removed from the "maybe numbers" of a
+        cell."""
+        self._eliminations += count
+
+    def add_single(self) -> None:
+        """Reports that a fixed number has been found because it was the only possible number of a cell or the only
+        possible cell of the number in a row, column or block."""
+        self._singles += 1
+
+    def add_validation(self) -> None:
+        """Reports a call of Board.validate()."""
+        self._validations += 1
+
+    def add_stage_seconds(self, stage, seconds) -> None:
+        """Adds the given wall time in seconds to the given stage."""
+        self._stage_seconds[stage] = self._stage_seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage):
+        """Measures the wall time of the with-block and adds it to the given stage."""
+        start_time = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_stage_seconds(stage, time.perf_counter() - start_time)
+
+    ########################################################
+    # Getters
+    ########################################################
+
+    def nodes(self) -> int:
+        return self._nodes
+
+    def backtracks(self) -> int:
+        return self._backtracks
+
+    def eliminations(self) -> int:
+        return self._eliminations
+
+    def singles(self) -> int:
+        return self._singles
+
+    def validations(self) -> int:
+        return self._validations
+
+    def max_depth(self) -> int:
+        return self._max_depth
+
+    def stage_seconds(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            the wall time in seconds by the name of the stage, in the order in which the stages have been run.
+        """
+        return dict(self._stage_seconds)
+
+    def as_dict(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            all statistics as a dict which can be written to a JSON file.
+        """
+        return {
+            "nodes": self._nodes,
+            "backtracks": self._backtracks,
+            "eliminations": self._eliminations,
+            "singles": self._singles,
+            "validations": self._validations,
+            "max_depth": self._max_depth,
+            "stage_seconds": self.stage_seconds(),
+        }
@@ -0,0 +1,133 @@
+"""Precomputed index tables of a Sudoku board.
+
+A board stores its cells in a flat list in row-major order, so the cell in row r and column c has the index
+r * size + c. The tables in this module are built once per box size and map every cell index to its row, column and
+block, and to its peers (all other cells which share a row, column or block with it). The units (rows, columns,
+blocks) are numbered in this order, so for a 9x9 board the rows are the units 0 to 8, the columns 9 to 17 and the
+blocks 18 to 26.
+
+geometry() returns the tables of a board with the given box size, for example 4 for a 16x16 board. The module
+constants (SIZE, ROWS, PEERS, ...) are the tables of the common 9x9 board.
+"""
+from collections import namedtuple
+
+# the symbols of the numbers 1, 2, 3, ... in the one-line format, enough for a 25x25 board
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+# the symbols of an unknown number in the one-line format
+UNKNOWN_SYMBOLS = ".0xX"
+MIN_BOX_SIZE = 2
+MAX_BOX_SIZE = 5
+
+Geometry = namedtuple("Geometry", ["box_size", "size", "cell_count", "all_numbers", "symbols",
+                                   "rows", "cols", "blocks", "units",
+                                   "row_of", "col_of", "positions", "block_of", "units_of", "unit_positions_of",
+                                   "peers", "number_of_byte", "byte_of_number"])
+Geometry.__doc__ = """The index tables of a board with box_size * box_size blocks of box_size * box_size cells each:
+
+- size: the number of rows, columns, blocks and numbers, cell_count: the number of cells.
+- all_numbers: the bitmask of all numbers, symbols: the symbols of the numbers 1 to size.
+- rows, cols, blocks, units: the cell indices of every row, column, block and unit.
+- row_of, col_of, positions, block_of: the row, column, (row, column) tuple and block of every cell index.
+- units_of: the units (row, size + column, 2 * size + block) of every cell index.
+- unit_positions_of: the units of every cell index together with the bit of the position of the cell in each unit.
+- peers: the cell indices of the peers of every cell index.
+- number_of_byte: the number of every byte of the one-line format, None for an unknown number, 0 for an invalid byte.
+- byte_of_number: the byte of every number in the one-line format, at index 0 the byte of an unknown number."""
+
+_GEOMETRIES = {}
+
+
+def geometry(box_size=3) -> Geometry:
+    """
+    Returns
+    -------
+    Geometry
+        the index tables of a board with the given box size (3 for a 9x9 board). The tables are only built once per
+        box size.
+
+    Raises
+    ------
+    Exception
+        If the box size is not between MIN_BOX_SIZE and MAX_BOX_SIZE, an Exception is raised.
+    """
+    if box_size not in _GEOMETRIES:
+        if not isinstance(box_size, int) or not MIN_BOX_SIZE <= box_size <= MAX_BOX_SIZE:
+            raise Exception(f"Unsupported box size {box_size}")
+        _GEOMETRIES[box_size] = _build_geometry(box_size)
+    return _GEOMETRIES[box_size]
+
+
+def _build_geometry(box_size) -> Geometry:
+    size = box_size * box_size
+    cell_count = size * size
+    rows = tuple(tuple(row_idx * size + col_idx for col_idx in range(size)) for row_idx in range(size))
+    cols = tuple(tuple(row_idx * size + col_idx for row_idx in range(size)) for col_idx in range(size))
+    blocks = tuple(tuple((block_idx // box_size * box_size + row_offset) * size
+                         + block_idx % box_size * box_size + col_offset
+                         for row_offset in range(box_size)
+                         for col_offset in range(box_size))
+                   for block_idx in range(size))
+    units = rows + cols + blocks
+
+    row_of = tuple(idx // size for idx in range(cell_count))
+    col_of = tuple(idx % size for idx in range(cell_count))
+    block_of = tuple(row_of[idx] // box_size * box_size + col_of[idx] // box_size for idx in range(cell_count))
+    units_of = tuple((row_of[idx], size + col_of[idx], 2 * size + block_of[idx]) for idx in range(cell_count))
+
+    symbols = SYMBOLS[:size]
+    number_of_byte = [0] * 256
+    for byte in UNKNOWN_SYMBOLS.encode("ascii"):
+        number_of_byte[byte] = None
+    for number, symbol in enumerate(symbols, 1):
+        number_of_byte[ord(symbol)] = number
+        number_of_byte[ord(symbol.lower())] = number
+
+    return Geometry(
+        box_size=box_size,
+        size=size,
+        cell_count=cell_count,
+        all_numbers=(1 << size) - 1,
+        symbols=symbols,
+        rows=rows,
+        cols=cols,
+        blocks=blocks,
+        units=units,
+        row_of=row_of,
+        col_of=col_of,
+        positions=tuple((row_of[idx], col_of[idx]) for idx in range(cell_count)),
+        block_of=block_of,
+        units_of=units_of,
+        unit_positions_of=tuple(tuple((unit_idx, 1 << units[unit_idx].index(idx)) for unit_idx in units_of[idx])
+                                for idx in range(cell_count)),
+        peers=tuple(tuple(sorted(set(rows[row_of[idx]] + cols[col_of[idx]] + blocks[block_of[idx]]) - {idx}))
+                    for idx in range(cell_count)),
+        number_of_byte=tuple(number_of_byte),
+        byte_of_number=tuple([ord(".")] + [ord(symbol) for symbol in symbols]),
+    )
+
+
+GEOMETRY = geometry(3)
+
+BOX_SIZE = GEOMETRY.box_size
+SIZE = GEOMETRY.size
+CELL_COUNT = GEOMETRY.cell_count
+
+ROWS = GEOMETRY.rows
+COLS = GEOMETRY.cols
+BLOCKS = GEOMETRY.blocks
+UNITS = GEOMETRY.units
+
+ROW_OF = GEOMETRY.row_of
+COL_OF = GEOMETRY.col_of
+POSITIONS = GEOMETRY.positions
+BLOCK_OF = GEOMETRY.block_of
+UNITS_OF = GEOMETRY.units_of
+# for every cell the units of the cell together with the bit of the position of the cell within each unit
+UNIT_POSITIONS_OF = GEOMETRY.unit_positions_of
+PEERS = GEOMETRY.peers
+
+
+def index_of(pos, size=SIZE) -> int:
+    """Returns the index of the cell at the given position (a tuple of row and column index) on a board with the
+    given number of columns."""
+    return pos[0] * size + pos[1]
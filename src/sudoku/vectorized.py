@@ -0,0 +1,193 @@
+"""Solves thousands of puzzles at once with NumPy.
+
+The puzzles of a chunk are held in a single boolean tensor of shape (N, 81, 9): candidates[b, i, n] is True if the
+number n + 1 is still possible in cell i of board b. The following steps are applied to all boards at once until
+no board changes any longer:
+
+- naked singles: a number which is fixed in a row, column or block is removed from the other cells of that unit.
+- hidden singles: if a number is possible in only one cell of a unit, it becomes the fixed number of that cell.
+
+Most puzzles are solved by these two steps alone. The remaining boards are handed over to the backtracking
+algorithm of class Board, starting from the reduced candidates.
+
+Only 9x9 boards are supported. This module requires NumPy, which is an optional dependency of this project.
+"""
+import time
+
+import numpy as np
+
+from src.sudoku.bits import ALL_NUMBERS
+from src.sudoku.board import Board
+from src.sudoku.units import CELL_COUNT, SIZE, UNITS, UNITS_OF
+
+_UNITS = np.array(UNITS)
+_UNITS_OF = np.array(UNITS_OF)
+_NUMBERS = np.arange(1, SIZE + 1)
+_NUMBER_BITS = 1 << np.arange(SIZE)
+_VALID_CHARACTERS = set("123456789.0xX")
+
+
+def solve_puzzles_vectorized(puzzles, chunksize=4096, policy=None):
+    """Solves the given puzzles in chunks of chunksize puzzles.
+
+    Parameters
+    ----------
+    puzzles
+        an iterable of puzzles in the one-line format, see batch.solve_puzzles().
+    chunksize : int
+        the number of puzzles which are reduced at once. The memory used is about 3 KB per puzzle.
+    policy
+        the branching policy which is passed to Board.solve_with_backtrack() for the puzzles which are not solved by
+        the vectorized reduction.
+
+    Yields
+    ------
+    tuple
+        a tuple (puzzle, solution, stats) for every puzzle in the order of the puzzles, see batch.solve_puzzles().
+        Besides "seconds" (the share of the puzzle in the time of the vectorized reduction plus its own
+        backtracking time) and "error", stats contains "stage": "propagation" if the puzzle has been solved by the
+        vectorized reduction, "backtrack" if the backtracking algorithm was needed.
+    """
+    chunk = []
+    for puzzle in puzzles:
+        puzzle = puzzle.strip()
+        if not puzzle or puzzle.startswith("#"):
+            continue
+        chunk.append(puzzle)
+        if len(chunk) == chunksize:
+            yield from _solve_chunk(chunk, policy)
+            chunk = []
+    if chunk:
+        yield from _solve_chunk(chunk, policy)
+
+
+def candidates_of(puzzles) -> np.ndarray:
+    """Returns the candidate tensor of shape (N, 81, 9) of the given puzzles in the one-line format.
+
+    Raises
+    ------
+    Exception
+        If a puzzle is not a 9x9 board, an Exception is raised.
+    """
+    if any(not len(puzzle) == CELL_COUNT for puzzle in puzzles):
+        raise Exception("Cannot create the candidates, only 9x9 boards are supported")
+    codes = np.frombuffer("".join(puzzles).encode("ascii"), dtype=np.uint8).reshape(len(puzzles), CELL_COUNT)
+    numbers = codes.astype(np.int16) - ord("0")
+    given = (numbers >= 1) & (numbers <= SIZE)
+    return np.where(given[..., None], numbers[..., None] == _NUMBERS, True)
+
+
+def reduce_candidates(candidates):
+    """Reduces the candidates of all boards with naked and hidden singles until no board changes any longer.
+
+    Parameters
+    ----------
+    candidates : np.ndarray
+        the candidate tensor of shape (N, 81, 9). It is changed in place.
+
+    Returns
+    -------
+    np.ndarray
+        a boolean array of shape (N, ), True for every board which is not valid.
+
+    Raises
+    ------
+    Exception
+        If the candidates are not those of 9x9 boards, an Exception is raised.
+    """
+    if not candidates.shape[1:] == (CELL_COUNT, SIZE):
+        raise Exception("Cannot reduce the candidates, only 9x9 boards are supported")
+    invalid = np.zeros(len(candidates), dtype=bool)
+    active = np.arange(len(candidates))
+    while len(active):
+        boards = candidates[active]
+        reduced, contradiction = _reduce_step(boards)
+        invalid[active] |= contradiction
+        changed = (reduced != boards).any(axis=(1, 2)) & ~contradiction
+        candidates[active] = reduced
+        active = active[changed]
+    return invalid
+
+
+def _reduce_step(boards):
+    """Applies naked and hidden singles once to the given boards. Returns the reduced boards and a boolean array
+    which is True for every board with a contradiction."""
+    fixed = boards.sum(axis=2) == 1
+    fixed_numbers = boards & fixed[..., None]
+
+    # naked singles: remove the numbers which are fixed in a unit from all other cells of that unit
+    unit_fixed_counts = fixed_numbers[:, _UNITS, :].sum(axis=2)
+    used = (unit_fixed_counts > 0)[:, _UNITS_OF, :].any(axis=2)
+    reduced = boards & ~(used & ~fixed[..., None])
+
+    # hidden singles: a number which is possible in only one cell of a unit is the fixed number of that cell
+    unit_candidates = reduced[:, _UNITS, :]
+    unit_counts = unit_candidates.sum(axis=2)
+    hidden = unit_candidates & (unit_counts == 1)[:, :, None, :]
+    hidden_singles = np.zeros_like(reduced)
+    for unit_type in range(3):
+        unit_cells = _UNITS[unit_type * SIZE:(unit_type + 1) * SIZE].ravel()
+        hidden_singles[:, unit_cells] |= hidden[:, unit_type * SIZE:(unit_type + 1) * SIZE].reshape(-1, CELL_COUNT,
+                                                                                                     SIZE)
+    hidden_counts = hidden_singles.sum(axis=2)
+    reduced = np.where((hidden_counts > 0)[..., None], hidden_singles, reduced)
+
+    contradiction = (unit_fixed_counts > 1).any(axis=(1, 2)) \
+        | (unit_counts == 0).any(axis=(1, 2)) \
+        | (hidden_counts > 1).any(axis=1) \
+        | (reduced.sum(axis=2) == 0).any(axis=1)
+    return reduced, contradiction
+
+
+def _solve_chunk(chunk, policy):
+    """Solves a chunk of puzzles and returns the list of results."""
+    results = [None] * len(chunk)
+    valid_idx = []
+    for idx, puzzle in enumerate(chunk):
+        if len(puzzle) == CELL_COUNT and set(puzzle) <= _VALID_CHARACTERS:
+            valid_idx.append(idx)
+        else:
+            results[idx] = (puzzle, None, {"seconds": 0.0, "stage": "propagation",
+                                           "error": "Cannot create board from the given line"})
+    if not valid_idx:
+        return results
+
+    start_time = time.perf_counter()
+    candidates = candidates_of([chunk[idx] for idx in valid_idx])
+    invalid = reduce_candidates(candidates)
+    counts = candidates.sum(axis=2)
+    solved = (counts == 1).all(axis=1) & ~invalid
+    values = (candidates.argmax(axis=2) + ord("1")).astype(np.uint8)
+    masks = (candidates * _NUMBER_BITS).sum(axis=2)
+    seconds = (time.perf_counter() - start_time) / len(valid_idx)
+
+    for board_idx, idx in enumerate(valid_idx):
+        puzzle = chunk[idx]
+        if invalid[board_idx]:
+            results[idx] = (puzzle, None, {"seconds": seconds, "stage": "propagation",
+                                           "error": "Board is not valid any more"})
+        elif solved[board_idx]:
+            results[idx] = (puzzle, values[board_idx].tobytes().decode("ascii"),
+                            {"seconds": seconds, "stage": "propagation", "error": None})
+        else:
+            start_time = time.perf_counter()
+            try:
+                solution = _solve_with_backtrack(values[board_idx], counts[board_idx], masks[board_idx], policy)
+                error = None
+            except Exception as e:
+                solution = None
+                error = str(e)
+            results[idx] = (puzzle, solution, {"seconds": seconds + time.perf_counter() - start_time,
+                                               "stage": "backtrack", "error": error})
+    return results
+
+
+def _solve_with_backtrack(values, counts, masks, policy) -> str:
+    """Creates a Board from the reduced candidates of a single board and solves it with backtracking."""
+    line = "".join(chr(value) if count == 1 else "." for value, count in zip(values, counts))
+    board = Board.from_string(line)
+    for cell, count, mask in zip(board, counts, masks):
+        if count > 1:
+            board.eliminate(cell, ALL_NUMBERS & ~int(mask))
+    board.solve_with_backtrack(policy)
+    return board.to_string()
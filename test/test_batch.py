@@ -0,0 +1,54 @@
+from src.sudoku.batch import solve_file, solve_puzzles
+from src.sudoku.board import Board
+
+PUZZLE = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+
+
+def test_solve_puzzles():
+    results = list(solve_puzzles([PUZZLE + "\n", "\n", "# comment\n", PUZZLE.replace(".", "0")]))
+    assert len(results) == 2
+    for puzzle, solution, stats in results:
+        assert len(puzzle) == 81
+        assert Board.from_string(solution).is_solved()
+        assert stats["error"] is None
+        assert stats["seconds"] >= 0
+
+
+def test_solve_puzzles_is_lazy():
+    def puzzles():
+        yield PUZZLE
+        raise AssertionError("the second puzzle must not be read")
+
+    results = solve_puzzles(puzzles())
+    puzzle, solution, stats = next(results)
+    assert puzzle == PUZZLE
+
+
+def test_solve_puzzles_with_errors():
+    invalid = "44" + PUZZLE[2:]
+    results = list(solve_puzzles(["123", invalid, PUZZLE], engine="dlx"))
+    assert [solution is None for puzzle, solution, stats in results] == [True, True, False]
+    assert results[0][2]["error"]
+    assert results[1][2]["error"]
+
+
+def test_solve_file(tmp_path):
+    path = tmp_path / "puzzles.txt"
+    path.write_text(PUZZLE + "\n" + PUZZLE + "\n")
+    assert len(list(solve_file(path))) == 2
+
+
+def test_solve_puzzles_with_stats():
+    results = list(solve_puzzles([PUZZLE, "11" + "." * 79], with_stats=True))
+    assert results[0][2]["solver"]["nodes"] > 0
+    assert results[1][1] is None
+    assert "solver" in results[1][2]
+
+
+def test_solve_puzzles_with_node_budget():
+    hard = ".....6....59.....82....8....45........3........6..3.54...325..6.................."
+    results = list(solve_puzzles([hard, PUZZLE], max_nodes=100))
+    assert results[0][1] is None
+    assert results[0][2]["unfinished"]["reason"] == "nodes"
+    assert len(results[0][2]["unfinished"]["candidates"]) == 81
+    assert results[1][1] is not None
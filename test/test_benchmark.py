@@ -0,0 +1,38 @@
+from src.sudoku.benchmark import compare_results, load_corpora, percentile, run_benchmark, summarize
+
+
+def test_percentile():
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([5], 95) == 5
+
+
+def test_summarize():
+    summary = summarize([0.1, 0.3, 0.2, 0.4], errors=1)
+    assert summary["puzzles"] == 4
+    assert summary["errors"] == 1
+    assert abs(summary["median"] - 0.25) < 1e-9
+    assert summary["p95"] == 0.4
+    assert abs(summary["puzzles_per_second"] - 4.0) < 1e-9
+
+
+def test_load_corpora():
+    corpora = load_corpora()
+    assert {"boards", "easy", "hard", "pathological"} <= set(corpora)
+    assert len(corpora["boards"]) == 6
+    for puzzles in corpora.values():
+        assert all(len(puzzle) == 81 for puzzle in puzzles)
+
+
+def test_run_benchmark_and_compare_results():
+    corpora = {"easy": load_corpora(["easy"])["easy"][:2], "invalid": ["11" + "." * 79]}
+    results = run_benchmark(corpora, ["reduce", "dlx"], repeat=1)
+    assert results["results"]["easy"]["dlx"]["puzzles"] == 2
+    assert results["results"]["easy"]["dlx"]["errors"] == 0
+    assert results["results"]["invalid"]["dlx"]["errors"] == 1
+    assert compare_results(results, results) == []
+
+    faster = {"results": {"easy": {"dlx": dict(results["results"]["easy"]["dlx"], median=0.0, p95=0.0)}}}
+    regressions = compare_results(faster, results)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("easy/dlx: median")
@@ -0,0 +1,28 @@
+from src.sudoku.bits import ALL_NUMBERS, bit, iter_numbers, lowest_number, mask_of, popcount
+
+
+def test_bit():
+    assert bit(1) == 0b1
+    assert bit(9) == 0b100000000
+
+
+def test_mask_of():
+    assert mask_of([]) == 0
+    assert mask_of([1, 3, 9]) == 0b100000101
+    assert mask_of(range(1, 10)) == ALL_NUMBERS
+
+
+def test_popcount():
+    assert popcount(0) == 0
+    assert popcount(ALL_NUMBERS) == 9
+    assert popcount(mask_of([2, 5])) == 2
+
+
+def test_lowest_number():
+    assert lowest_number(0) is None
+    assert lowest_number(mask_of([4, 7])) == 4
+
+
+def test_iter_numbers():
+    assert list(iter_numbers(0)) == []
+    assert list(iter_numbers(mask_of([9, 2, 5]))) == [2, 5, 9]
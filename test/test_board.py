@@ -1,4 +1,8 @@
+import pytest
+
+from src.sudoku.bits import ALL_NUMBERS, bit
 from src.sudoku.board import Board
+from src.sudoku.branching import MinimumRemainingValues
 
 
 def test_get_row():
@@ -54,6 +58,187 @@ def test_no_doubles():
     assert not board.no_doubles((1, 2, 3, 1))
 
 
+def test_reduce_maybe_numbers():
+    board = get_board()
+    board.reduce_maybe_numbers()
+    assert board.validate()
+    for cell in board:
+        if cell.is_number_fixed():
+            continue
+        peer_numbers = board.get_row_numbers(cell.get_row_idx()) + board.get_col_numbers(cell.get_col_idx()) \
+            + board.get_block_numbers(cell.get_block_idx())
+        assert not set(cell.maybe_numbers()) & set(peer_numbers)
+
+
+def test_set_fixed_value_of_cell_reduces_peers():
+    board = get_board()
+    board.set_fixed_value_of_cell(board.get_cell((0, 8)), 9)
+    assert 9 not in board.get_cell((0, 1)).maybe_numbers()
+    assert 9 not in board.get_cell((5, 8)).maybe_numbers()
+    assert 9 not in board.get_cell((2, 7)).maybe_numbers()
+    assert 9 in board.get_cell((4, 4)).maybe_numbers()
+
+
+def test_set_fixed_value_of_cell_with_contradiction():
+    board = get_board()
+    with pytest.raises(Exception):
+        board.set_fixed_value_of_cell(board.get_cell((0, 8)), 1)
+
+
+def test_used_numbers_mask():
+    board = get_board()
+    # row 0: 1, 8, 5, 4, 7 - column 8: 6, 3, 1 - block 2: 4, 7, 6, 5
+    assert board.used_numbers_mask(board.get_cell((0, 8))) == 0b011111101
+    board.set_fixed_value_of_cell(board.get_cell((0, 8)), 9)
+    assert board.used_numbers_mask(board.get_cell((0, 1))) & 0b100000000
+
+
+def test_solve_with_backtrack():
+    board = get_board()
+    board.reduce_maybe_numbers()
+    board.solve_with_backtrack()
+    assert board.is_solved()
+
+
+def test_count_solutions():
+    puzzle = "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3"
+    board = Board.from_string(puzzle)
+    assert board.count_solutions() == 1
+    assert board.has_unique_solution()
+    # the board is not changed by counting
+    assert board.to_string() == puzzle
+    assert board[0].maybe_numbers_mask() == ALL_NUMBERS
+
+    board = Board.from_string("." * 9 + puzzle[9:])
+    assert board.count_solutions() == 482
+    assert board.count_solutions(limit=2) == 2
+    assert not board.has_unique_solution()
+    assert Board.from_string("11" + "." * 79).count_solutions() == 0
+    with pytest.raises(Exception):
+        board.count_solutions(limit=0)
+
+
+def test_assign_and_rewind():
+    board = get_board()
+    before = [(cell.number(), cell.maybe_numbers_mask()) for cell in board]
+    used_numbers_mask = board.used_numbers_mask(board.get_cell((0, 1)))
+    checkpoint = board.checkpoint()
+    assert board.assign(board.get_cell((0, 8)), 9)
+    assert board.get_cell((0, 8)).number() == 9
+    assert 9 not in board.get_cell((0, 1)).maybe_numbers()
+    board.rewind(checkpoint)
+    board.stop_trail()
+    assert [(cell.number(), cell.maybe_numbers_mask()) for cell in board] == before
+    assert board.used_numbers_mask(board.get_cell((0, 1))) == used_numbers_mask
+
+
+def test_assign_with_contradiction():
+    board = get_board()
+    assert not board.assign(board.get_cell((0, 8)), 1)
+
+
+def test_eliminate():
+    board = Board.from_string("." * 81)
+    board.checkpoint()
+    assert board.eliminate(board[0], ALL_NUMBERS & ~bit(5))
+    assert board[0].number() == 5
+    assert not board[1].maybe_numbers_mask() & bit(5)
+    board.rewind(0)
+    assert board[0].number() is None
+    assert board[1].maybe_numbers_mask() == ALL_NUMBERS
+    assert not board.eliminate(board[0], ALL_NUMBERS)
+
+
+def test_hidden_single_is_propagated():
+    board = Board.from_string("." * 81)
+    checkpoint = board.checkpoint()
+    for idx in range(1, 8):
+        assert board.eliminate(board[idx], bit(1))
+    assert board[0].number() is None
+    # number 1 is only possible in the first cell of the first row any longer
+    assert board.eliminate(board[8], bit(1))
+    assert board[0].number() == 1
+    board.rewind(checkpoint)
+    assert board[0].number() is None
+    assert board.eliminate(board[8], bit(1))
+    assert board[0].number() is None
+
+
+def test_from_string_and_to_string():
+    line = "1..85.47....4.3..6.6.....5.......81.3.4..7...6.1.2473....9....3.2.........5....21"
+    board = Board.from_string(line)
+    assert board.to_string() == line
+    assert board.to_string() == get_board().to_string()
+    assert Board.from_string(line.replace(".", "0")).to_string() == line
+
+
+def test_from_string_with_invalid_line():
+    with pytest.raises(Exception):
+        Board.from_string("1..85.47")
+    with pytest.raises(Exception):
+        Board.from_string("a" * 81)
+    with pytest.raises(Exception):
+        Board.from_string("H" * 256)
+
+
+# a 16x16 puzzle with a unique solution, the numbers 10 to 16 are given as 'A' to 'G'
+PUZZLE_16 = (".D7..9.1FE6...2..B8.F.C.7..3.E.5A..F...4.D219C6G.E..3...B4C.18F...C..46.2..F5.A..2A..F.C.95B.."
+             "4...B...9.6..7F.C1..6.....D.......2..4.G.9C.A8.B7FD.G..C.69..42...3.F1...B.2D..A9.7..AE..D1.B6G...."
+             ".....5AG6...D3.C.D2..E8.B...F5.6......F..8..9.A8..54......D.1.2")
+SOLUTION_16 = ("4D7CG981FE65A32B1B86FAC27G934ED5A53F7EB48D219C6G9E2G36D5B4CA18F7E1CDB46G283F57A9G2A81F7CE95B364D5"
+               "4B3D89E6AG7F2C1F76925A3D14C8GBE26E45G19C3A8DB7FD8GBACF697E425133CF1874B52DGEA96795AE23D1FB6G48CBF4"
+               "E915AG672CD38CGD263E8AB197F546317CD2F458EB9GA8A954BG73CFD61E2")
+
+
+def test_board_16x16():
+    board = Board.from_string(PUZZLE_16)
+    assert board.geometry().size == 16
+    assert len(board) == 256
+    assert board.to_string() == PUZZLE_16
+    assert board.get_row_numbers(0) == [13, 7, 9, 1, 15, 14, 6, 2]
+    assert str(board.get_cell((0, 1))) == "D"
+    assert board.get_cell((0, 0)).maybe_numbers() == list(range(1, 17))
+    assert board.has_unique_solution()
+    board.solve_with_backtrack()
+    assert board.is_solved()
+    assert board.to_string() == SOLUTION_16
+
+
+@pytest.mark.parametrize("size", [4, 25])
+def test_solve_empty_board(size):
+    board = Board([["x"] * size for _ in range(size)])
+    board.solve_with_backtrack(MinimumRemainingValues())
+    assert board.is_solved()
+    assert len(set(board.to_string())) == size
+
+
+def test_board_16x16_from_rows():
+    rows = [[number if number != "." else "x" for number in SOLUTION_16[row_idx * 16:(row_idx + 1) * 16]]
+            for row_idx in range(16)]
+    rows[0][0] = "x"
+    # the numbers above 9 can also be given as integer values
+    rows[0][2] = "7"
+    rows[0][3] = "12"
+    board = Board(rows)
+    board.reduce_maybe_numbers()
+    assert board.is_solved()
+    assert board.to_string() == SOLUTION_16
+
+
+def test_board_has_slots():
+    board = get_board()
+    assert not hasattr(board, "__dict__")
+    with pytest.raises(AttributeError):
+        board.other = 1
+
+
+def test_board_with_invalid_row():
+    rows = [["x"] * 9 for _ in range(9)]
+    rows[3].append("x")
+    with pytest.raises(Exception):
+        Board(rows)
+
+
 def get_board():
     with open("../board/11.txt", "r") as board_input:
         lines = board_input.read().split("\n")
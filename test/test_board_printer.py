@@ -0,0 +1,67 @@
+import io
+import json
+
+import pytest
+
+import src.sudoku.board_printer as printer
+from src.sudoku.board import Board
+from src.sudoku.compact import CompactBoard
+from src.sudoku.stats import SolveStats
+
+PUZZLE = "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3"
+
+
+def test_format_pretty():
+    text = printer.format_pretty(Board.from_string(PUZZLE), "evil")
+    lines = text.split("\n")
+    assert lines[1] == "************  evil  ***************"
+    assert lines[3:5] == ["Numbers of cells fixed: 23", "Numbers of cells not fixed: 58"]
+    assert lines[6] == "X|X|8| |1|X|X| |5|X|X"
+    assert lines[9] == "-" * 21
+    assert text.endswith("-" * 21 + "\n\n")
+    # a compact board is rendered in the same way
+    assert printer.format_pretty(CompactBoard.from_string(PUZZLE), "evil") == text
+
+
+def test_print_board(capsys):
+    board = Board.from_string(PUZZLE)
+    printer.print_board(board)
+    assert capsys.readouterr().out == printer.format_pretty(board)
+    assert printer.numbers_of_cells_fixed_not_fixed(board) == (23, 58)
+
+
+def test_renderer_formats():
+    board = Board.from_string(PUZZLE)
+    stats = SolveStats()
+    stream = io.StringIO()
+    with printer.BoardRenderer(stream, printer.LINE) as renderer:
+        renderer.render(board, "initial", intermediate=True)
+        renderer.render(board)
+        renderer.render_text("only in the pretty format")
+        # nothing is written before the buffer is flushed
+        assert stream.getvalue() == ""
+    assert stream.getvalue() == PUZZLE + "\n"
+
+    stream = io.StringIO()
+    with printer.BoardRenderer(stream, printer.JSON) as renderer:
+        renderer.render(board, "evil", stats)
+    result = json.loads(stream.getvalue())
+    assert result == {"title": "evil", "board": PUZZLE, "fixed": 23, "not_fixed": 58, "stats": stats.as_dict()}
+
+    stream = io.StringIO()
+    with printer.BoardRenderer(stream, printer.QUIET) as renderer:
+        renderer.render(board)
+        renderer.render_text("text")
+    assert stream.getvalue() == ""
+
+    with pytest.raises(Exception):
+        printer.BoardRenderer(stream, "xml")
+
+
+def test_renderer_buffer_size():
+    stream = io.StringIO()
+    renderer = printer.BoardRenderer(stream, printer.LINE, buffer_size=100)
+    renderer.render(Board.from_string(PUZZLE))
+    assert stream.getvalue() == ""
+    renderer.render(Board.from_string(PUZZLE))
+    assert stream.getvalue() == (PUZZLE + "\n") * 2
@@ -0,0 +1,72 @@
+import pytest
+
+from src.sudoku.board import Board
+from src.sudoku.branching import FirstEmptyCell, MinimumRemainingValues
+
+
+def test_first_empty_cell():
+    board = get_board("11.txt")
+    policy = FirstEmptyCell()
+    assert policy.select_cell(board).pos() == (0, 1)
+    assert policy.order_numbers(board, board.get_cell((0, 1)), 0b100010100) == [3, 5, 9]
+
+
+def test_minimum_remaining_values():
+    board = get_board("evil.txt")
+    board.reduce_maybe_numbers()
+    policy = MinimumRemainingValues()
+    cell = policy.select_cell(board)
+    min_count = min(c.count_maybe_numbers() for c in board if not c.is_number_fixed())
+    assert cell.count_maybe_numbers() == min_count
+
+
+def test_least_constraining_value():
+    board = get_board("evil.txt")
+    board.reduce_maybe_numbers()
+    policy = MinimumRemainingValues(least_constraining_value=True)
+    cell = policy.select_cell(board)
+    numbers = policy.order_numbers(board, cell, cell.maybe_numbers_mask())
+    assert sorted(numbers) == cell.maybe_numbers()
+
+
+@pytest.mark.parametrize("policy", [FirstEmptyCell(),
+                                    MinimumRemainingValues(),
+                                    MinimumRemainingValues(least_constraining_value=True)])
+def test_solve_with_policy(policy):
+    board = get_board("evil.txt")
+    board.reduce_maybe_numbers()
+    nodes = board.solve_with_backtrack(policy)
+    assert nodes > 0
+    assert board.is_solved()
+
+
+def test_minimum_remaining_values_needs_fewer_nodes():
+    # evil.txt is nearly solved by naked and hidden singles, so a harder puzzle is needed here
+    puzzle = "1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1"
+    first_empty_cell_nodes = Board.from_string(puzzle).solve_with_backtrack(FirstEmptyCell())
+    assert Board.from_string(puzzle).solve_with_backtrack(MinimumRemainingValues()) < first_empty_cell_nodes
+
+
+def test_minimum_remaining_values_breaks_ties_by_unit_density():
+    # a puzzle of board/corpus/pathological.txt on which the first of the tied cells leads into a subtree of more than
+    # 25000 nodes, while FirstEmptyCell needs 3682 nodes
+    puzzle = ".....6....59.....82....8....45........3........6..3.54...325..6.................."
+    first_empty_cell_nodes = Board.from_string(puzzle).solve_with_backtrack(FirstEmptyCell())
+    nodes = Board.from_string(puzzle).solve_with_backtrack(MinimumRemainingValues())
+    assert nodes < first_empty_cell_nodes
+    assert nodes < 100
+
+
+def test_count_fixed_in_units():
+    board = Board.from_string("12" + "." * 79)
+    # the row and the block of the third cell contain both numbers, its column none
+    assert board.count_fixed_in_units(board[2]) == 4
+    assert board.count_fixed_in_units(board[80]) == 0
+
+
+def get_board(name):
+    with open("../board/" + name, "r") as board_input:
+        lines = board_input.read().split("\n")
+
+    new_lines = list(map(lambda x: x.split(","), lines))
+    return Board(new_lines)
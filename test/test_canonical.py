@@ -0,0 +1,75 @@
+import pytest
+
+from src.sudoku.board import Board
+from src.sudoku.canonical import SolutionCache, apply_transform, canonical_form, invert_transform
+
+PUZZLE = "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3"
+
+
+def transform(line, transpose, rows, cols, relabel):
+    """Transforms a board with the given permutations, independent of the module under test."""
+    grid = [line[row_idx * 9:row_idx * 9 + 9] for row_idx in range(9)]
+    if transpose:
+        grid = ["".join(col) for col in zip(*grid)]
+    return "".join(grid[row_idx][col_idx] if grid[row_idx][col_idx] == "." else relabel[grid[row_idx][col_idx]]
+                   for row_idx in rows for col_idx in cols)
+
+
+EQUIVALENT = [transform(PUZZLE, False, [2, 0, 1, 3, 4, 5, 6, 7, 8], list(range(9)),
+                        dict(zip("123456789", "123456789"))),
+              transform(PUZZLE, True, [6, 7, 8, 3, 5, 4, 0, 1, 2], [1, 0, 2, 8, 7, 6, 4, 3, 5],
+                        dict(zip("123456789", "917283645"))),
+              transform(PUZZLE, True, list(range(9)), [3, 4, 5, 0, 1, 2, 6, 7, 8],
+                        dict(zip("123456789", "234567891")))]
+
+
+@pytest.mark.parametrize("line", EQUIVALENT)
+def test_canonical_form_of_equivalent_boards(line):
+    assert canonical_form(Board.from_string(line))[0] == canonical_form(Board.from_string(PUZZLE))[0]
+
+
+@pytest.mark.parametrize("line", [PUZZLE] + EQUIVALENT)
+def test_apply_and_invert_transform(line):
+    key, transform_ = canonical_form(Board.from_string(line))
+    assert apply_transform(line, transform_) == key
+    assert invert_transform(key, transform_) == line
+
+
+def test_canonical_form_of_different_boards():
+    other = "1..85.47....4.3..6.6.....5.......81.3.4..7...6.1.2473....9....3.2.........5....21"
+    assert canonical_form(Board.from_string(other))[0] != canonical_form(Board.from_string(PUZZLE))[0]
+
+
+def test_solution_cache():
+    solved = []
+
+    def solve(board):
+        solved.append(board.to_string())
+        board.solve_with_backtrack()
+        return board
+
+    cache = SolutionCache(maxsize=1, solve=solve)
+    for line in [PUZZLE] + EQUIVALENT:
+        solution = cache.solve(Board.from_string(line))
+        assert solution.is_solved()
+        assert all(a == "." or a == b for a, b in zip(line, solution.to_string()))
+    assert solved == [PUZZLE]
+    assert cache.hits() == 3
+    assert cache.misses() == 1
+    assert cache.evictions() == 0
+
+    cache.solve(Board.from_string("1..85.47....4.3..6.6.....5.......81.3.4..7...6.1.2473....9....3.2.........5....21"))
+    cache.solve(Board.from_string(EQUIVALENT[0]))
+    assert cache.misses() == 3
+    assert cache.evictions() == 2
+    assert len(cache) == 1
+
+
+def test_only_9x9_boards():
+    with pytest.raises(Exception):
+        canonical_form(Board.from_string("." * 256))
+    with pytest.raises(Exception):
+        SolutionCache().solve(Board.from_string("." * 16))
+    key, transform_ = canonical_form(Board.from_string(PUZZLE))
+    with pytest.raises(Exception):
+        apply_transform("." * 16, transform_)
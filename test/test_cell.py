@@ -19,6 +19,13 @@ def test_create_valid_cell_with_x():
     assert c.pos() == (5, 8)
 
 
+def test_cell_has_slots():
+    c = Cell("x", (5, 8))
+    assert not hasattr(c, "__dict__")
+    with pytest.raises(AttributeError):
+        c.other = 1
+
+
 @pytest.mark.parametrize("row,col,block_idx", [(0, 0, 0),
                                                (1, 4, 1),
                                                (2, 6, 2),
@@ -93,3 +100,21 @@ def test_number_maybe_number():
     assert c.is_number_fixed_or_maybe_number_set()
     assert c.number_or_maybe_number() == 9
     assert c.maybe_number() is None
+
+
+def test_maybe_numbers_mask():
+    c = Cell("x", (0, 0))
+    assert c.maybe_numbers_mask() == 0b111111111
+    assert c.count_maybe_numbers() == 9
+    assert not c.reduce_maybe_numbers_mask(0b000000111)
+    assert c.maybe_numbers() == [4, 5, 6, 7, 8, 9]
+    assert c.count_maybe_numbers() == 6
+    assert c.reduce_maybe_numbers_mask(0b111011000)
+    assert c.number() == 6
+    assert c.maybe_numbers_mask() == 0
+
+
+def test_reduce_maybe_numbers_mask_without_remaining_numbers():
+    c = Cell("x", (0, 0))
+    with pytest.raises(Exception):
+        c.reduce_maybe_numbers_mask(0b111111111)
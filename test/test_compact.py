@@ -0,0 +1,65 @@
+import pytest
+
+from src.sudoku.board import Board
+from src.sudoku.compact import CellView, CompactBoard
+
+PUZZLE = "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3"
+PUZZLE_16 = "123456789ABCDEFG" + "." * 240
+
+
+def test_from_string():
+    board = CompactBoard.from_string(PUZZLE)
+    assert len(board) == 81
+    assert board.to_string() == PUZZLE
+    assert board[2].number() == 8
+    assert board[0].number() is None
+    assert board[0].maybe_numbers() == list(range(1, 10))
+    assert board[2].maybe_numbers_mask() == 0
+    assert board[-1].number() == 3
+    assert board.get_cell((1, 0)).number() == 7
+    with pytest.raises(IndexError):
+        board[81]
+    with pytest.raises(Exception):
+        CompactBoard.from_string(PUZZLE[:80] + "?")
+    with pytest.raises(Exception):
+        CompactBoard.from_string(PUZZLE[:80])
+
+
+def test_cell_views():
+    board = CompactBoard.from_string(PUZZLE)
+    cell = board[13]
+    assert isinstance(cell, CellView)
+    assert not hasattr(cell, "__dict__")
+    assert cell.pos() == (1, 4)
+    assert (cell.get_row_idx(), cell.get_col_idx(), cell.get_block_idx()) == (1, 4, 1)
+    assert cell == board.get_cell((1, 4))
+    assert str(board[2]) == "8" and str(cell) == "X"
+    # the cells are created on access
+    assert board[13] is not board[13]
+    assert [str(cell) for cell in board] == [str(cell) for cell in Board.from_string(PUZZLE)]
+
+
+def test_from_board_and_to_board():
+    board = Board.from_string(PUZZLE)
+    assert CompactBoard.from_board(board) == CompactBoard.from_string(PUZZLE)
+
+    board.reduce_maybe_numbers()
+    compact_board = CompactBoard.from_board(board)
+    assert [cell.maybe_numbers_mask() for cell in compact_board] == [cell.maybe_numbers_mask() for cell in board]
+    restored = compact_board.to_board()
+    assert [cell.maybe_numbers_mask() for cell in restored] == [cell.maybe_numbers_mask() for cell in board]
+    assert restored.to_string() == board.to_string()
+
+    restored.solve_with_backtrack()
+    solution = CompactBoard.from_board(restored)
+    assert solution.is_solved()
+    assert not compact_board.is_solved()
+
+
+def test_larger_board():
+    board = CompactBoard.from_string(PUZZLE_16)
+    assert board.geometry().size == 16
+    assert board[15].number() == 16
+    assert str(board[15]) == "G"
+    assert board.to_string() == PUZZLE_16
+    assert board.to_board().to_string() == PUZZLE_16
@@ -0,0 +1,93 @@
+import pytest
+
+from src.sudoku.bits import ALL_NUMBERS, bit, mask_of
+from src.sudoku.board import Board
+from src.sudoku.deductions import (TECHNIQUES, apply_deductions, box_line_reduction, hidden_pairs, naked_pairs,
+                                   pointing_pairs, x_wing)
+from src.sudoku.dlx import solve_with_dlx
+from src.sudoku.search import SearchEngine
+
+# needs more than 1000 search nodes with MRV if only naked and hidden singles are used
+HARD = "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5...."
+
+
+def test_naked_pairs():
+    board = Board.from_string("." * 81)
+    board.eliminate(board[0], ALL_NUMBERS & ~mask_of([1, 2]))
+    board.eliminate(board[1], ALL_NUMBERS & ~mask_of([1, 2]))
+    assert naked_pairs(board)
+    assert board[0].maybe_numbers_mask() == mask_of([1, 2])
+    # peers in the row and in the block
+    assert not board[8].maybe_numbers_mask() & mask_of([1, 2])
+    assert not board[20].maybe_numbers_mask() & mask_of([1, 2])
+    assert board[9 * 3].maybe_numbers_mask() == ALL_NUMBERS
+    assert not naked_pairs(board)
+
+
+def test_hidden_pairs():
+    board = Board.from_string("." * 81)
+    for idx in range(2, 9):
+        board.eliminate(board[idx], mask_of([1, 2]))
+    assert hidden_pairs(board)
+    assert board[0].maybe_numbers_mask() == mask_of([1, 2])
+    assert board[1].maybe_numbers_mask() == mask_of([1, 2])
+
+
+def test_pointing_pairs():
+    board = Board.from_string("." * 81)
+    for idx in (9, 10, 11, 18, 19, 20):
+        board.eliminate(board[idx], bit(1))
+    assert pointing_pairs(board)
+    assert all(not board[idx].maybe_numbers_mask() & bit(1) for idx in range(3, 9))
+    assert board[12].maybe_numbers_mask() & bit(1)
+
+
+def test_box_line_reduction():
+    board = Board.from_string("." * 81)
+    for idx in range(3, 9):
+        board.eliminate(board[idx], bit(1))
+    assert box_line_reduction(board)
+    assert all(not board[idx].maybe_numbers_mask() & bit(1) for idx in (9, 10, 11, 18, 19, 20))
+    assert board[0].maybe_numbers_mask() & bit(1)
+
+
+def test_x_wing():
+    board = Board.from_string("." * 81)
+    for row_idx in (0, 5):
+        for col_idx in (1, 2, 3, 5, 6, 7, 8):
+            board.eliminate(board[row_idx * 9 + col_idx], bit(1))
+    assert x_wing(board)
+    for row_idx in range(9):
+        expected = row_idx in (0, 5)
+        assert bool(board[row_idx * 9].maybe_numbers_mask() & bit(1)) == expected
+        assert bool(board[row_idx * 9 + 4].maybe_numbers_mask() & bit(1)) == expected
+    assert board[1 * 9 + 1].maybe_numbers_mask() & bit(1)
+
+
+def test_apply_deductions():
+    solution = solve_with_dlx(Board.from_string(HARD)).to_string()
+    board = Board.from_string(HARD)
+    board.reduce_maybe_numbers()
+    assert apply_deductions(board)
+    for cell, number in zip(board, solution):
+        assert cell.number() == int(number) or cell.maybe_numbers_mask() & bit(int(number))
+
+    engine = SearchEngine(board)
+    assert engine.next_solution()
+    assert board.to_string() == solution
+    assert engine.nodes() < 100
+
+
+def test_apply_deductions_with_single_technique():
+    board = Board.from_string(HARD)
+    board.reduce_maybe_numbers()
+    before = [cell.maybe_numbers_mask() for cell in board]
+    apply_deductions(board, ["x_wing"])
+    for cell, mask in zip(board, before):
+        assert cell.maybe_numbers_mask() & ~mask == 0
+    assert set(TECHNIQUES) >= {"naked_triples", "hidden_triples", "swordfish"}
+
+
+def test_apply_deductions_unknown_technique():
+    with pytest.raises(Exception):
+        apply_deductions(Board.from_string(HARD), ["guessing"])
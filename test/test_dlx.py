@@ -0,0 +1,58 @@
+import pytest
+
+from src.sudoku.board import Board
+from src.sudoku.dlx import DancingLinks, solve_with_dlx
+
+
+def test_dancing_links():
+    # example from Knuth's paper "Dancing Links"
+    dancing_links = DancingLinks(7)
+    dancing_links.add_row("A", (2, 4, 5))
+    dancing_links.add_row("B", (0, 3, 6))
+    dancing_links.add_row("C", (1, 2, 5))
+    dancing_links.add_row("D", (0, 3))
+    dancing_links.add_row("E", (1, 6))
+    dancing_links.add_row("F", (3, 4, 6))
+    assert sorted(dancing_links.search()) == ["A", "D", "E"]
+
+
+def test_dancing_links_without_solution():
+    dancing_links = DancingLinks(3)
+    dancing_links.add_row("A", (0, 1))
+    dancing_links.add_row("B", (1, 2))
+    assert dancing_links.search() is None
+
+
+@pytest.mark.parametrize("name", ["11.txt", "44.txt", "evil.txt"])
+def test_solve_with_dlx(name):
+    board = get_board(name)
+    solution = solve_with_dlx(board)
+    assert solution.is_solved()
+    for cell, solved_cell in zip(board, solution):
+        if cell.is_number_fixed():
+            assert cell.number() == solved_cell.number()
+    assert not board.is_solved()
+
+
+def test_solve_with_dlx_without_solution():
+    board = get_board("evil.txt")
+    board.get_cell((0, 0)).new_fixed_number(8)
+    with pytest.raises(Exception):
+        solve_with_dlx(board)
+
+
+def test_solve_with_dlx_16x16():
+    puzzle = Board.from_string("." * 256)
+    puzzle.solve_with_backtrack()
+    line = "".join(number if idx % 3 else "." for idx, number in enumerate(puzzle.to_string()))
+    solution = solve_with_dlx(Board.from_string(line))
+    assert solution.is_solved()
+    assert solution.geometry().size == 16
+
+
+def get_board(name):
+    with open("../board/" + name, "r") as board_input:
+        lines = board_input.read().split("\n")
+
+    new_lines = list(map(lambda x: x.split(","), lines))
+    return Board(new_lines)
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from src.sudoku.board import Board
+from src.sudoku.generator import generate_puzzle, generate_puzzles, random_solution
+
+
+def test_random_solution():
+    solution = random_solution(random.Random(1))
+    assert Board.from_string(solution).is_solved()
+    assert solution != random_solution(random.Random(2))
+
+
+def test_generate_puzzle():
+    puzzle, solution = generate_puzzle(random.Random(1), clues=30, symmetry="rotational")
+    assert Board.from_string(puzzle).has_unique_solution()
+    assert Board.from_string(solution).is_solved()
+    assert all(number == "." or number == solution[idx] for idx, number in enumerate(puzzle))
+    assert 81 - puzzle.count(".") >= 30
+    assert all((number == ".") == (puzzle[80 - idx] == ".") for idx, number in enumerate(puzzle))
+
+
+def test_generate_minimal_puzzle():
+    puzzle, solution = generate_puzzle(random.Random(3))
+    assert Board.from_string(puzzle).has_unique_solution()
+    # no fixed number can be removed any longer
+    for idx, number in enumerate(puzzle):
+        if number != ".":
+            assert not Board.from_string(puzzle[:idx] + "." + puzzle[idx + 1:]).has_unique_solution()
+
+
+def test_generate_puzzles_is_reproducible():
+    assert list(generate_puzzles(2, seed=5, clues=35)) == list(generate_puzzles(2, seed=5, clues=35))
+
+
+def test_unknown_symmetry():
+    with pytest.raises(Exception):
+        generate_puzzle(symmetry="spiral")
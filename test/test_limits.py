@@ -0,0 +1,82 @@
+import pytest
+
+from src.sudoku.board import Board
+from src.sudoku.limits import CANCELLED, CHECK_STEPS, DEADLINE, NODES, CancelToken, SearchLimits, Unfinished
+from src.sudoku.nogoods import NogoodStore
+from src.sudoku.solver import solve
+
+# needs a few thousand search nodes with the default branching policy
+HARD = ".....6....59.....82....8....45........3........6..3.54...325..6.................."
+
+
+def test_search_limits_nodes():
+    limits = SearchLimits(max_nodes=10)
+    assert limits.exceeded(9) is None
+    assert limits.exceeded(10) == NODES
+
+
+def test_search_limits_deadline_and_cancel_token():
+    cancel_token = CancelToken()
+    limits = SearchLimits(deadline=0.0, cancel_token=cancel_token)
+    # the clock and the token are checked at the first step and then every CHECK_STEPS steps
+    assert limits.exceeded(0) == DEADLINE
+    assert [limits.exceeded(0) for _ in range(CHECK_STEPS - 1)] == [None] * (CHECK_STEPS - 1)
+    cancel_token.cancel()
+    assert limits.exceeded(0) == CANCELLED
+
+
+def test_search_limits_cancelled_before_first_step():
+    cancel_token = CancelToken()
+    cancel_token.cancel()
+    assert SearchLimits(cancel_token=cancel_token).exceeded(0) == CANCELLED
+    result = Board.from_string(HARD).solve_with_backtrack(cancel_token=cancel_token)
+    assert result.reason() == CANCELLED
+    assert result.nodes() <= 1
+
+
+def test_search_limits_invalid():
+    with pytest.raises(Exception):
+        SearchLimits(deadline=-1)
+    with pytest.raises(Exception):
+        SearchLimits(max_nodes=-1)
+
+
+def test_solve_with_backtrack_limits_and_processes():
+    # the limits and the nogoods are not passed to the worker processes
+    with pytest.raises(Exception):
+        Board.from_string(HARD).solve_with_backtrack(processes=1, max_nodes=1)
+    with pytest.raises(Exception):
+        Board.from_string(HARD).solve_with_backtrack(processes=1, deadline=1.0)
+    with pytest.raises(Exception):
+        Board.from_string(HARD).solve_with_backtrack(processes=1, cancel_token=CancelToken())
+    with pytest.raises(Exception):
+        Board.from_string(HARD).solve_with_backtrack(processes=1, nogoods=NogoodStore())
+    with pytest.raises(Exception):
+        Board.from_string(HARD).count_solutions(processes=1, nogoods=NogoodStore())
+
+
+def test_solve_with_backtrack_node_budget():
+    board = Board.from_string(HARD)
+    result = board.solve_with_backtrack(max_nodes=100)
+    assert isinstance(result, Unfinished)
+    assert result.reason() == NODES
+    assert result.nodes() == 100
+    assert result.board() is board
+    # the board is left in the state after the propagation, without any tried number
+    propagated = Board.from_string(HARD)
+    propagated.reduce_maybe_numbers()
+    assert result.candidates() == [cell.maybe_numbers_mask() for cell in propagated]
+    assert result.as_dict()["board"] == propagated.to_string()
+    # the board can still be solved afterwards
+    assert board.solve_with_backtrack() > 0
+    assert board.is_solved()
+
+
+@pytest.mark.parametrize("engine", ["backtrack", "dlx"])
+def test_solve_with_limits(engine):
+    cancel_token = CancelToken()
+    cancel_token.cancel()
+    assert solve(Board.from_string(HARD), engine=engine, cancel_token=cancel_token).reason() == CANCELLED
+    assert solve(Board.from_string(HARD), engine=engine, deadline=0.0).reason() == DEADLINE
+    assert solve(Board.from_string(HARD), engine=engine, max_nodes=10).reason() == NODES
+    assert solve(Board.from_string(HARD), engine=engine, deadline=60, max_nodes=10 ** 6).is_solved()
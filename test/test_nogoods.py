@@ -0,0 +1,69 @@
+import pytest
+
+from src.sudoku.board import Board
+from src.sudoku.nogoods import NogoodStore, state_of
+from src.sudoku.search import SearchEngine
+
+PUZZLE = "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3"
+# the puzzle without its first row, which has 482 solutions
+MULTIPLE_SOLUTIONS = "." * 9 + PUZZLE[9:]
+
+
+def test_nogood_store():
+    nogoods = NogoodStore(capacity=2)
+    assert not nogoods.contains((1,))
+    nogoods.record((1,))
+    nogoods.record((2,))
+    nogoods.record((1,))
+    assert nogoods.recorded() == 2
+    # (1,) is the most recently used nogood now, so (2,) is evicted
+    assert nogoods.contains((1,))
+    nogoods.record((3,))
+    assert len(nogoods) == 2
+    assert not nogoods.contains((2,))
+    assert nogoods.contains((3,))
+    assert nogoods.as_dict() == {"size": 2, "capacity": 2, "lookups": 4, "hits": 2, "recorded": 3, "evictions": 1}
+    nogoods.clear()
+    assert len(nogoods) == 0
+    assert nogoods.hits() == 2
+    with pytest.raises(Exception):
+        NogoodStore(capacity=0)
+
+
+def test_state_of():
+    board = Board.from_string(PUZZLE)
+    state = state_of(board)
+    assert len(state) == 81
+    assert state[2] == 0
+    assert state[0] == board[0].maybe_numbers_mask()
+
+
+def test_search_with_nogoods():
+    nogoods = NogoodStore()
+    board = Board.from_string(MULTIPLE_SOLUTIONS)
+    assert board.count_solutions(nogoods=nogoods) == 482
+    assert nogoods.recorded() > 0
+    assert nogoods.lookups() > nogoods.recorded()
+    # the same solution is found with and without nogoods
+    expected = Board.from_string(PUZZLE)
+    expected.solve_with_backtrack()
+    board = Board.from_string(PUZZLE)
+    board.solve_with_backtrack(nogoods=NogoodStore())
+    assert board.to_string() == expected.to_string()
+
+
+def test_search_with_recorded_nogoods():
+    nogoods = NogoodStore()
+    board = Board.from_string(MULTIPLE_SOLUTIONS)
+    board.count_solutions(nogoods=nogoods)
+    # with the dead ends of the first search, the second search needs fewer nodes
+    first = SearchEngine(Board.from_string(MULTIPLE_SOLUTIONS))
+    while first.next_solution():
+        pass
+    second = SearchEngine(Board.from_string(MULTIPLE_SOLUTIONS), nogoods=nogoods)
+    solutions = 0
+    while second.next_solution():
+        solutions += 1
+    assert solutions == 482
+    assert second.nodes() < first.nodes()
+    assert nogoods.hits() > 0
@@ -0,0 +1,62 @@
+from src.sudoku.batch import solve_puzzles
+from src.sudoku.board import Board
+from src.sudoku.branching import MinimumRemainingValues
+from src.sudoku.parallel import count_solutions_parallel, search_subtree, solve_puzzles_parallel, split_subtrees
+
+PUZZLES = ["4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+           "1..85.47....4.3..6.6.....5.......81.3.4..7...6.1.2473....9....3.2.........5....21",
+           "123",
+           "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3"]
+# the last puzzle without its first row, which has 482 solutions
+MULTIPLE_SOLUTIONS = "." * 9 + PUZZLES[3][9:]
+
+
+def test_solve_puzzles_parallel_ordered():
+    results = list(solve_puzzles_parallel(PUZZLES * 3, processes=2, chunksize=2))
+    assert [puzzle for puzzle, solution, stats in results] == PUZZLES * 3
+    expected = [solution for puzzle, solution, stats in solve_puzzles(PUZZLES * 3)]
+    assert [solution for puzzle, solution, stats in results] == expected
+
+
+def test_solve_puzzles_parallel_as_completed():
+    results = list(solve_puzzles_parallel(PUZZLES * 3, processes=2, chunksize=1, ordered=False,
+                                          policy=MinimumRemainingValues(), engine="backtrack"))
+    assert sorted(puzzle for puzzle, solution, stats in results) == sorted(PUZZLES * 3)
+    for puzzle, solution, stats in results:
+        if puzzle == "123":
+            assert solution is None
+            assert stats["error"]
+        else:
+            assert Board.from_string(solution).is_solved()
+
+
+def test_solve_puzzles_parallel_with_node_budget():
+    # needs a few thousand search nodes with the default branching policy
+    hard = ".....6....59.....82....8....45........3........6..3.54...325..6.................."
+    results = list(solve_puzzles_parallel([hard, PUZZLES[3]], processes=2, chunksize=1, max_nodes=100))
+    assert results[0][1] is None
+    assert results[0][2]["unfinished"]["reason"] == "nodes"
+    assert Board.from_string(results[1][1]).is_solved()
+
+
+def test_split_subtrees():
+    board = Board.from_string(MULTIPLE_SOLUTIONS)
+    subtrees, nodes = split_subtrees(board, 8)
+    assert len(subtrees) >= 8
+    assert nodes > 0
+    # the subtrees do not overlap and contain all solutions
+    assert sum(search_subtree(subtree, limit=None)[0] for subtree in subtrees) == 482
+    assert board.to_string() == MULTIPLE_SOLUTIONS
+
+
+def test_count_solutions_parallel():
+    assert count_solutions_parallel(Board.from_string(MULTIPLE_SOLUTIONS), processes=2) == 482
+    assert count_solutions_parallel(Board.from_string(MULTIPLE_SOLUTIONS), limit=2, processes=2) == 2
+    assert count_solutions_parallel(Board.from_string(PUZZLES[3]), processes=2) == 1
+
+
+def test_solve_with_backtrack_in_parallel():
+    board = Board.from_string(PUZZLES[0])
+    assert board.solve_with_backtrack(MinimumRemainingValues(), processes=2) > 0
+    assert board.is_solved()
+    assert board.to_string() == next(solve_puzzles([PUZZLES[0]]))[1]
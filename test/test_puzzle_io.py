@@ -0,0 +1,40 @@
+from src.sudoku.board import Board
+from src.sudoku.puzzle_io import iter_puzzle_bytes, read_boards, read_compact_boards, write_boards
+
+PUZZLES = ["1..85.47....4.3..6.6.....5.......81.3.4..7...6.1.2473....9....3.2.........5....21",
+           "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3"]
+
+
+def test_iter_puzzle_bytes(tmp_path):
+    path = tmp_path / "puzzles.txt"
+    path.write_bytes(("# comment\r\n" + PUZZLES[0] + "\r\n\n" + PUZZLES[1].replace(".", "0")).encode("ascii"))
+    assert list(iter_puzzle_bytes(path)) == [PUZZLES[0].encode("ascii"), PUZZLES[1].replace(".", "0").encode("ascii")]
+
+
+def test_iter_puzzle_bytes_with_empty_file(tmp_path):
+    path = tmp_path / "puzzles.txt"
+    path.write_bytes(b"")
+    assert list(iter_puzzle_bytes(path)) == []
+
+
+def test_read_and_write_boards(tmp_path):
+    path = tmp_path / "puzzles.txt"
+    path.write_text("\n".join(PUZZLES) + "\n")
+    boards = list(read_boards(path))
+    assert [board.to_string() for board in boards] == PUZZLES
+
+    out_path = tmp_path / "solutions.txt"
+    assert write_boards(out_path, [boards[0], PUZZLES[1], None, PUZZLES[0].encode("ascii")]) == 4
+    assert out_path.read_text().split("\n") == [PUZZLES[0], PUZZLES[1], "", PUZZLES[0], ""]
+
+    compact_boards = list(read_compact_boards(path))
+    assert [board.to_string() for board in compact_boards] == PUZZLES
+    assert write_boards(out_path, compact_boards) == 2
+    assert out_path.read_text().split("\n") == PUZZLES + [""]
+
+
+def test_from_bytes():
+    board = Board.from_bytes(memoryview(PUZZLES[1].encode("ascii")))
+    assert board.to_bytes() == PUZZLES[1].encode("ascii")
+    assert board.get_cell((0, 2)).number() == 8
+    assert board.get_cell((0, 0)).maybe_numbers() == list(range(1, 10))
@@ -0,0 +1,51 @@
+from src.sudoku.board import Board
+from src.sudoku.branching import MinimumRemainingValues
+from src.sudoku.search import SearchEngine
+
+
+def test_next_solution():
+    board = get_board("evil.txt")
+    engine = SearchEngine(board, MinimumRemainingValues())
+    assert engine.next_solution()
+    assert board.is_solved()
+    assert engine.nodes() > 0
+    # evil.txt has a unique solution
+    assert not engine.next_solution()
+    assert engine.is_finished()
+
+
+def test_step():
+    board = get_board("44.txt")
+    engine = SearchEngine(board)
+    steps = 1
+    while not engine.step():
+        steps += 1
+    assert board.is_solved()
+    assert steps >= engine.nodes()
+
+
+def test_multiple_solutions():
+    board = get_board("evil.txt", empty_rows=(0, 1))
+    engine = SearchEngine(board)
+    solutions = set()
+    while engine.next_solution() and len(solutions) < 3:
+        solutions.add(tuple(cell.number() for cell in board))
+    assert len(solutions) == 3
+
+
+def test_unsolvable_board():
+    board = get_board("evil.txt")
+    board.get_cell((0, 0)).new_fixed_number(8)
+    engine = SearchEngine(board)
+    assert not engine.next_solution()
+    assert engine.is_finished()
+
+
+def get_board(name, empty_rows=()):
+    with open("../board/" + name, "r") as board_input:
+        lines = board_input.read().split("\n")
+
+    new_lines = list(map(lambda x: x.split(","), lines))
+    for row_idx in empty_rows:
+        new_lines[row_idx] = ["x"] * 9
+    return Board(new_lines)
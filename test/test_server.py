@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+
+from src.sudoku.server import SolveServer, parse_request
+
+PUZZLES = ["4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+           "1..85.47....4.3..6.6.....5.......81.3.4..7...6.1.2473....9....3.2.........5....21"]
+
+
+def test_parse_request():
+    assert parse_request(PUZZLES[0], 3) == {"id": 3, "puzzle": PUZZLES[0], "engine": "backtrack", "stats": False,
+                                        "deadline": None, "max_nodes": None}
+    request = parse_request(json.dumps({"id": "a", "puzzle": PUZZLES[1], "engine": "dlx", "stats": True,
+                                        "max_nodes": 10}), 1, deadline=0.5, max_nodes=1000)
+    assert request == {"id": "a", "puzzle": PUZZLES[1], "engine": "dlx", "stats": True, "deadline": 0.5,
+                       "max_nodes": 10}
+
+
+@pytest.mark.parametrize("limits", [{"max_nodes": True}, {"max_nodes": -1}, {"max_nodes": 1.5},
+                                    {"deadline": False}, {"deadline": -1}, {"deadline": "1"}])
+def test_parse_request_with_invalid_limits(limits):
+    with pytest.raises(Exception):
+        parse_request(json.dumps({"puzzle": PUZZLES[0], **limits}), 1)
+
+
+def test_solve_server():
+    requests = [PUZZLES[0],
+                "",
+                "# a comment",
+                json.dumps({"id": "dlx", "puzzle": PUZZLES[1], "engine": "dlx", "stats": True}),
+                "123",
+                "{not json",
+                json.dumps({"puzzle": PUZZLES[1], "engine": "unknown"}),
+                json.dumps({"puzzle": PUZZLES[1], "max_nodes": True})]
+    responses = asyncio.run(_solve_remote(requests, SolveServer(processes=1)))
+    by_id = {response["id"]: response for response in responses}
+    assert len(responses) == 6
+    assert by_id[1]["solution"].startswith("417369825")
+    assert by_id["dlx"]["solution"].startswith("139856472")
+    assert by_id["dlx"]["solver"]["nodes"] >= 0
+    assert by_id[3]["solution"] is None and by_id[3]["error"]
+    assert by_id[4]["error"] == "Request is not valid JSON"
+    assert by_id[5]["error"] == "Unknown engine unknown"
+    assert by_id[6]["error"] == "The node budget must be a number of nodes"
+
+
+def test_solve_server_with_backpressure(tmp_path):
+    server = SolveServer(processes=1, batch_size=3, queue_size=1, max_pending=2)
+    responses = asyncio.run(_solve_remote(PUZZLES * 10, server, str(tmp_path / "server.sock")))
+    assert sorted(response["id"] for response in responses) == list(range(1, 21))
+    assert all(response["error"] is None for response in responses)
+
+
+async def _solve_remote(requests, server, path=None):
+    await server.start(path=path)
+    try:
+        if path is None:
+            host, port = server.address()
+            reader, writer = await asyncio.open_connection(host, port)
+        else:
+            reader, writer = await asyncio.open_unix_connection(path)
+        writer.write("".join(request + "\n" for request in requests).encode("utf-8"))
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        return responses
+    finally:
+        await server.close()
@@ -0,0 +1,54 @@
+from src.sudoku.board import Board
+from src.sudoku.branching import MinimumRemainingValues
+from src.sudoku.solver import solve, solve_with_stats
+from src.sudoku.stats import SolveStats
+
+EVIL = "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3"
+
+
+def test_solve_stats():
+    stats = SolveStats()
+    stats.add_node(3)
+    stats.add_node(1)
+    stats.add_nodes(5)
+    stats.add_backtrack()
+    stats.add_elimination()
+    stats.add_single()
+    stats.add_validation()
+    stats.add_stage_seconds("reduce", 0.5)
+    stats.add_stage_seconds("reduce", 0.25)
+    with stats.stage("dlx"):
+        pass
+    assert stats.nodes() == 7
+    assert stats.max_depth() == 3
+    assert stats.backtracks() == 1
+    assert stats.eliminations() == 1
+    assert stats.singles() == 1
+    assert stats.validations() == 1
+    assert list(stats.stage_seconds()) == ["reduce", "dlx"]
+    assert stats.as_dict()["stage_seconds"]["reduce"] == 0.75
+
+
+def test_solve_with_stats():
+    board, stats = solve_with_stats(Board.from_string(EVIL), MinimumRemainingValues())
+    assert board.is_solved()
+    assert board.stats() is stats
+    assert stats.nodes() > 0
+    assert stats.max_depth() > 0
+    assert stats.eliminations() > 0
+    assert stats.singles() > 0
+    assert stats.validations() > 0
+    assert list(stats.stage_seconds()) == ["reduce", "singles", "backtrack"]
+
+
+def test_solve_with_stats_dlx():
+    board, stats = solve_with_stats(Board.from_string(EVIL), engine="dlx")
+    assert board.is_solved()
+    assert board.stats() is stats
+    assert stats.nodes() > 0
+    assert "dlx" in stats.stage_seconds()
+
+
+def test_solve_without_stats():
+    board = Board.from_string(EVIL)
+    assert solve(board).stats() is None
@@ -0,0 +1,55 @@
+import pytest
+
+from src.sudoku.units import (BLOCKS, BLOCK_OF, CELL_COUNT, COLS, GEOMETRY, PEERS, ROWS, UNITS, UNITS_OF, geometry,
+                              index_of)
+
+
+def test_units():
+    assert len(UNITS) == 27
+    assert ROWS[1] == tuple(range(9, 18))
+    assert COLS[2] == (2, 11, 20, 29, 38, 47, 56, 65, 74)
+    assert BLOCKS[5] == (33, 34, 35, 42, 43, 44, 51, 52, 53)
+
+
+def test_units_of():
+    assert UNITS_OF[0] == (0, 9, 18)
+    assert UNITS_OF[80] == (8, 17, 26)
+    for idx in range(CELL_COUNT):
+        for unit_idx in UNITS_OF[idx]:
+            assert idx in UNITS[unit_idx]
+
+
+def test_peers():
+    for idx in range(CELL_COUNT):
+        assert len(PEERS[idx]) == 20
+        assert idx not in PEERS[idx]
+    assert 80 in PEERS[60]
+    assert 61 not in PEERS[0]
+
+
+def test_index_of():
+    assert index_of((0, 0)) == 0
+    assert index_of((4, 5)) == 41
+    assert BLOCK_OF[index_of((4, 5))] == 4
+
+
+def test_geometry():
+    assert geometry(3) is GEOMETRY
+    assert GEOMETRY.peers == PEERS
+    geometry16 = geometry(4)
+    assert (geometry16.size, geometry16.cell_count, geometry16.all_numbers) == (16, 256, 0xFFFF)
+    assert len(geometry16.units) == 48
+    assert geometry16.blocks[5] == tuple(row_idx * 16 + col_idx for row_idx in range(4, 8) for col_idx in range(4, 8))
+    for idx in range(geometry16.cell_count):
+        assert len(geometry16.peers[idx]) == 39
+    assert geometry16.number_of_byte[ord("G")] == geometry16.number_of_byte[ord("g")] == 16
+    assert geometry16.number_of_byte[ord("H")] == 0
+    assert geometry16.number_of_byte[ord(".")] is None
+    assert bytes(geometry16.byte_of_number) == b".123456789ABCDEFG"
+    assert index_of((1, 2), 16) == 18
+
+
+@pytest.mark.parametrize("box_size", [1, 6, "3"])
+def test_geometry_with_unsupported_box_size(box_size):
+    with pytest.raises(Exception):
+        geometry(box_size)
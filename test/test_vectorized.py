@@ -0,0 +1,51 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.sudoku.batch import solve_puzzles
+from src.sudoku.vectorized import candidates_of, reduce_candidates, solve_puzzles_vectorized
+
+PUZZLES = ["1..85.47....4.3..6.6.....5.......81.3.4..7...6.1.2473....9....3.2.........5....21",
+           "6....5...5..41.....3..7...........46........5.72.8............98..9...52.1..2..84",
+           "..81..5..7..9.......4.57.6.2...458...8.....9.....1.......7.....4...829....6.....3",
+           "47.3....6.6295.4.7..8..4.1291.2.......4.6...1..7..5......4.9.5.34.7.1....9......."]
+
+
+def test_candidates_of():
+    candidates = candidates_of(PUZZLES[:1])
+    assert candidates.shape == (1, 81, 9)
+    assert candidates[0, 0].tolist() == [True] + [False] * 8
+    assert candidates[0, 1].all()
+
+
+def test_reduce_candidates():
+    candidates = candidates_of(PUZZLES)
+    invalid = reduce_candidates(candidates)
+    assert not invalid.any()
+    # the first and the last puzzle are solved by naked and hidden singles
+    assert (candidates[0].sum(axis=1) == 1).all()
+    assert (candidates[3].sum(axis=1) == 1).all()
+
+
+def test_only_9x9_boards():
+    with pytest.raises(Exception):
+        candidates_of(["." * 256])
+    with pytest.raises(Exception):
+        reduce_candidates(np.ones((1, 16, 4), dtype=bool))
+
+
+def test_reduce_candidates_with_contradiction():
+    candidates = candidates_of(["11" + PUZZLES[0][2:]])
+    assert reduce_candidates(candidates).all()
+
+
+def test_solve_puzzles_vectorized():
+    puzzles = PUZZLES + ["123", "11" + PUZZLES[0][2:]]
+    results = list(solve_puzzles_vectorized(puzzles * 3, chunksize=4))
+    expected = list(solve_puzzles(puzzles * 3))
+    assert [solution for puzzle, solution, stats in results] == [solution for puzzle, solution, stats in expected]
+    # only evil.txt needs backtracking
+    assert [stats["stage"] for puzzle, solution, stats in results[:4]] == ["propagation", "propagation", "backtrack",
+                                                                           "propagation"]
+    assert results[4][2]["error"]
+    assert results[5][2]["error"]